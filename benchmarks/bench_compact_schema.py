@@ -0,0 +1,110 @@
+"""Memory footprint and filter speed of the compact frame schema.
+
+The same scaled-up collection sheet is held twice: with the old schema
+(object strings for names, vehicles and "Month-Year", built with
+``strftime``) and with the compact one (categoricals and integer month
+keys, as produced by ``engine.ingest`` and ``engine.data_model``).  Both
+must give the same answers before any timing is reported.
+
+    python -m benchmarks.bench_compact_schema
+"""
+import time
+
+import numpy as np
+import pandas as pd
+
+from engine.cleaning import clean_collection
+from engine.data_model import month_key, month_labels, normalize_collection
+from engine.ingest import SHEET_SPECS, ingest_frame
+
+
+PARTNERS = ["Govind Kumar", "Kumar Gaurav"]
+
+
+def make_collection_sheet(vehicles, days, seed=0):
+    """Raw text rows, as they come from the sheet: one collection per vehicle and day."""
+    rng = np.random.default_rng(seed)
+    n = vehicles * days
+    dates = pd.Timestamp("2022-01-01") + pd.to_timedelta(np.tile(np.arange(days), vehicles), unit="D")
+    vehicle_no = np.repeat([f"BR01PA{i:04d}" for i in range(vehicles)], days)
+    drivers = np.array([f"Driver {i:03d}" for i in range(vehicles * 2)])
+    meter = np.cumsum(rng.integers(40, 140, n)).reshape(vehicles, days).ravel()
+    return pd.DataFrame({
+        "Collection Date": dates.strftime("%d/%m/%Y"),
+        "Vehicle No": vehicle_no,
+        "Amount": rng.choice([0, 150, 250, 300, 350], n).astype(str),
+        "Meter Reading": meter.astype(str),
+        "Name": rng.choice(drivers, n),
+        "Received By": rng.choice(PARTNERS, n),
+    })
+
+
+def legacy_schema(df):
+    """The compact frame with its categoricals turned back into object strings."""
+    categorical = [c for c in df.columns if isinstance(df[c].dtype, pd.CategoricalDtype)]
+    legacy = df.astype({c: object for c in categorical}).drop(columns=["Month Key"])
+    legacy["Month-Year"] = legacy["Collection Date"].dt.strftime("%Y-%m")
+    return legacy
+
+
+def filters(df, keyed):
+    vehicle, month = "BR01PA0007", "2023-06"
+    by_month = df["Month Key"] == 202306 if keyed else df["Month-Year"] == month
+    return {
+        "vehicle ==": lambda: df[df["Vehicle No"] == vehicle],
+        "partner isin": lambda: df[df["Received By"].isin(PARTNERS[:1])],
+        "month ==": lambda: df[df["Month Key"] == 202306] if keyed else df[df["Month-Year"] == month],
+        "vehicle & month": lambda: df[(df["Vehicle No"] == vehicle) & by_month],
+        "partner x month sum": lambda: df.groupby(["Received By", "Month-Year"], observed=True)["Amount"].sum(),
+        "driver sum": lambda: df.groupby("Name", observed=True)["Amount"].sum(),
+    }
+
+
+def check_equivalence(legacy, compact):
+    for (name, old), new in zip(filters(legacy, False).items(), filters(compact, True).values()):
+        a, b = old(), new()
+        if isinstance(a, pd.DataFrame):
+            assert len(a) == len(b) and (a.index == b.index).all(), f"{name} differs"
+        else:
+            assert np.allclose(a.sort_index().to_numpy(), b.sort_index().to_numpy()), f"{name} differs"
+
+
+def time_call(fn, repeat=5):
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def megabytes(df):
+    return df.memory_usage(deep=True).sum() / 2 ** 20
+
+
+def main(vehicles=300, days=3 * 365):
+    raw = make_collection_sheet(vehicles, days)
+    typed, _ = ingest_frame(raw, SHEET_SPECS["collection"])
+    compact = normalize_collection(clean_collection(typed))
+    legacy = legacy_schema(compact)
+    check_equivalence(legacy, compact)
+    print(f"{len(compact):,} collection rows; filters match between schemas")
+
+    dates = compact["Collection Date"]
+    print(f"\n{'Month-Year build':<22} {time_call(lambda: dates.dt.strftime('%Y-%m'), 1) * 1e3:>9.1f} ms (strftime)"
+          f" {time_call(lambda: month_labels(month_key(dates)), 1) * 1e3:>9.1f} ms (month keys)")
+
+    print(f"\n{'memory':<22} {megabytes(legacy):>9.1f} MB (object) {megabytes(compact):>9.1f} MB (compact)")
+    for col in ["Vehicle No", "Name", "Received By", "Month-Year"]:
+        old = legacy[col].memory_usage(deep=True) / 2 ** 20
+        new = compact[col].memory_usage(deep=True) / 2 ** 20
+        print(f"  {col:<20} {old:>9.2f} MB          {new:>9.2f} MB")
+
+    print(f"\n{'filter':<22} {'object ms':>10} {'compact ms':>11} {'speedup':>8}")
+    for (name, old), new in zip(filters(legacy, False).items(), filters(compact, True).values()):
+        old_s, new_s = time_call(old), time_call(new)
+        print(f"{name:<22} {old_s * 1e3:>10.2f} {new_s * 1e3:>11.2f} {old_s / new_s:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""Throughput of the bank transaction log renderer.
+
+The per-row ``apply`` + ``Styler`` path that used to live in main.py is kept
+here as the reference.  Signed amounts must match it row for row, and an
+empty period must render an empty log, before any timing is reported.
+
+    python -m benchmarks.bench_ledger_render
+"""
+import time
+
+import numpy as np
+import pandas as pd
+
+from engine.ledger_view import LEDGER_COLUMNS, render_ledger_html, signed_amounts
+from engine.paging import page_window
+
+
+TRANSACTION_TYPES = [
+    "Collection_Credit", "Investment_Credit", "Payment_Credit", "Settlement_Credit",
+    "Expence_Debit", "Settlement_Debit",
+]
+
+
+def make_transactions(n, seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        "Date": pd.Timestamp("2024-01-01") + pd.to_timedelta(rng.integers(0, 700, n), unit="D"),
+        "Transaction By": rng.choice(["Govind Kumar", "Kumar Gaurav"], n),
+        "Transaction Type": rng.choice(TRANSACTION_TYPES, n),
+        "Reason": rng.choice(["Daily collection", "Battery swap", "Tyre & tube", "Insurance"], n),
+        "Amount": rng.integers(0, 2_000_000, n) / 10,
+        "Bill": rng.choice(["https://drive.google.com/file/d/abc", None, ""], n),
+    })
+
+
+def format_amount(row):
+    amt = pd.to_numeric(row.get("Amount", 0), errors="coerce")
+    if pd.isna(amt):
+        amt = 0
+    t = str(row.get("Transaction Type", "")).lower()
+    if "credit" in t:
+        return f"+₹{amt:,.0f}"
+    elif "debit" in t:
+        return f"-₹{amt:,.0f}"
+    return f"₹{amt:,.0f}"
+
+
+def color_amount(val):
+    if isinstance(val, str):
+        if val.startswith("+"):
+            return "color: green"
+        elif val.startswith("-"):
+            return "color: red"
+    return ""
+
+
+def reference_render(filtered_df):
+    display_df = filtered_df[LEDGER_COLUMNS].copy()
+    display_df["Amount"] = display_df.apply(format_amount, axis=1)
+    display_df["Bill"] = display_df["Bill"].apply(
+        lambda x: f'<a href="{x}" target="_blank">View Bill</a>' if pd.notna(x) and str(x).startswith("http") else ""
+    )
+    styled = display_df.sort_values(by="Date", ascending=False)
+    styler = styled.style
+    # Styler.applymap was renamed to Styler.map in pandas 2.1 and removed in 3.0
+    style_cells = getattr(styler, "applymap", None) or styler.map
+    return style_cells(color_amount, subset=["Amount"]).to_html()
+
+
+def render_page(filtered_df, page=1, page_size=100):
+    log_df = filtered_df[LEDGER_COLUMNS].sort_values(by="Date", ascending=False, kind="mergesort")
+    return render_ledger_html(page_window(log_df, page, page_size))
+
+
+def render_all(filtered_df):
+    log_df = filtered_df[LEDGER_COLUMNS].sort_values(by="Date", ascending=False, kind="mergesort")
+    return render_ledger_html(log_df)
+
+
+def check_equivalence(n=5_000):
+    df = make_transactions(n, seed=1)
+    df.loc[df.sample(frac=0.05, random_state=1).index, "Amount"] = np.nan
+    expected = df.apply(format_amount, axis=1)
+    actual = signed_amounts(df)["Amount"]
+    mismatches = int((expected != actual).sum())
+    assert mismatches == 0, f"{mismatches} formatted amounts differ"
+
+    # A period without transactions renders an empty log
+    empty = df.iloc[:0]
+    assert signed_amounts(empty).empty
+    assert "<tbody></tbody>" in render_page(empty)
+
+
+def time_call(fn, *args, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn(*args)
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main():
+    check_equivalence()
+    print("signed amounts match the reference")
+
+    print(f"{'rows':>9} {'reference ms':>13} {'all rows ms':>12} {'page ms':>9} {'ref KB':>9} {'page KB':>9}")
+    for n in (1_000, 10_000, 100_000):
+        df = make_transactions(n)
+        ref_seconds = time_call(reference_render, df, repeat=1)
+        all_seconds = time_call(render_all, df)
+        page_seconds = time_call(render_page, df)
+        ref_kb = len(reference_render(df)) / 1024 if n <= 10_000 else float("nan")
+        page_kb = len(render_page(df)) / 1024
+        print(
+            f"{n:>9} {ref_seconds * 1e3:>13.0f} {all_seconds * 1e3:>12.0f} {page_seconds * 1e3:>9.1f}"
+            f" {ref_kb:>9.0f} {page_kb:>9.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,171 @@
+"""Equivalence check and micro-benchmark for the vectorized loss matrix.
+
+The row-by-row implementation that used to live in main.py is kept here as the
+reference.  Frames generated with hypothesis (empty and single-row frames,
+drivers on several vehicles a day, "Zero Collection" rows, missing
+names/dates/amounts, object or categorical keys) must give the same rows, in
+the same order and with the same dtypes, from both implementations before
+any timing is reported; ``--check`` runs only that check and exits non-zero
+on a mismatch.  Needs hypothesis (``pip install -r requirements-dev.txt``).
+
+    python -m benchmarks.bench_loss_matrix
+    python -m benchmarks.bench_loss_matrix --check --cases 2000
+"""
+import argparse
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+from hypothesis import example, given, settings
+from hypothesis import strategies as st
+
+from engine.loss_matrix import COMPANY_LOSS_NAME, apply_loss_matrix_logic
+
+
+def reference_loss_matrix(input_df: pd.DataFrame) -> pd.DataFrame:
+    df_proc = input_df.copy()
+    df_proc = df_proc.dropna(subset=["Collection Date"]).copy()
+    df_proc["Amount"] = pd.to_numeric(df_proc["Amount"], errors="coerce").fillna(0)
+    df_proc["Amount"] = (df_proc["Amount"] - 300) * -1
+    df_proc = df_proc.sort_values(by=["Collection Date", "Name", "Vehicle No"])
+    updated_rows = []
+    for (_, driver), group in df_proc.groupby(["Collection Date", "Name"], group_keys=False):
+        if driver != "Zero Collection" and len(group) > 1:
+            total_amt = group["Amount"].sum()
+            first_loss = total_amt - 300
+            second_loss = 300 + first_loss
+            first_row = group.iloc[0].copy().to_dict()
+            second_row = group.iloc[1].copy().to_dict()
+            if first_loss <= -300:
+                first_loss = 0
+            else:
+                second_row["Name"] = "Zero Collection"
+            first_row["Amount"] = first_loss
+            second_row["Amount"] = second_loss
+            updated_rows.extend([first_row, second_row])
+        else:
+            updated_rows.extend(group.to_dict("records"))
+    return pd.DataFrame(updated_rows)
+
+
+def random_collections(rng, n_rows, n_days=30, n_drivers=8, n_vehicles=12):
+    dates = pd.date_range("2025-01-01", periods=n_days, freq="D").to_numpy()
+    drivers = np.array([f"Driver {i}" for i in range(n_drivers)] + ["Zero Collection"], dtype=object)
+    df = pd.DataFrame({
+        "Collection Date": rng.choice(dates, n_rows),
+        "Vehicle No": rng.choice([f"BR{i:03d}" for i in range(n_vehicles)], n_rows),
+        "Amount": rng.choice([0, 50, 120, 300, 350, 600], n_rows).astype(float),
+        "Meter Reading": rng.integers(0, 40_000, n_rows).astype(float),
+        "Name": rng.choice(drivers, n_rows),
+    })
+    holes = rng.random((3, n_rows)) < 0.03
+    df.loc[holes[0], "Collection Date"] = pd.NaT
+    df.loc[holes[1], "Amount"] = np.nan
+    df.loc[holes[2], "Name"] = None
+    return df
+
+
+DAYS = pd.date_range("2025-01-01", periods=6, freq="D")
+DRIVERS = ["Driver A", "Driver B", "Driver C", "Zero Collection"]
+VEHICLES = ["BR001", "BR002", "BR003", "BR004"]
+
+
+@st.composite
+def collections(draw):
+    """Collection frames of 0..40 rows: few days, drivers and vehicles so rows collide, with holes."""
+    n_rows = draw(st.integers(min_value=0, max_value=40))
+    column = lambda values: draw(st.lists(values, min_size=n_rows, max_size=n_rows))  # noqa: E731
+    df = pd.DataFrame({
+        "Collection Date": pd.to_datetime(pd.Series(column(st.sampled_from([*DAYS, pd.NaT])), dtype=object)),
+        "Vehicle No": pd.Series(column(st.sampled_from(VEHICLES)), dtype=object),
+        "Amount": pd.Series(
+            column(st.one_of(st.sampled_from([0.0, 50.0, 120.0, 300.0, 350.0, 600.0]), st.just(np.nan))),
+            dtype="float64",
+        ),
+        "Meter Reading": pd.Series(column(st.floats(0, 40_000, allow_nan=False)), dtype="float64"),
+        "Name": pd.Series(column(st.one_of(st.sampled_from(DRIVERS), st.none())), dtype=object),
+    })
+    # The pipeline hands over categorical names and vehicles; plain object columns must work too
+    if draw(st.booleans()):
+        df = df.astype({"Name": "category", "Vehicle No": "category"})
+    return df
+
+
+def check_equivalence(n_cases=300):
+    """Property: for every generated frame both implementations give the same rows and dtypes."""
+
+    empty = pd.DataFrame({
+        "Collection Date": pd.Series(dtype="datetime64[ns]"),
+        "Vehicle No": pd.Series(dtype=object),
+        "Amount": pd.Series(dtype="float64"),
+        "Meter Reading": pd.Series(dtype="float64"),
+        "Name": pd.Series(dtype=object),
+    })
+    single = pd.DataFrame({
+        "Collection Date": [DAYS[0]], "Vehicle No": ["BR001"], "Amount": [120.0], "Meter Reading": [10.0], "Name": ["Driver A"],
+    })
+
+    @settings(max_examples=n_cases, deadline=None, database=None)
+    @given(collections())
+    @example(empty)
+    @example(single)
+    def same_rows(df):
+        expected = reference_loss_matrix(df)
+        actual = apply_loss_matrix_logic(df)
+        if expected.empty:
+            assert actual.empty, "expected no rows"
+            return
+        # The reference rebuilds its frame from dicts, which loses the input dtypes; put them back.
+        # A categorical Name gains the "Zero Collection" category when rows are booked to it.
+        dtypes = df.dtypes[expected.columns].to_dict()
+        name_dtype = dtypes["Name"]
+        if isinstance(name_dtype, pd.CategoricalDtype) and COMPANY_LOSS_NAME not in name_dtype.categories \
+                and (expected["Name"] == COMPANY_LOSS_NAME).any():
+            dtypes["Name"] = pd.CategoricalDtype([*name_dtype.categories, COMPANY_LOSS_NAME])
+        expected = expected.astype(dtypes)
+        pd.testing.assert_frame_equal(
+            actual[expected.columns].reset_index(drop=True),
+            expected,
+            obj="loss matrix",
+        )
+
+    same_rows()
+    return n_cases
+
+
+def best_of(fn, df, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn(df)
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--check", action="store_true", help="only run the equivalence check")
+    parser.add_argument("--cases", type=int, default=300, help="generated frames to check")
+    args = parser.parse_args(argv)
+
+    try:
+        print(f"equivalence: {check_equivalence(args.cases)} generated cases match")
+    except AssertionError as e:
+        print(f"equivalence: MISMATCH\n{e}", file=sys.stderr)
+        return 1
+    if args.check:
+        return 0
+
+    rng = np.random.default_rng(1)
+    print(f"{'rows':>9} {'reference ms':>13} {'vectorized ms':>14} {'speedup':>8}")
+    for n_rows in (1_000, 10_000, 50_000):
+        df = random_collections(rng, n_rows, n_days=max(n_rows // 40, 1), n_drivers=40, n_vehicles=50)
+        ref = best_of(reference_loss_matrix, df, repeat=1)
+        vec = best_of(apply_loss_matrix_logic, df)
+        print(f"{n_rows:>9} {ref * 1e3:>13.1f} {vec * 1e3:>14.1f} {ref / vec:>7.0f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,57 @@
+"""Scaling benchmark for the pending-collection engine.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_pending
+"""
+import time
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+from engine.pending import find_pending_collections
+
+
+START_DATE = date(2025, 8, 1)
+
+
+def make_collections(n_vehicles, n_days, fill_rate=0.9, seed=0):
+    rng = np.random.default_rng(seed)
+    days = pd.date_range(START_DATE, periods=n_days, freq="D")
+    vehicles = np.array([f"BR01PK{i:04d}" for i in range(n_vehicles)])
+    grid_v = np.repeat(vehicles, n_days)
+    grid_d = np.tile(days.to_numpy(), n_vehicles)
+    keep = rng.random(grid_v.size) < fill_rate
+    n = int(keep.sum())
+    return pd.DataFrame({
+        "Collection Date": grid_d[keep],
+        "Vehicle No": grid_v[keep],
+        "Amount": rng.choice([0, 150, 300, 450], n).astype(float),
+        "Meter Reading": rng.integers(0, 50_000, n).astype(float),
+        "Name": rng.choice([f"Driver {i}" for i in range(max(n_vehicles, 1))], n),
+    })
+
+
+def time_call(fn, *args, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn(*args)
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main():
+    n_days = 365
+    print(f"{'vehicles':>9} {'rows':>9} {'pending':>9} {'ms':>9} {'us/row':>8}")
+    for n_vehicles in (10, 50, 100, 500, 1000):
+        df = make_collections(n_vehicles, n_days)
+        end_date = START_DATE + pd.Timedelta(days=n_days - 1)
+        pending = find_pending_collections(df, START_DATE, end_date)
+        seconds = time_call(find_pending_collections, df, START_DATE, end_date)
+        print(f"{n_vehicles:>9} {len(df):>9} {len(pending):>9} {seconds * 1e3:>9.1f} {seconds * 1e6 / len(df):>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""Equivalence check and micro-benchmark for the SQLite store's indexed queries.
+
+A synthetic fleet is cleaned through the pipeline and imported into a
+temporary SqliteStore.  ``rows(start, end, where)`` must return the same
+rows as TimeIndex.between plus the equality filter, and ``monthly_totals``
+the same sums as the pandas groupby the Expenses page runs, for every range
+and filter tried, before any timing is reported.
+
+    python -m benchmarks.bench_sqlite_store
+"""
+import os
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.synthetic import FleetSpec, make_sheets
+from engine.pipeline import PREPARERS
+from engine.sources import FrameSource
+from engine.sqlite_store import SqliteStore
+from engine.time_index import TimeIndex
+
+
+def random_ranges(rng, dates, n):
+    """(start, end) pairs inside the fleet's history, some open-ended, some with a time of day."""
+    lo, hi = dates[0], dates[-1]
+    span = (hi - lo).days
+    for _ in range(n):
+        start = lo + pd.Timedelta(days=int(rng.integers(0, span)), hours=int(rng.integers(0, 2)) * 13)
+        end = start + pd.Timedelta(days=int(rng.integers(0, span)))
+        yield (start if rng.random() < 0.8 else None), (end if rng.random() < 0.8 else None)
+
+
+def expected_rows(index: TimeIndex, start, end, where):
+    frame = index.between(start, end)
+    for column, value in where.items():
+        frame = frame[frame[column] == value]
+    return frame
+
+
+def expected_monthly(frame, by, measure):
+    month = frame["Date"].dt.to_period("M").rename("Month")
+    return frame.groupby([month, *by], observed=True)[measure].sum().astype("float64")
+
+
+def as_table(totals: pd.Series) -> pd.DataFrame:
+    table = totals.reset_index()
+    keys = list(totals.index.names)
+    return table.astype({key: str for key in keys})
+
+
+def check_equivalence(store, expense, n_cases=100, seed=0):
+    rng = np.random.default_rng(seed)
+    index = TimeIndex(expense, "Date")
+    people = expense["Expense By"].dropna().unique().tolist()
+    for case, (start, end) in enumerate(random_ranges(rng, pd.DatetimeIndex(index.frame["Date"].dropna()), n_cases)):
+        where = {"Expense By": str(rng.choice(people))} if case % 2 else {}
+
+        expected = expected_rows(index, start, end, where)
+        actual = store.rows("expense", start, end, where)
+        assert len(actual) == len(expected), f"case {case}: {len(actual)} rows, expected {len(expected)}"
+        if start is not None or end is not None:
+            # Same rows: dates are sorted identically up to ties, so compare as multisets
+            pd.testing.assert_series_equal(
+                pd.to_datetime(actual["Date"]).astype("datetime64[ns]").sort_values(ignore_index=True),
+                expected["Date"].sort_values(ignore_index=True).astype("datetime64[ns]"),
+                check_names=False,
+                obj=f"rows case {case}",
+            )
+
+        # Keys compared as text: SQLite returns plain strings where pandas has categoricals
+        pd.testing.assert_frame_equal(
+            as_table(store.monthly_totals("expense", ["Expense By"], "Amount Used", start, end, where)),
+            as_table(expected_monthly(expected, ["Expense By"], "Amount Used")),
+            obj=f"monthly totals case {case}",
+        )
+    return n_cases
+
+
+def best_of(fn, repeat=5):
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main():
+    spec = FleetSpec(vehicles=300, drivers=450, days=3 * 365)
+    source = FrameSource(make_sheets(spec))
+    expense = PREPARERS["expense"](source.read("expense")[0])
+    with tempfile.TemporaryDirectory() as directory:
+        store = SqliteStore(os.path.join(directory, "bench.db"))
+        store.sync_from(source, ["expense"])
+        print(f"equivalence: {check_equivalence(store, expense)} randomized ranges match ({len(expense):,} expense rows)")
+
+        index = TimeIndex(expense, "Date")
+        person = expense["Expense By"].dropna().iloc[0]
+        start, end = spec.dates[-200], spec.dates[-20]
+        where = {"Expense By": person}
+        cases = {
+            "range + filter rows": (
+                lambda: store.rows("expense", start, end, where),
+                lambda: expected_rows(index, start, end, where),
+            ),
+            "monthly totals": (
+                lambda: store.monthly_totals("expense", ["Expense By"], "Amount Used", start, end),
+                lambda: expected_monthly(index.between(start, end), ["Expense By"], "Amount Used"),
+            ),
+        }
+        print(f"{'query':<22} {'sqlite ms':>10} {'pandas ms':>10}")
+        for name, (sql, pandas) in cases.items():
+            print(f"{name:<22} {best_of(sql) * 1e3:>10.1f} {best_of(pandas) * 1e3:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
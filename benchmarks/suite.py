@@ -0,0 +1,218 @@
+"""Stage-by-stage timings of the dashboard pipeline on a synthetic fleet.
+
+Every stage the dashboard runs is timed offline, without Streamlit or
+Google: ingestion and cleaning of each sheet, the ledger, partner balances,
+loss matrix, pending collections, monthly rollups, date indexes and the
+computations of each page (the engine.pages functions main.py calls).
+Timings are compared against ``benchmarks/baseline.json``; a stage slower
+than ``tolerance`` x its baseline (and by more than ``MIN_REGRESSION_MS``)
+fails the run.
+
+    python -m benchmarks.suite                      # medium fleet
+    python -m benchmarks.suite --scale large
+    python -m benchmarks.suite --scale small --update-baseline
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+from typing import Callable, Dict, List, Tuple
+
+import pandas as pd
+
+from benchmarks.synthetic import FleetSpec, make_sheets
+from engine.balances import discover_partners, monthly_partner_summary, partner_balances
+from engine.cards import render_collection_cards
+from engine.ledger import Ledger
+from engine.ledger_view import render_ledger_html
+from engine.loss_matrix import apply_loss_matrix_logic
+from engine.pages import (
+    bank_log,
+    bank_monthly_summary,
+    closing_balance,
+    collection_kpis,
+    collection_log,
+    collection_month_totals,
+    dashboard_metrics,
+    expense_month_on_month,
+    expense_totals,
+    filter_losses,
+    filter_period,
+    grouped_collections,
+    loss_totals,
+)
+from engine.paging import page_window
+from engine.pending import find_pending_collections
+from engine.pipeline import DATASETS, PREPARERS, performance_frame
+from engine.rollups import build_rollup
+from engine.sources import FrameSource
+from engine.time_index import TimeIndex
+
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), "baseline.json")
+DEFAULT_TOLERANCE = 1.5
+# Sub-millisecond stages jitter by more than 50%; ignore regressions below this
+MIN_REGRESSION_MS = 5.0
+
+SCALES = {
+    "small": FleetSpec(vehicles=10, drivers=15, days=180),
+    "medium": FleetSpec(vehicles=60, drivers=90, days=2 * 365),
+    "large": FleetSpec(vehicles=300, drivers=450, days=3 * 365),
+}
+
+def _load(source, name):
+    frame, _ = source.read(name)
+    return PREPARERS[name](frame)
+
+
+def _dashboard(t):
+    return dashboard_metrics(t["partner_balances"], t["ledger"], t["loss_matrix_by_date"], t["today"])
+
+
+def _expenses(t):
+    rollup = t["expense_monthly"]
+    return expense_month_on_month(expense_totals(rollup, t["expense"], "All", t["today"]), rollup.months[-12:])
+
+
+def _collection_data(t):
+    records = filter_period(t["collection_by_date"], "All", t["today"])
+    months = collection_month_totals(t["collection_monthly"], records, "All", t["today"])
+    cards = render_collection_cards(page_window(collection_log(records), 1, 120))
+    return collection_kpis(t["collection"]), months, cards
+
+
+def _bank_transaction(t):
+    log_df = bank_log(t["bank"])
+    summary = bank_monthly_summary(t["bank_monthly"])
+    return closing_balance(t["bank"]), summary, render_ledger_html(page_window(log_df, 1, 100))
+
+
+def _performance_page(t):
+    recent = filter_losses(t["loss_matrix_by_date"], t["today"] - pd.DateOffset(months=6), t["today"])
+    return loss_totals(t["loss_matrix"]), loss_totals(recent)
+
+
+def stages(source) -> List[Tuple[str, Callable[[dict], object]]]:
+    """(table, build) in pipeline order, named like engine.pipeline's tables.
+
+    Each build reads the tables of earlier stages from the dict it is given.
+    """
+    return [
+        *[(name, lambda t, name=name: _load(source, name)) for name in DATASETS],
+        ("ledger", lambda t: Ledger(t["bank"])),
+        ("partners", lambda t: discover_partners(t["collection"], t["expense"], t["investment"], t["ledger"])),
+        ("partner_balances", lambda t: partner_balances(
+            t["collection"], t["expense"], t["investment"], t["ledger"], month=t["collection"]["Month-Year"].max()
+        )),
+        ("performance", lambda t: performance_frame(t["collection"])),
+        ("loss_matrix", lambda t: apply_loss_matrix_logic(t["performance"])),
+        ("pending", lambda t: find_pending_collections(t["collection"], t["start"], t["today"])),
+        ("collection_monthly", lambda t: build_rollup(
+            t["collection"], "Collection Date", ["Received By", "Vehicle No"], ["Amount"]
+        )),
+        ("expense_monthly", lambda t: build_rollup(t["expense"], "Date", ["Expense By"], ["Amount Used"])),
+        ("bank_monthly", lambda t: build_rollup(t["bank"], "Date", ["Transaction By", "Transaction Type"], ["Amount"])),
+        ("collection_by_date", lambda t: TimeIndex(t["collection"], "Collection Date")),
+        ("loss_matrix_by_date", lambda t: TimeIndex(t["loss_matrix"], "Collection Date")),
+        ("page Dashboard", _dashboard),
+        ("page Monthly Summary", lambda t: monthly_partner_summary(
+            t["collection_monthly"], t["expense_monthly"], t["partners"]
+        )),
+        ("page Grouped Data", lambda t: grouped_collections(t["collection"])),
+        ("page Expenses", _expenses),
+        ("page Collection Data", _collection_data),
+        ("page Bank Transaction", _bank_transaction),
+        ("page Performance", _performance_page),
+    ]
+
+
+def run(spec: FleetSpec, repeat: int = 3) -> Dict[str, float]:
+    """Best-of-``repeat`` seconds per stage."""
+    source = FrameSource(make_sheets(spec))
+    tables = {"start": spec.dates[0], "today": spec.dates[-1]}
+    timings = {}
+    for name, build in stages(source):
+        best = float("inf")
+        for _ in range(repeat):
+            t0 = time.perf_counter()
+            tables[name] = build(tables)
+            best = min(best, time.perf_counter() - t0)
+        timings[name] = best
+    return timings
+
+
+def load_baseline(path: str = BASELINE_PATH) -> dict:
+    if not os.path.exists(path):
+        return {"scales": {}}
+    with open(path) as f:
+        return json.load(f)
+
+
+def save_baseline(baseline: dict, path: str = BASELINE_PATH):
+    with open(path, "w") as f:
+        json.dump(baseline, f, indent=2, sort_keys=True)
+        f.write("\n")
+
+
+def regressions(timings: Dict[str, float], reference: Dict[str, float], tolerance: float) -> List[str]:
+    """Stages slower than ``tolerance`` x their baseline; stages without a baseline never fail."""
+    slow = []
+    for name, seconds in timings.items():
+        if name not in reference:
+            continue
+        if seconds > reference[name] * tolerance and (seconds - reference[name]) * 1e3 > MIN_REGRESSION_MS:
+            slow.append(name)
+    return slow
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scale", choices=list(SCALES), default="medium")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--tolerance", type=float, default=None, help="allowed slowdown factor vs the baseline")
+    parser.add_argument("--update-baseline", action="store_true", help="record this run as the baseline")
+    args = parser.parse_args(argv)
+
+    spec = SCALES[args.scale]
+    baseline = load_baseline()
+    tolerance = args.tolerance or baseline.get("tolerance", DEFAULT_TOLERANCE)
+    reference = baseline["scales"].get(args.scale, {}).get("seconds", {})
+
+    print(
+        f"{args.scale}: {spec.vehicles} vehicles, {spec.drivers} drivers, {spec.days} days,"
+        f" multi-vehicle rate {spec.multi_vehicle_rate:.0%}"
+    )
+    timings = run(spec, repeat=args.repeat)
+    slow = regressions(timings, reference, tolerance)
+
+    print(f"{'stage':<24} {'ms':>10} {'baseline ms':>12} {'ratio':>7}")
+    for name, seconds in timings.items():
+        base = reference.get(name)
+        ratio = f"{seconds / base:>6.2f}x" if base else f"{'new':>7}"
+        base_ms = f"{base * 1e3:>12.1f}" if base else f"{'-':>12}"
+        flag = "  REGRESSION" if name in slow else ""
+        print(f"{name:<24} {seconds * 1e3:>10.1f} {base_ms} {ratio}{flag}")
+    print(f"{'total':<24} {sum(timings.values()) * 1e3:>10.1f}")
+
+    if args.update_baseline:
+        baseline.setdefault("tolerance", DEFAULT_TOLERANCE)
+        baseline["scales"][args.scale] = {
+            "seconds": {name: round(seconds, 6) for name, seconds in timings.items()},
+            "python": platform.python_version(),
+            "pandas": pd.__version__,
+            "machine": platform.machine(),
+        }
+        save_baseline(baseline)
+        print(f"baseline for {args.scale} written to {BASELINE_PATH}")
+        return 0
+
+    if slow:
+        print(f"\n{len(slow)} stage(s) slower than {tolerance}x the baseline: {', '.join(slow)}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,139 @@
+"""Synthetic fleet sheets for benchmarking the dashboard pipeline.
+
+The four sheets are generated as raw text, the way the Sheets API hands
+them over (day-first dates, amounts as strings), so the whole pipeline from
+ingestion on can be timed offline.  The fleet is described by a FleetSpec:
+
+* every vehicle reports one collection a day with probability ``fill_rate``
+  (the gaps are what the pending-collection engine finds),
+* ``multi_vehicle_rate`` of the collections are booked to the driver of the
+  next vehicle, i.e. one driver runs two vehicles that day (the case the loss
+  matrix special-cases),
+* expenses, investments and bank transactions scale with the fleet and the
+  number of days.
+"""
+from dataclasses import dataclass
+from typing import Dict
+
+import numpy as np
+import pandas as pd
+
+
+PARTNERS = ["Govind Kumar", "Kumar Gaurav"]
+EXPENSE_REASONS = ["Tyre", "Battery", "Service", "Insurance", "Puncture", "Washing"]
+INVESTMENT_TYPES = ["Cash", "Bank Transfer", "UPI"]
+DAILY_AMOUNTS = [0, 150, 250, 300, 300, 300, 350, 400]
+
+
+@dataclass(frozen=True)
+class FleetSpec:
+    vehicles: int = 20
+    drivers: int = 30
+    days: int = 365
+    multi_vehicle_rate: float = 0.05
+    fill_rate: float = 0.9
+    start: str = "2024-01-01"
+    seed: int = 0
+
+    @property
+    def dates(self) -> pd.DatetimeIndex:
+        return pd.date_range(self.start, periods=self.days, freq="D")
+
+
+def _sheet_dates(dates) -> np.ndarray:
+    return pd.DatetimeIndex(dates).strftime("%d/%m/%Y").to_numpy()
+
+
+def _bills(rng, n) -> np.ndarray:
+    return np.where(rng.random(n) < 0.6, "https://drive.google.com/file/d/bill", "")
+
+
+def make_collection(spec: FleetSpec, rng) -> pd.DataFrame:
+    dates = spec.dates
+    vehicle_idx = np.repeat(np.arange(spec.vehicles), spec.days)
+    day_idx = np.tile(np.arange(spec.days), spec.vehicles)
+
+    # Odometer keeps running on days without a collection row
+    meter = 1_000 + np.cumsum(rng.integers(40, 140, vehicle_idx.size).reshape(spec.vehicles, spec.days), axis=1).ravel()
+
+    keep = rng.random(vehicle_idx.size) < spec.fill_rate
+    vehicle_idx, day_idx, meter = vehicle_idx[keep], day_idx[keep], meter[keep]
+    n = vehicle_idx.size
+
+    # Each vehicle has a regular driver; some days the next vehicle's driver runs it too
+    driver_idx = vehicle_idx % spec.drivers
+    doubled = rng.random(n) < spec.multi_vehicle_rate
+    driver_idx = np.where(doubled, (vehicle_idx + 1) % spec.vehicles % spec.drivers, driver_idx)
+
+    return pd.DataFrame({
+        "Collection Date": _sheet_dates(dates[day_idx]),
+        "Vehicle No": np.array([f"BR01PA{i:04d}" for i in range(spec.vehicles)])[vehicle_idx],
+        "Amount": rng.choice(DAILY_AMOUNTS, n).astype(str),
+        "Meter Reading": meter.astype(str),
+        "Name": np.array([f"Driver {i:03d}" for i in range(spec.drivers)])[driver_idx],
+        "Received By": rng.choice(PARTNERS, n),
+    })
+
+
+def make_expense(spec: FleetSpec, rng) -> pd.DataFrame:
+    # Roughly one expense per vehicle every three weeks
+    n = max(1, spec.vehicles * spec.days // 21)
+    return pd.DataFrame({
+        "Date": _sheet_dates(spec.dates[rng.integers(0, spec.days, n)]),
+        "Vehicle No": np.array([f"BR01PA{i:04d}" for i in range(spec.vehicles)])[rng.integers(0, spec.vehicles, n)],
+        "Reason of Expense": rng.choice(EXPENSE_REASONS, n),
+        "Amount Used": rng.integers(50, 5_000, n).astype(str),
+        "Any Bill": _bills(rng, n),
+        "Expense By": rng.choice(PARTNERS, n),
+    })
+
+
+def make_investment(spec: FleetSpec, rng) -> pd.DataFrame:
+    # A few investments per partner and month
+    n = max(1, len(PARTNERS) * spec.days // 10)
+    return pd.DataFrame({
+        "Date": _sheet_dates(spec.dates[rng.integers(0, spec.days, n)]),
+        "Investment Type": rng.choice(INVESTMENT_TYPES, n),
+        "Amount": (rng.integers(1, 50, n) * 1_000).astype(str),
+        "Comment": rng.choice(["Vehicle purchase", "Working capital", ""], n),
+        "Received From": rng.choice(PARTNERS, n),
+    })
+
+
+def make_bank(spec: FleetSpec, rng) -> pd.DataFrame:
+    # Each partner deposits the day's collection, plus expenses and the odd investment/settlement
+    deposits = len(PARTNERS) * spec.days
+    others = max(1, spec.vehicles * spec.days // 15)
+    n = deposits + others
+    types = np.concatenate([
+        np.full(deposits, "Collection_Credit"),
+        rng.choice(
+            ["Expence_Debit", "Expence_Debit", "Investment_Credit", "Payment_Credit", "Settlement_Credit", "Settlement_Debit"],
+            others,
+        ),
+    ])
+    amounts = np.where(
+        types == "Collection_Credit",
+        rng.integers(spec.vehicles * 50, spec.vehicles * 150 + 1, n),
+        rng.integers(100, 20_000, n),
+    )
+    day_idx = np.concatenate([np.repeat(np.arange(spec.days), len(PARTNERS)), rng.integers(0, spec.days, others)])
+    return pd.DataFrame({
+        "Date": _sheet_dates(spec.dates[day_idx]),
+        "Transaction By": np.concatenate([np.tile(PARTNERS, spec.days), rng.choice(PARTNERS, others)]),
+        "Transaction Type": types,
+        "Reason": np.where(types == "Collection_Credit", "Daily collection", rng.choice(EXPENSE_REASONS, n)),
+        "Amount": amounts.astype(str),
+        "Bill": _bills(rng, n),
+    })
+
+
+def make_sheets(spec: FleetSpec) -> Dict[str, pd.DataFrame]:
+    """Raw text frames for the four sheets, keyed like SHEET_SPECS."""
+    rng = np.random.default_rng(spec.seed)
+    return {
+        "collection": make_collection(spec, rng),
+        "expense": make_expense(spec, rng),
+        "investment": make_investment(spec, rng),
+        "bank": make_bank(spec, rng),
+    }
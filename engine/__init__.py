@@ -0,0 +1,227 @@
+"""Headless data helpers for the VayuVolt dashboard.
+
+The data API (cleaning, ingestion, sources, pipeline, derived tables) is
+imported eagerly.  The app-side helpers - login (bcrypt), session tokens,
+the SQLite store and the figure cache - are imported on first access, so a
+headless ``import engine`` does not load bcrypt or sqlite3.
+"""
+import importlib
+
+from engine.balances import discover_partners, monthly_partner_summary, partner_balances
+from engine.cards import CARD_PAGE_SIZES, background_styles, render_collection_cards
+from engine.cleaning import (
+    COLLECTION_COLUMNS,
+    DATE_FORMATS,
+    clean_bank,
+    clean_collection,
+    clean_expense,
+    clean_investment,
+    missing_investment_columns,
+)
+from engine.data_cache import CacheEntry, DatasetCache, frame_fingerprint
+from engine.data_model import (
+    MONTH_NAMES,
+    enable_copy_on_write,
+    month_key,
+    month_labels,
+    normalize_bank,
+    normalize_collection,
+    normalize_expense,
+    normalize_investment,
+    strip_text,
+    view,
+)
+from engine.downsample import MAX_CHART_POINTS, RANGE_BUCKETS, bucket, downsample_chart, lttb, lttb_indices
+from engine.ingest import SHEET_SPECS, IngestReport, SheetSpec, apply_spec, ingest_frame, stream_csv
+from engine.instrumentation import RerunProfile, activate
+from engine.lazy import DerivedTables
+from engine.ledger import CREDIT_TYPES, DEBIT_TYPES, Ledger
+from engine.ledger_view import (
+    LEDGER_COLUMNS,
+    LEDGER_PAGE_SIZES,
+    LEDGER_TABLE_CSS,
+    bill_links,
+    render_ledger_html,
+    signed_amounts,
+)
+from engine.loader import DataBundle, RetryPolicy, SheetLoadError, SheetSchemaError, load_bundle, run_concurrently
+from engine.loss_matrix import apply_loss_matrix_logic
+from engine.pages import (
+    bank_log,
+    bank_monthly_summary,
+    closing_balance,
+    collection_kpis,
+    collection_log,
+    collection_month_totals,
+    dashboard_metrics,
+    expense_month_on_month,
+    expense_totals,
+    filter_losses,
+    filter_period,
+    grouped_collections,
+    loss_totals,
+    month_aligned_start,
+)
+from engine.paging import page_count, page_window
+from engine.pending import PENDING_COLUMNS, find_pending_collections
+from engine.pipeline import DATASETS, DEFAULT_TTLS, PREPARERS, Pipeline, performance_frame, register_tables
+from engine.rollups import MonthlyRollup, build_rollup
+from engine.sheet_sync import SheetSync
+from engine.snapshot_store import SCHEMA_VERSION, Snapshot, SnapshotStore
+from engine.sources import (
+    SHEET_NAMES,
+    DataSource,
+    FrameSource,
+    GspreadSource,
+    GvizCsvSource,
+    LocalFileSource,
+    gviz_csv_url,
+    open_worksheets,
+)
+from engine.time_index import ROLLING_PRESETS, TimeIndex, preset_range
+
+# name -> module, imported on first access (see __getattr__)
+_LAZY = {
+    "AUTH_COLUMNS": "engine.sqlite_store",
+    "AttemptLimiter": "engine.login_guard",
+    "AuthStore": "engine.auth_store",
+    "DEFAULT_ROUNDS": "engine.login_guard",
+    "FigureCache": "engine.figure_cache",
+    "INDEXES": "engine.sqlite_store",
+    "PasswordVerifier": "engine.login_guard",
+    "SessionClaims": "engine.session_tokens",
+    "SessionTokens": "engine.session_tokens",
+    "SqliteSource": "engine.sqlite_store",
+    "SqliteStore": "engine.sqlite_store",
+    "Verification": "engine.login_guard",
+    "hash_rounds": "engine.login_guard",
+    "render_png": "engine.figure_cache",
+}
+
+__all__ = [
+    "AUTH_COLUMNS",
+    "AttemptLimiter",
+    "AuthStore",
+    "CARD_PAGE_SIZES",
+    "COLLECTION_COLUMNS",
+    "CREDIT_TYPES",
+    "CacheEntry",
+    "DATASETS",
+    "DATE_FORMATS",
+    "DEBIT_TYPES",
+    "DEFAULT_ROUNDS",
+    "DEFAULT_TTLS",
+    "DataBundle",
+    "DataSource",
+    "DatasetCache",
+    "DerivedTables",
+    "FigureCache",
+    "FrameSource",
+    "GspreadSource",
+    "GvizCsvSource",
+    "INDEXES",
+    "IngestReport",
+    "LEDGER_COLUMNS",
+    "LEDGER_PAGE_SIZES",
+    "LEDGER_TABLE_CSS",
+    "Ledger",
+    "LocalFileSource",
+    "MAX_CHART_POINTS",
+    "MONTH_NAMES",
+    "MonthlyRollup",
+    "PENDING_COLUMNS",
+    "PREPARERS",
+    "PasswordVerifier",
+    "Pipeline",
+    "RANGE_BUCKETS",
+    "ROLLING_PRESETS",
+    "RerunProfile",
+    "RetryPolicy",
+    "SCHEMA_VERSION",
+    "SHEET_NAMES",
+    "SHEET_SPECS",
+    "SessionClaims",
+    "SessionTokens",
+    "SheetLoadError",
+    "SheetSchemaError",
+    "SheetSpec",
+    "SheetSync",
+    "Snapshot",
+    "SnapshotStore",
+    "SqliteSource",
+    "SqliteStore",
+    "TimeIndex",
+    "Verification",
+    "activate",
+    "apply_loss_matrix_logic",
+    "apply_spec",
+    "background_styles",
+    "bank_log",
+    "bank_monthly_summary",
+    "bill_links",
+    "bucket",
+    "build_rollup",
+    "clean_bank",
+    "clean_collection",
+    "clean_expense",
+    "clean_investment",
+    "closing_balance",
+    "collection_kpis",
+    "collection_log",
+    "collection_month_totals",
+    "dashboard_metrics",
+    "discover_partners",
+    "downsample_chart",
+    "enable_copy_on_write",
+    "expense_month_on_month",
+    "expense_totals",
+    "filter_losses",
+    "filter_period",
+    "find_pending_collections",
+    "frame_fingerprint",
+    "grouped_collections",
+    "gviz_csv_url",
+    "hash_rounds",
+    "ingest_frame",
+    "load_bundle",
+    "loss_totals",
+    "lttb",
+    "lttb_indices",
+    "missing_investment_columns",
+    "month_aligned_start",
+    "month_key",
+    "month_labels",
+    "monthly_partner_summary",
+    "normalize_bank",
+    "normalize_collection",
+    "normalize_expense",
+    "normalize_investment",
+    "open_worksheets",
+    "page_count",
+    "page_window",
+    "partner_balances",
+    "performance_frame",
+    "preset_range",
+    "register_tables",
+    "render_collection_cards",
+    "render_ledger_html",
+    "render_png",
+    "run_concurrently",
+    "signed_amounts",
+    "stream_csv",
+    "strip_text",
+    "view",
+]
+
+
+def __getattr__(name):
+    module = _LAZY.get(name)
+    if module is None:
+        raise AttributeError(f"module 'engine' has no attribute {name!r}")
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY))
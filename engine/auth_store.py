@@ -0,0 +1,94 @@
+"""Username index over the auth sheet for the login path.
+
+The auth sheet is only read when a login needs it: the first lookup loads
+it, later lookups are a dict access.  The index is reloaded when its TTL
+runs out, and on a lookup of an unknown username (at most once per
+``miss_reload_interval``), so users added to the sheet can log in without a
+manual refresh.  A reload whose rows fingerprint the same as before keeps
+the current index and version.
+"""
+import threading
+import time
+from typing import Callable, Dict, Optional
+
+import pandas as pd
+
+from engine import instrumentation
+from engine.data_cache import frame_fingerprint
+
+
+class AuthStore:
+    def __init__(
+        self,
+        loader: Callable[[], pd.DataFrame],
+        ttl: float = 10 * 60,
+        miss_reload_interval: float = 30.0,
+    ):
+        self.loader = loader
+        self.ttl = ttl
+        self.miss_reload_interval = miss_reload_interval
+        self._users: Optional[Dict[str, dict]] = None
+        self._fingerprint = None
+        self.version = 0
+        self.loaded_at = 0.0
+        self.loads = 0
+        self.unchanged_loads = 0
+        self._last_miss_reload = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def loaded(self) -> bool:
+        return self._users is not None
+
+    def __len__(self):
+        return len(self._users or {})
+
+    def _load(self):
+        with instrumentation.stage("load auth"):
+            df = self.loader()
+        self.loads += 1
+        self.loaded_at = time.time()
+        fingerprint = frame_fingerprint(df)
+        if self._users is not None and fingerprint == self._fingerprint:
+            self.unchanged_loads += 1
+            return
+        users = {}
+        if "Username" in df.columns:
+            for record in df.to_dict("records"):
+                # First row wins for duplicated usernames, as before
+                users.setdefault(str(record["Username"]).strip(), record)
+        self._users, self._fingerprint = users, fingerprint
+        self.version += 1
+
+    def lookup(self, username: str) -> Optional[dict]:
+        """Auth record (Username, Password, Role, Name) of ``username``, or None."""
+        username = str(username).strip()
+        with self._lock:
+            if self._users is None or time.time() - self.loaded_at > self.ttl:
+                self._load()
+            elif username not in self._users and time.time() - self._last_miss_reload > self.miss_reload_interval:
+                # Unknown user: the sheet may have gained rows since the last load
+                self._last_miss_reload = time.time()
+                self._load()
+            return self._users.get(username)
+
+    def update(self, username: str, **fields):
+        """Change fields of a loaded record in place (e.g. a rehashed password)."""
+        with self._lock:
+            record = (self._users or {}).get(str(username).strip())
+            if record is not None:
+                record.update(fields)
+
+    def invalidate(self):
+        """Reload on the next lookup."""
+        with self._lock:
+            self.loaded_at = 0.0
+
+    def stats(self) -> dict:
+        return {
+            "Users": len(self),
+            "Version": self.version,
+            "Loads": self.loads,
+            "Unchanged": self.unchanged_loads,
+            "Age (s)": round(time.time() - self.loaded_at) if self.loaded else None,
+        }
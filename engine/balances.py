@@ -0,0 +1,111 @@
+"""Per-partner fund balances.
+
+Partners are whoever receives collections, books expenses, invests or moves
+money through the bank account.  Every total is one groupby per frame, so the
+cost does not grow with the number of partners.
+"""
+from typing import Optional
+
+import pandas as pd
+
+from engine.ledger import Ledger
+from engine.rollups import MonthlyRollup
+
+
+def _sum_by(df: pd.DataFrame, key: str, value: str, mask=None) -> pd.Series:
+    if df.empty or key not in df.columns:
+        return pd.Series(dtype=float)
+    if mask is not None:
+        df = df[mask]
+    return df.groupby(key, observed=True)[value].sum()
+
+
+def discover_partners(collection_df, expense_df, investment_df, ledger: Ledger) -> list:
+    names = set(ledger.people)
+    for df, col in ((collection_df, "Received By"), (expense_df, "Expense By"), (investment_df, "Investor Name")):
+        if not df.empty and col in df.columns:
+            names.update(df[col].dropna().unique())
+    return sorted(str(n) for n in names if str(n).strip())
+
+
+def partner_balances(
+    collection_df: pd.DataFrame,
+    expense_df: pd.DataFrame,
+    investment_df: pd.DataFrame,
+    ledger: Ledger,
+    month: Optional[str] = None,
+) -> pd.DataFrame:
+    """One row per partner with their sheet totals, bank movements and remaining fund.
+
+    ``month`` ("YYYY-MM") adds that month's collection and expense columns.
+    """
+    partners = discover_partners(collection_df, expense_df, investment_df, ledger)
+    table = ledger.table.reindex(index=partners, fill_value=0)
+
+    def bank(transaction_type):
+        if transaction_type not in table.columns:
+            return pd.Series(0.0, index=partners)
+        return table[transaction_type].astype(float)
+
+    out = pd.DataFrame(index=pd.Index(partners, name="Partner"))
+    out["Collection"] = _sum_by(collection_df, "Received By", "Amount")
+    out["Expense"] = _sum_by(expense_df, "Expense By", "Amount Used")
+    out["Investment"] = _sum_by(investment_df, "Investor Name", "Investment Amount")
+    out["Bank Collection Credit"] = bank("Collection_Credit")
+    out["Bank Settlement Credit"] = bank("Settlement_Credit")
+    out["Bank Investment Credit"] = bank("Investment_Credit")
+    out["Bank Expense Debit"] = bank("Expence_Debit")
+    out["Bank Settlement Debit"] = bank("Settlement_Debit")
+
+    if month is not None:
+        out["Month Collection"] = _sum_by(
+            collection_df, "Received By", "Amount", collection_df["Month-Year"] == month
+        )
+        out["Month Expense"] = _sum_by(
+            expense_df, "Expense By", "Amount Used", expense_df["Month-Year"] == month
+        )
+
+    out = out.fillna(0)
+    # Cash still held by the partner: collected - spent - deposited + settlements received + invested
+    out["Remaining Fund"] = (
+        out["Collection"]
+        - out["Expense"]
+        - out["Bank Collection Credit"]
+        + out["Bank Settlement Debit"]
+        - out["Bank Settlement Credit"]
+        + out["Investment"]
+    )
+    return out
+
+
+def _partner_months(rollup: MonthlyRollup, partner_col: str, measure: str, partners) -> pd.DataFrame:
+    totals = rollup.totals(by=[partner_col])[measure]
+    totals = totals[totals.index.get_level_values(partner_col).isin(partners)]
+    table = totals.unstack(partner_col).reindex(columns=partners)
+    table.index = table.index.astype(str)
+    return table
+
+
+def monthly_partner_summary(collection_rollup: MonthlyRollup, expense_rollup: MonthlyRollup, partners) -> pd.DataFrame:
+    """Month-Year x partner collection and expense, with totals and month-on-month change.
+
+    Reads the monthly rollups (see engine.rollups), so the cost depends on the
+    number of months, not rows.
+    """
+    collection = _partner_months(collection_rollup, "Received By", "Amount", partners)
+    expense = _partner_months(expense_rollup, "Expense By", "Amount Used", partners)
+    collection.columns = [f"{p} Collection" for p in partners]
+    expense.columns = [f"{p} Expense" for p in partners]
+
+    summary = collection.join(expense, how="outer").fillna(0)
+    summary["Total Collection"] = summary[collection.columns].sum(axis=1)
+    summary["Total Expense"] = summary[expense.columns].sum(axis=1)
+    summary["Net Balance"] = summary["Total Collection"] - summary["Total Expense"]
+    summary["Collection Change (%)"] = summary["Total Collection"].pct_change().fillna(0) * 100
+    summary["Expense Change (%)"] = summary["Total Expense"].pct_change().fillna(0) * 100
+
+    ordered_columns = (
+        list(collection.columns) + ["Total Collection", "Collection Change (%)"]
+        + list(expense.columns) + ["Total Expense", "Expense Change (%)", "Net Balance"]
+    )
+    return summary[ordered_columns].rename_axis("Month-Year").reset_index()
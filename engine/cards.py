@@ -0,0 +1,57 @@
+"""Collection record cards.
+
+Cards are built column-wise from one template for just the rows on screen,
+so the HTML payload depends on the page size, not on the length of history.
+"""
+import html
+
+import numpy as np
+import pandas as pd
+
+from engine.loss_matrix import DAILY_TARGET
+
+
+CARD_PAGE_SIZES = [30, 60, 120, 240]
+
+# Amount bands -> card background
+_VERY_BAD = "linear-gradient(135deg, #fc0324, #99021a);"  # Blood Red Gradient - Very Bad
+_GOOD = "linear-gradient(135deg, #4da6ff, #0077b6);"  # Good
+_HAPPY = "linear-gradient(135deg, #FFD400, #FFB800);"  # Happy
+_MORE_HAPPY = "linear-gradient(135deg, #00FF7F, #00994C);"  # More Happy
+
+
+def background_styles(amounts: pd.Series) -> np.ndarray:
+    amounts = amounts.to_numpy(dtype=float)
+    return np.select(
+        [amounts == 0, amounts == DAILY_TARGET, amounts > DAILY_TARGET],
+        [_VERY_BAD, _HAPPY, _MORE_HAPPY],
+        default=_GOOD,
+    )
+
+
+def _text(values: pd.Series) -> pd.Series:
+    # str() per value keeps the old f-string rendering (300.0, nan, None)
+    return values.map(lambda v: html.escape(str(v))).astype(object)
+
+
+def render_collection_cards(df: pd.DataFrame) -> str:
+    """HTML for one card per row of a (windowed) collection frame."""
+    if df.empty:
+        return ""
+    cards = (
+        '<div class="card" style="background: ' + pd.Series(background_styles(df["Amount"]), index=df.index) + '">'
+        + '<div class="vehicle-no">' + _text(df["Vehicle No"]) + "</div>"
+        + '<div class="card-header">'
+        + '<div class="date">' + df["Collection Date"].dt.strftime("%d %b %Y").fillna("") + "</div>"
+        + '<div class="meter-reading-header">' + _text(df["Meter Reading"]) + " Km</div>"
+        + "</div>"
+        + '<div class="info-row">'
+        + '<div class="info-left">'
+        + '<div class="info-value">₹ ' + _text(df["Amount"]) + "</div>"
+        + '<div class="info-value">' + _text(df["Distance"]) + " km</div>"
+        + "</div>"
+        + '<div class="info-right"><div class="info-value name">' + _text(df["Name"]) + "</div></div>"
+        + "</div>"
+        + "</div>"
+    )
+    return "\n".join(cards)
@@ -0,0 +1,106 @@
+"""Cleaning of raw sheet rows into the frames used by the dashboard pages.
+
+Raw frames come straight from the sheets, so every cell may still be text.
+"""
+import numpy as np
+import pandas as pd
+
+from engine.data_model import month_key, month_labels
+
+
+COLLECTION_COLUMNS = ['Collection Date', 'Vehicle No', 'Amount', 'Meter Reading', 'Name', 'Distance', 'Month-Year', 'Received By']
+INVESTMENT_REQUIRED_COLUMNS = ["Date", "Investment Type", "Amount", "Comment", "Received From"]
+
+# Sheet dates are day-first; tried in order before falling back to inference
+DATE_FORMATS = ("%d/%m/%Y", "%d-%m-%Y", "%Y-%m-%d", "%d/%m/%Y %H:%M:%S")
+
+
+def to_number(series: pd.Series) -> pd.Series:
+    # Sheet text can carry thousands separators / currency symbols ("₹1,200")
+    if series.dtype == object or pd.api.types.is_string_dtype(series.dtype):
+        series = series.astype(str).str.replace(r"[₹,\s]", "", regex=True)
+    return pd.to_numeric(series, errors="coerce")
+
+
+def to_date(series: pd.Series) -> pd.Series:
+    """Day precision datetime64, parsed once with the explicit DATE_FORMATS."""
+    if pd.api.types.is_datetime64_any_dtype(series.dtype):
+        return series.dt.normalize()
+    parsed = pd.to_datetime(series, format=DATE_FORMATS[0], errors="coerce")
+    for fmt in DATE_FORMATS[1:]:
+        missing = parsed.isna() & series.notna()
+        if not missing.any():
+            break
+        parsed = parsed.fillna(pd.to_datetime(series[missing], format=fmt, errors="coerce"))
+    missing = parsed.isna() & series.notna()
+    if missing.any():
+        # Anything else (e.g. "1 Aug 2025") is inferred, day first
+        parsed = parsed.fillna(pd.to_datetime(series[missing], format="mixed", dayfirst=True, errors="coerce"))
+    return parsed.dt.normalize()
+
+
+def raw_rows_to_frame(header, rows) -> pd.DataFrame:
+    """Build a text frame from sheet rows, dropping fully blank rows."""
+    width = len(header)
+    padded = [list(row[:width]) + [""] * (width - len(row)) for row in rows]
+    df = pd.DataFrame(padded, columns=header, dtype=object)
+    df = df.loc[:, [bool(str(col).strip()) for col in df.columns]]
+    df = df.replace("", np.nan)
+    return df.dropna(how="all").reset_index(drop=True)
+
+
+def clean_collection(df: pd.DataFrame) -> pd.DataFrame:
+    df = df.copy()
+    df['Collection Date'] = to_date(df['Collection Date'])
+    df['Amount'] = to_number(df['Amount'])
+    df['Meter Reading'] = to_number(df['Meter Reading'])
+
+    df = df.sort_values(by=['Vehicle No', 'Collection Date'])
+
+    # Calculate distance for each vehicle separately
+    df['Distance'] = df.groupby('Vehicle No', observed=True)['Meter Reading'].diff().fillna(0)
+
+    # Replace negative distances with the average of positive distances
+    positive_avg_distance = df[df['Distance'] > 0]['Distance'].mean()
+    df.loc[df['Distance'] < 0, 'Distance'] = np.round(positive_avg_distance)
+
+    # Month-Year Column
+    df['Month-Year'] = month_labels(month_key(df['Collection Date']))
+
+    return df[COLLECTION_COLUMNS]
+
+
+def clean_expense(df: pd.DataFrame) -> pd.DataFrame:
+    df = df.copy()
+    df['Date'] = to_date(df['Date'])
+    df['Amount Used'] = to_number(df['Amount Used'])
+    df['Month-Year'] = month_labels(month_key(df['Date']))
+    return df[['Date', 'Vehicle No', 'Reason of Expense', 'Amount Used', 'Any Bill', 'Month-Year', 'Expense By']]
+
+
+def missing_investment_columns(df: pd.DataFrame) -> list:
+    columns = df.columns.str.strip()
+    return [col for col in INVESTMENT_REQUIRED_COLUMNS if col not in columns]
+
+
+def clean_investment(df: pd.DataFrame) -> pd.DataFrame:
+    df = df.copy()
+
+    # Strip spaces from column names to avoid formatting issues
+    df.columns = df.columns.str.strip()
+
+    # Rename columns for consistency
+    df = df.rename(columns={"Amount": "Investment Amount", "Received From": "Investor Name"})
+
+    df['Date'] = to_date(df['Date'])
+    df['Investment Amount'] = to_number(df['Investment Amount'])
+    df['Month-Year'] = month_labels(month_key(df['Date']))
+
+    return df[['Date', 'Investment Type', 'Investment Amount', 'Comment', 'Investor Name', 'Month-Year']]
+
+
+def clean_bank(df: pd.DataFrame) -> pd.DataFrame:
+    df = df.copy()
+    df['Date'] = to_date(df['Date'])
+    df['Month-Year'] = month_labels(month_key(df['Date']))
+    return df
@@ -0,0 +1,226 @@
+"""Per-dataset data cache.
+
+Every dataset (collection, expense, ...) has its own TTL, can be invalidated
+on its own and keeps hit/miss counters.  Expired entries keep being served
+while a background thread re-fetches them (stale-while-revalidate), and when
+a SnapshotStore is attached a restart is served from disk first.
+
+Connection resources (gspread client, worksheet handles) are deliberately not
+kept here; they live for the whole process and are never invalidated.
+"""
+import hashlib
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, Optional, Tuple
+
+import pandas as pd
+
+from engine import instrumentation
+from engine.loader import DEFAULT_POLICY, RetryPolicy, SheetSchemaError, run_concurrently
+from engine.snapshot_store import SnapshotStore
+
+
+logger = logging.getLogger(__name__)
+
+
+def frame_fingerprint(df: pd.DataFrame) -> int:
+    """Content hash of a frame; stable across processes, since the SQLite store persists it."""
+    # hashlib rather than hash(): Python salts str hashes per process
+    header = "\x1f".join(map(str, df.columns)).encode()
+    columns = int.from_bytes(hashlib.blake2b(header, digest_size=8).digest(), "little")
+    if df.empty:
+        return columns
+    return int(pd.util.hash_pandas_object(df, index=False).sum()) ^ columns
+
+
+@dataclass
+class CacheEntry:
+    frame: pd.DataFrame
+    loaded_at: float
+    source: str
+    fingerprint: int
+    version: int = 1
+    hits: int = 0
+    misses: int = 0
+    load_seconds: float = 0.0
+    error: Optional[str] = None
+    stale: bool = False
+
+    @property
+    def age(self) -> float:
+        return time.time() - self.loaded_at
+
+
+class DatasetCache:
+    def __init__(
+        self,
+        loaders: Dict[str, Callable[[], pd.DataFrame]],
+        ttls: Dict[str, float],
+        store: Optional[SnapshotStore] = None,
+        snapshot_names: Iterable[str] = (),
+        policy: RetryPolicy = DEFAULT_POLICY,
+        on_invalidate: Optional[Callable[[Optional[str]], None]] = None,
+    ):
+        self.loaders = loaders
+        self.ttls = ttls
+        self.store = store
+        self.snapshot_names = set(snapshot_names) if store is not None else set()
+        self.policy = policy
+        # Called with the invalidated name (None: all), e.g. to drop a source's incremental state
+        self.on_invalidate = on_invalidate
+        self._entries: Dict[str, CacheEntry] = {}
+        self._tombstones: Dict[str, CacheEntry] = {}
+        self._snapshot_tried = set()
+        self._revalidating = set()
+        self._retry_after: Dict[str, float] = {}
+        self._lock = threading.RLock()
+
+    # ── reads ────────────────────────────────────────────
+    def get(self, name: str) -> pd.DataFrame:
+        return self.get_many([name])[name]
+
+    def get_many(self, names: Iterable[str]) -> Dict[str, pd.DataFrame]:
+        """Return the frames for ``names``, fetching missing ones concurrently."""
+        names = list(names)
+        with self._lock:
+            for name in names:
+                # Snapshots are only a cold-start shortcut, never used after an invalidation
+                if name in self.snapshot_names and name not in self._snapshot_tried:
+                    self._snapshot_tried.add(name)
+                    if name not in self._entries:
+                        self._load_snapshot(name)
+
+            missing = [name for name in names if name not in self._entries]
+            if missing:
+                self._fetch(missing, source="network")
+
+            now = time.time()
+            stale = []
+            for name in names:
+                entry = self._entries[name]
+                if name in missing:
+                    entry.misses += 1
+                else:
+                    entry.hits += 1
+                instrumentation.cache_event(name, hit=name not in missing)
+                entry.stale = entry.age > self.ttls.get(name, float("inf"))
+                if entry.stale and name not in self._revalidating and now >= self._retry_after.get(name, 0):
+                    stale.append(name)
+
+            if stale:
+                self._revalidating.update(stale)
+                threading.Thread(
+                    target=self._revalidate, args=(stale,), name="cache-revalidate", daemon=True
+                ).start()
+
+            return {name: self._entries[name].frame for name in names}
+
+    def get_versioned(self, names: Iterable[str]) -> Tuple[Dict[str, pd.DataFrame], Dict[str, int]]:
+        """Like ``get_many``, plus the versions of exactly the frames returned."""
+        with self._lock:
+            frames = self.get_many(names)
+            return frames, {name: self.version(name) for name in frames}
+
+    def version(self, name: str) -> int:
+        """Bumped every time the dataset's content changes; 0 before the first load."""
+        entry = self._entries.get(name)
+        return entry.version if entry is not None else 0
+
+    def errors(self, names: Iterable[str]) -> Dict[str, str]:
+        return {
+            name: self._entries[name].error
+            for name in names
+            if name in self._entries and self._entries[name].error
+        }
+
+    def stats(self) -> pd.DataFrame:
+        rows = []
+        for name in self.loaders:
+            entry = self._entries.get(name)
+            rows.append({
+                "Dataset": name,
+                "Hits": entry.hits if entry else 0,
+                "Misses": entry.misses if entry else 0,
+                "Age (s)": round(entry.age) if entry else None,
+                "TTL (s)": self.ttls.get(name),
+                "Source": entry.source if entry else "-",
+                "Version": entry.version if entry else 0,
+                "Load (s)": round(entry.load_seconds, 2) if entry else None,
+            })
+        return pd.DataFrame(rows)
+
+    # ── invalidation ─────────────────────────────────────
+    def invalidate(self, name: Optional[str] = None):
+        """Drop one dataset (or all of them) so the next read fetches it again."""
+        with self._lock:
+            for key in ([name] if name is not None else list(self._entries)):
+                entry = self._entries.pop(key, None)
+                if entry is not None:
+                    # Carry the counters and version over so stats stay meaningful
+                    self._tombstones[key] = entry
+        if self.on_invalidate is not None:
+            self.on_invalidate(name)
+
+    # ── loading ──────────────────────────────────────────
+    def _load_snapshot(self, name):
+        with instrumentation.stage(f"snapshot {name}"):
+            snapshot = self.store.load(name)
+        if snapshot is not None:
+            self._entries[name] = CacheEntry(
+                frame=snapshot.frame,
+                loaded_at=snapshot.saved_at,
+                source="snapshot",
+                fingerprint=frame_fingerprint(snapshot.frame),
+            )
+
+    def _fetch(self, names, source):
+        results, timings = run_concurrently({name: self.loaders[name] for name in names}, self.policy)
+        fetched_at = time.time()
+        for name in names:
+            self._store_result(name, results[name], timings[name], fetched_at, source)
+            instrumentation.record(f"load {name}", timings[name], rows=len(self._entries[name].frame))
+
+    def _store_result(self, name, result, seconds, fetched_at, source):
+        error = None
+        if isinstance(result, SheetSchemaError):
+            error, result = str(result), pd.DataFrame()
+
+        previous = self._entries.get(name) or self._tombstones.pop(name, None)
+        fingerprint = frame_fingerprint(result)
+        entry = CacheEntry(
+            frame=result,
+            loaded_at=fetched_at,
+            source=source,
+            fingerprint=fingerprint,
+            load_seconds=seconds,
+            error=error,
+        )
+        if previous is not None:
+            entry.hits, entry.misses = previous.hits, previous.misses
+            # Unchanged content keeps its version, so derived tables stay valid
+            if previous.fingerprint == fingerprint:
+                entry.frame = previous.frame
+                entry.version = previous.version
+            else:
+                entry.version = previous.version + 1
+        self._entries[name] = entry
+
+        if name in self.snapshot_names and error is None:
+            self.store.save(name, result, saved_at=fetched_at)
+
+    def _revalidate(self, names):
+        try:
+            results, timings = run_concurrently({name: self.loaders[name] for name in names}, self.policy)
+            fetched_at = time.time()
+            with self._lock:
+                for name in names:
+                    self._store_result(name, results[name], timings[name], fetched_at, "network (background)")
+        except Exception as e:
+            # Keep serving the stale entries and try again one TTL later
+            logger.warning("Background revalidation of %s failed: %s", ", ".join(names), e)
+            retry_at = time.time() + min(self.ttls.get(name, 60) for name in names)
+            self._retry_after.update({name: retry_at for name in names})
+        finally:
+            self._revalidating.difference_update(names)
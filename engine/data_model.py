@@ -0,0 +1,108 @@
+"""Normalized frames shared by every session.
+
+The cleaned frames are normalized once per load: dates become datetime64,
+text keys are stripped and the derived columns the pages need (Year, Month,
+YearMonth, previous amount, ...) are precomputed.  Repeated text (names,
+vehicles, types, months) is stored as categoricals, so filters and groupbys
+compare integer codes, and every month also has an integer key (YYYYMM).
+The cached frames are never modified afterwards; pages work on ``view()``s,
+which are zero-copy under pandas Copy-on-Write and copy a column only if a
+page writes to it.
+"""
+import calendar
+
+import numpy as np
+import pandas as pd
+
+
+MONTH_NAMES = pd.CategoricalDtype(list(calendar.month_name)[1:], ordered=True)
+
+
+def enable_copy_on_write():
+    # Default (and no longer configurable) from pandas 3.0 on
+    if int(pd.__version__.split(".")[0]) < 3:
+        pd.set_option("mode.copy_on_write", True)
+
+
+def view(df: pd.DataFrame) -> pd.DataFrame:
+    """Shallow, copy-on-write view of a shared frame."""
+    return df.copy(deep=False)
+
+
+def strip_text(series: pd.Series) -> pd.Series:
+    """Strip whitespace; categoricals stay categorical (only the labels are touched)."""
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        labels = series.cat.categories.astype(str).str.strip()
+        if labels.is_unique:
+            return series.cat.rename_categories(labels)
+        return series.map(dict(zip(series.cat.categories, labels))).astype("category")
+    return series.astype(str).str.strip()
+
+
+def month_key(dates: pd.Series) -> pd.Series:
+    """YYYYMM as int32, 0 for undated rows."""
+    keys = dates.dt.year * 100 + dates.dt.month
+    return keys.fillna(0).astype(np.int32)
+
+
+def month_labels(keys: pd.Series) -> pd.Series:
+    """Ordered "YYYY-MM" categorical for month keys; undated rows are NaN."""
+    months = np.unique(keys[keys > 0].to_numpy())
+    labels = [f"{k // 100:04d}-{k % 100:02d}" for k in months]
+    codes = np.searchsorted(months, keys.to_numpy())
+    codes[keys.to_numpy() == 0] = -1
+    return pd.Series(
+        pd.Categorical.from_codes(codes, dtype=pd.CategoricalDtype(labels, ordered=True)),
+        index=keys.index,
+    )
+
+
+def _add_calendar_columns(df: pd.DataFrame, date_col: str) -> pd.DataFrame:
+    dates = df[date_col]
+    keys = month_key(dates)
+    return df.assign(
+        Year=dates.dt.year,
+        Month=pd.Categorical.from_codes(
+            dates.dt.month.fillna(0).to_numpy(dtype=np.int64) - 1, dtype=MONTH_NAMES
+        ),
+        Month_Num=dates.dt.month,
+        YearMonth=month_labels(keys),
+        **{"Month Key": keys},
+    )
+
+
+def normalize_collection(df: pd.DataFrame) -> pd.DataFrame:
+    df = df.copy()
+    df.columns = df.columns.str.strip()
+    df["Collection Date"] = pd.to_datetime(df["Collection Date"], errors="coerce").dt.normalize()
+    df["Vehicle No"] = strip_text(df["Vehicle No"])
+    df["Distance"] = df["Distance"].round(2)
+
+    # Frame is sorted by vehicle and date, so the previous row is the previous collection
+    df = df.sort_values(["Vehicle No", "Collection Date"], kind="mergesort")
+    df["Previous Amount"] = df.groupby("Vehicle No", observed=True)["Amount"].shift(1)
+    df["Change"] = df["Amount"] - df["Previous Amount"]
+    return _add_calendar_columns(df, "Collection Date")
+
+
+def normalize_expense(df: pd.DataFrame) -> pd.DataFrame:
+    df = df.copy()
+    df.columns = df.columns.str.strip()
+    df["Date"] = pd.to_datetime(df["Date"], errors="coerce").dt.normalize()
+    return _add_calendar_columns(df, "Date")
+
+
+def normalize_investment(df: pd.DataFrame) -> pd.DataFrame:
+    df = df.copy()
+    df.columns = df.columns.str.strip()
+    df["Date"] = pd.to_datetime(df["Date"], errors="coerce").dt.normalize()
+    return df
+
+
+def normalize_bank(df: pd.DataFrame) -> pd.DataFrame:
+    df = df.copy()
+    df.columns = df.columns.str.strip()
+    df["Date"] = pd.to_datetime(df["Date"], errors="coerce").dt.normalize()
+    df["Amount"] = pd.to_numeric(df["Amount"], errors="coerce").fillna(0)
+    df["Transaction Type"] = strip_text(df["Transaction Type"])
+    return _add_calendar_columns(df, "Date")
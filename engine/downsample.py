@@ -0,0 +1,90 @@
+"""Server-side downsampling of time-series charts.
+
+Long ranges ("5 Years", "Max") used to ship every raw point to the browser.
+Two reductions, applied to a frame indexed by date:
+
+* ``bucket`` - totals per week / month, chosen from the range preset, for
+  charts of amounts per day (the per-vehicle trend);
+* ``lttb``   - Largest-Triangle-Three-Buckets, which keeps the raw points
+  that preserve the visual shape (peaks, dips) of each series, for charts of
+  individual records (the dashboard trend).
+
+``downsample_chart`` applies the bucket of the range (if any) and then caps
+the frame at ``max_points`` rows with LTTB.
+"""
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+
+MAX_CHART_POINTS = 1500
+
+# Resampling frequency of summed charts per range preset; None keeps days
+RANGE_BUCKETS = {
+    "1 Week": None,
+    "1 Month": None,
+    "3 Months": None,
+    "6 Months": None,
+    "1 Year": "W",
+    "3 Years": "W",
+    "5 Years": "MS",
+    "Max": "MS",
+}
+
+BUCKET_LABELS = {"W": "Weekly", "MS": "Monthly"}
+
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+    """Positions of the ``n_out`` points LTTB keeps of the series (x sorted)."""
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    x = np.asarray(x, dtype="float64")
+    y = np.nan_to_num(np.asarray(y, dtype="float64"))
+    # n_out - 2 buckets between the first and the last point, which are always kept
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    picked = np.empty(n_out, dtype=np.int64)
+    picked[0], picked[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        start, end = edges[i], edges[i + 1]
+        next_end = edges[i + 2] if i + 2 < len(edges) else n
+        avg_x, avg_y = x[end:next_end].mean(), y[end:next_end].mean()
+        # Point of this bucket forming the largest triangle with the last kept point and the next bucket's mean
+        area = np.abs((x[a] - avg_x) * (y[start:end] - y[a]) - (x[a] - x[start:end]) * (avg_y - y[a]))
+        a = start + int(np.argmax(area))
+        picked[i + 1] = a
+    return picked
+
+
+def lttb(frame: pd.DataFrame, max_points: int = MAX_CHART_POINTS) -> pd.DataFrame:
+    """Rows LTTB keeps for any numeric column of a date-indexed, date-sorted frame."""
+    if len(frame) <= max_points:
+        return frame
+    x = frame.index.to_numpy(dtype="datetime64[ns]").astype("int64")
+    x = (x - x[0]) / 86_400e9  # days; keeps the triangle areas well-scaled
+    columns = frame.select_dtypes("number").columns
+    keep = np.unique(np.concatenate([
+        lttb_indices(x, frame[column].to_numpy(dtype="float64", na_value=np.nan), max_points) for column in columns
+    ])) if len(columns) else np.arange(len(frame))
+    return frame.iloc[keep]
+
+
+def bucket(frame: pd.DataFrame, freq: Optional[str], how: str = "sum") -> pd.DataFrame:
+    """Aggregate a date-indexed frame per ``freq`` ("W", "MS"); None leaves it unchanged."""
+    if freq is None or frame.empty:
+        return frame
+    return frame.resample(freq).agg(how)
+
+
+def downsample_chart(
+    frame: pd.DataFrame,
+    range_option: str,
+    max_points: int = MAX_CHART_POINTS,
+    how: Optional[str] = None,
+) -> pd.DataFrame:
+    """Chart frame for ``range_option``: bucketed with ``how`` (if given), then capped by LTTB."""
+    if how is not None:
+        frame = bucket(frame, RANGE_BUCKETS.get(range_option), how)
+    return lttb(frame, max_points)
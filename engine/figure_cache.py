@@ -0,0 +1,93 @@
+"""LRU cache of rendered charts.
+
+Pages rebuild their chart frames (pivots, set_index, ...) and matplotlib
+figures on every widget interaction even when neither the data nor the
+chart's own filters changed.  FigureCache keeps the result of each chart
+build under ``(chart id, key)``, where the key holds the versions of the
+datasets it reads and the filter values it depends on, so an unchanged
+chart costs a dict lookup.  Entries are evicted least-recently-used once
+the entry count or the byte budget is exceeded.
+
+Matplotlib figures are never cached themselves: ``render_png`` draws a
+figure to PNG bytes and closes it, so figures do not pile up in pyplot's
+global registry.
+"""
+import io
+import threading
+from collections import OrderedDict
+from typing import Callable, Hashable, Tuple
+
+from engine import instrumentation
+from engine.instrumentation import payload_bytes
+
+
+def render_png(fig, dpi: int = 150) -> bytes:
+    """PNG bytes of a matplotlib figure; the figure is closed afterwards."""
+    import matplotlib.pyplot as plt
+
+    try:
+        buffer = io.BytesIO()
+        fig.savefig(buffer, format="png", dpi=dpi, bbox_inches="tight")
+        return buffer.getvalue()
+    finally:
+        plt.close(fig)
+
+
+class FigureCache:
+    def __init__(self, max_entries: int = 64, max_bytes: int = 32 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        # (chart id, key) -> (chart, bytes)
+        self._entries: "OrderedDict[Tuple[str, Hashable], Tuple[object, int]]" = OrderedDict()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+
+    def get(self, chart_id: str, key: Hashable, build: Callable[[], object]):
+        """The cached chart for ``(chart_id, key)``, built by ``build()`` on a miss."""
+        cache_key = (chart_id, key)
+        with self._lock:
+            entry = self._entries.get(cache_key)
+            if entry is not None:
+                self._entries.move_to_end(cache_key)
+                self.hits += 1
+                return entry[0]
+            self.misses += 1
+
+        with instrumentation.stage(f"chart {chart_id}"):
+            chart = build()
+        size = sum(map(payload_bytes, chart)) if isinstance(chart, tuple) else payload_bytes(chart)
+        with self._lock:
+            previous = self._entries.pop(cache_key, None)
+            if previous is not None:
+                self.bytes -= previous[1]
+            self._entries[cache_key] = (chart, size)
+            self.bytes += size
+            self._evict()
+        return chart
+
+    def _evict(self):
+        # Keep the newest entry even when it alone is over budget
+        while len(self._entries) > 1 and (len(self._entries) > self.max_entries or self.bytes > self.max_bytes):
+            _, (_, size) = self._entries.popitem(last=False)
+            self.bytes -= size
+            self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.bytes = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def stats(self) -> dict:
+        return {
+            "Charts": len(self),
+            "Hits": self.hits,
+            "Misses": self.misses,
+            "Evictions": self.evictions,
+            "KB": round(self.bytes / 1024, 1),
+        }
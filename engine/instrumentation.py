@@ -0,0 +1,174 @@
+"""Per-rerun instrumentation.
+
+A RerunProfile collects, for one run of the script: the time and row count
+of every named stage (dataset loads, derived-table builds, page compute),
+dataset cache hits and misses, and the bytes of HTML / tables shipped to the
+browser.  Engine code reports into whichever profile is active on the
+current thread through the module-level ``stage`` / ``record`` /
+``cache_event`` helpers, which do nothing when no profile is active, so the
+engine stays usable headless.
+
+Finished profiles are written to the ``engine.instrumentation`` logger as
+one JSON record per rerun; a profile can also capture a cProfile of the
+whole rerun.
+"""
+import cProfile
+import io
+import json
+import logging
+import pstats
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Optional
+
+import pandas as pd
+
+
+logger = logging.getLogger(__name__)
+
+_local = threading.local()
+
+
+def payload_bytes(payload) -> int:
+    """Size of what is sent to the browser: encoded text, or a frame's data."""
+    if isinstance(payload, str):
+        return len(payload.encode("utf-8"))
+    if isinstance(payload, (bytes, bytearray)):
+        return len(payload)
+    data = getattr(payload, "data", payload)  # Styler -> its frame
+    if isinstance(data, pd.DataFrame):
+        return int(data.memory_usage(deep=True, index=True).sum())
+    if isinstance(data, pd.Series):
+        return int(data.memory_usage(deep=True, index=True))
+    return 0
+
+
+class RerunProfile:
+    def __init__(self, label: str = "", capture_cprofile: bool = False):
+        self.label = label
+        self.started_at = time.time()
+        self._started = time.perf_counter()
+        # name -> [calls, seconds, rows]
+        self.stages: Dict[str, list] = {}
+        self.cache: Dict[str, Dict[str, int]] = {}
+        self.shipped: Dict[str, int] = {}
+        self._open: Dict[str, float] = {}
+        self.total_seconds: Optional[float] = None
+        self.cprofile_text: Optional[str] = None
+        self._cprofile = cProfile.Profile() if capture_cprofile else None
+        if self._cprofile is not None:
+            self._cprofile.enable()
+
+    # ── recording ────────────────────────────────────────
+    def record(self, name: str, seconds: float, rows: Optional[int] = None):
+        entry = self.stages.setdefault(name, [0, 0.0, 0])
+        entry[0] += 1
+        entry[1] += seconds
+        entry[2] += rows or 0
+
+    @contextmanager
+    def stage(self, name: str, rows: Optional[int] = None):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - start, rows)
+
+    def start(self, name: str):
+        """Open a stage that ``stop`` closes (for code a ``with`` block cannot wrap)."""
+        self._open[name] = time.perf_counter()
+
+    def stop(self, name: str, rows: Optional[int] = None):
+        started = self._open.pop(name, None)
+        if started is not None:
+            self.record(name, time.perf_counter() - started, rows)
+
+    def cache_event(self, name: str, hit: bool):
+        counts = self.cache.setdefault(name, {"hits": 0, "misses": 0})
+        counts["hits" if hit else "misses"] += 1
+
+    def ship(self, label: str, payload):
+        """Count ``payload`` as sent to the browser; returns it unchanged."""
+        self.shipped[label] = self.shipped.get(label, 0) + payload_bytes(payload)
+        return payload
+
+    # ── results ──────────────────────────────────────────
+    def finish(self) -> "RerunProfile":
+        for name in list(self._open):
+            self.stop(name)
+        if self.total_seconds is None:
+            self.total_seconds = time.perf_counter() - self._started
+        if self._cprofile is not None:
+            self._cprofile.disable()
+            out = io.StringIO()
+            pstats.Stats(self._cprofile, stream=out).sort_stats("cumulative").print_stats(40)
+            self.cprofile_text = out.getvalue()
+            self._cprofile = None
+        return self
+
+    @property
+    def shipped_bytes(self) -> int:
+        return sum(self.shipped.values())
+
+    def stage_frame(self) -> pd.DataFrame:
+        return pd.DataFrame(
+            [
+                {"Stage": name, "Calls": calls, "Seconds": round(seconds, 4), "Rows": rows}
+                for name, (calls, seconds, rows) in self.stages.items()
+            ],
+            columns=["Stage", "Calls", "Seconds", "Rows"],
+        )
+
+    def shipped_frame(self) -> pd.DataFrame:
+        return pd.DataFrame(
+            [{"Payload": label, "KB": round(n / 1024, 1)} for label, n in self.shipped.items()],
+            columns=["Payload", "KB"],
+        )
+
+    def as_record(self) -> dict:
+        return {
+            "label": self.label,
+            "started_at": round(self.started_at, 3),
+            "total_seconds": round(self.total_seconds or 0.0, 4),
+            "stages": {
+                name: {"calls": calls, "seconds": round(seconds, 4), "rows": rows}
+                for name, (calls, seconds, rows) in self.stages.items()
+            },
+            "cache": self.cache,
+            "shipped_bytes": self.shipped,
+        }
+
+    def log(self, **context):
+        logger.info(json.dumps({**context, **self.as_record()}, default=str))
+
+
+# ── active profile of the current thread ─────────────────
+def activate(profile: Optional[RerunProfile]):
+    _local.profile = profile
+
+
+def current() -> Optional[RerunProfile]:
+    return getattr(_local, "profile", None)
+
+
+def record(name: str, seconds: float, rows: Optional[int] = None):
+    profile = current()
+    if profile is not None:
+        profile.record(name, seconds, rows)
+
+
+@contextmanager
+def stage(name: str, rows: Optional[int] = None):
+    profile = current()
+    if profile is None:
+        yield
+        return
+    with profile.stage(name, rows):
+        yield
+
+
+def cache_event(name: str, hit: bool):
+    profile = current()
+    if profile is not None:
+        profile.cache_event(name, hit)
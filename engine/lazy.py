@@ -0,0 +1,113 @@
+"""Lazily materialized derived tables.
+
+Pages declare which tables they need; a table is only computed when a page
+asks for it, together with the datasets and tables it depends on.  Results
+are memoized against the versions of the underlying datasets, so a table is
+rebuilt only after one of its inputs actually changed.  Incremental tables
+also get their previous value, to update it instead of starting over.
+"""
+import threading
+import time
+from typing import Callable, Dict, Iterable, Tuple
+
+import pandas as pd
+
+from engine import instrumentation
+from engine.data_cache import DatasetCache
+from engine.data_model import view
+
+
+class DerivedTables:
+    def __init__(self, cache: DatasetCache):
+        self.cache = cache
+        self._nodes: Dict[str, Tuple[Tuple[str, ...], Callable, bool]] = {}
+        self._memo: Dict[str, tuple] = {}
+        self._timings: Dict[str, float] = {}
+        self._lock = threading.RLock()
+
+    def register(self, name: str, deps: Iterable[str], fn: Callable, incremental: bool = False):
+        """``fn`` is called with the dependencies' values, in ``deps`` order.
+
+        With ``incremental`` it is also passed ``previous=``, the value built
+        for the previous data version (None the first time).
+        """
+        deps = tuple(deps)
+        for dep in deps:
+            if dep not in self._nodes and dep not in self.cache.loaders:
+                raise KeyError(f"{name} depends on unknown table {dep!r}")
+        self._nodes[name] = (deps, fn, incremental)
+
+    def derived(self, name: str, *deps: str, incremental: bool = False):
+        """Decorator form of ``register``."""
+        def decorator(fn):
+            self.register(name, deps, fn, incremental)
+            return fn
+        return decorator
+
+    # ── dependency graph ─────────────────────────────────
+    @property
+    def names(self) -> list:
+        return list(self._nodes)
+
+    def datasets(self, names: Iterable[str]) -> list:
+        """Datasets the given tables transitively depend on."""
+        found, stack = [], list(names)
+        while stack:
+            name = stack.pop()
+            if name in self.cache.loaders:
+                if name not in found:
+                    found.append(name)
+            else:
+                stack.extend(self._nodes[name][0])
+        return found
+
+    def _key(self, name, versions):
+        return tuple(versions[d] for d in sorted(self.datasets([name])))
+
+    # ── evaluation ───────────────────────────────────────
+    def get_many(self, names: Iterable[str]) -> Dict[str, object]:
+        """Materialize ``names``, fetching the datasets they need concurrently first."""
+        return self.get_versioned(names)[0]
+
+    def get_versioned(self, names: Iterable[str]) -> Tuple[Dict[str, object], Dict[str, int]]:
+        """Like ``get_many``, plus the versions of the datasets the values were built from."""
+        names = list(names)
+        frames, versions = self.cache.get_versioned(self.datasets(names))
+        with self._lock:
+            return {name: self._evaluate(name, frames, versions) for name in names}, versions
+
+    def get(self, name: str):
+        return self.get_many([name])[name]
+
+    def _evaluate(self, name, frames, versions):
+        if name in self.cache.loaders:
+            return view(frames[name])
+
+        key = self._key(name, versions)
+        memo = self._memo.get(name)
+        if memo is None or memo[0] != key:
+            deps, fn, incremental = self._nodes[name]
+            args = [self._evaluate(dep, frames, versions) for dep in deps]
+            kwargs = {"previous": memo[1] if memo is not None else None} if incremental else {}
+            start = time.perf_counter()
+            value = fn(*args, **kwargs)
+            self._timings[name] = time.perf_counter() - start
+            instrumentation.record(
+                f"build {name}", self._timings[name], rows=len(value) if isinstance(value, pd.DataFrame) else None
+            )
+            self._memo[name] = memo = (key, value)
+
+        value = memo[1]
+        # Memoized frames are shared by every session
+        return view(value) if isinstance(value, pd.DataFrame) else value
+
+    def stats(self) -> pd.DataFrame:
+        return pd.DataFrame([
+            {
+                "Table": name,
+                "Depends on": ", ".join(self._nodes[name][0]),
+                "Built": name in self._memo,
+                "Build (s)": round(self._timings[name], 3) if name in self._timings else None,
+            }
+            for name in self._nodes
+        ])
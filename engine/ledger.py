@@ -0,0 +1,67 @@
+"""Bank ledger aggregates.
+
+One groupby turns the bank transactions into a (Transaction By, Transaction
+Type) -> Amount cube; every balance, credit or debit figure on the pages is a
+lookup into it instead of another boolean scan over the full frame.
+"""
+from typing import Iterable, Optional, Union
+
+import pandas as pd
+
+
+CREDIT_TYPES = ["Collection_Credit", "Investment_Credit", "Payment_Credit", "Settlement_Credit"]
+DEBIT_TYPES = ["Expence_Debit", "Settlement_Debit"]
+
+
+class Ledger:
+    def __init__(self, bank_df: pd.DataFrame):
+        if bank_df.empty or "Transaction Type" not in bank_df.columns:
+            self.cube = pd.Series(
+                dtype=float,
+                index=pd.MultiIndex.from_arrays([[], []], names=["Transaction By", "Transaction Type"]),
+            )
+        else:
+            self.cube = (
+                bank_df.groupby(["Transaction By", "Transaction Type"], dropna=False, observed=True)["Amount"]
+                .sum()
+            )
+        # Person x type table, people without a transaction of a type get 0
+        self.table = self.cube.unstack("Transaction Type", fill_value=0)
+
+    @property
+    def people(self) -> list:
+        return [p for p in self.table.index if pd.notna(p)]
+
+    @property
+    def transaction_types(self) -> list:
+        return list(self.table.columns)
+
+    def total(self, types: Union[str, Iterable[str]], person: Optional[str] = None) -> float:
+        """Sum of the given transaction type(s), for everyone or for one person."""
+        types = [types] if isinstance(types, str) else list(types)
+        columns = [t for t in types if t in self.table.columns]
+        if not columns:
+            return 0.0
+        if person is None:
+            return float(self.table[columns].to_numpy().sum())
+        if person not in self.table.index:
+            return 0.0
+        return float(self.table.loc[person, columns].sum())
+
+    def _matching(self, word):
+        return [t for t in self.table.columns if isinstance(t, str) and word in t.lower()]
+
+    def credits(self, person: Optional[str] = None) -> float:
+        """Every transaction type containing "credit"."""
+        return self.total(self._matching("credit"), person)
+
+    def debits(self, person: Optional[str] = None) -> float:
+        """Every transaction type containing "debit"."""
+        return self.total(self._matching("debit"), person)
+
+    def balance(self) -> float:
+        """Bank balance from the known credit and debit types."""
+        return self.total(CREDIT_TYPES) - self.total(DEBIT_TYPES)
+
+    def person_summary(self, person: str) -> dict:
+        return {t: self.total(t, person) for t in CREDIT_TYPES + DEBIT_TYPES}
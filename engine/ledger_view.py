@@ -0,0 +1,93 @@
+"""Bank transaction log rendering.
+
+Signed amounts, their colour classes and the bill links are computed with
+column-wise string operations, and only the page being shown is turned into
+HTML, so the log renders in time proportional to the page size.
+"""
+import numpy as np
+import pandas as pd
+
+
+LEDGER_COLUMNS = ["Date", "Transaction By", "Transaction Type", "Reason", "Amount", "Bill"]
+LEDGER_PAGE_SIZES = [50, 100, 250, 500]
+
+LEDGER_TABLE_CSS = """
+<style>
+    .full-width-table {
+        width: 100%;
+        overflow-x: auto;
+    }
+    .ledger-table {
+        width: 100%;
+        border-collapse: collapse;
+    }
+    .ledger-table th, .ledger-table td {
+        padding: 4px 8px;
+        border-bottom: 1px solid #ddd;
+        text-align: left;
+    }
+    .ledger-table .credit { color: green; }
+    .ledger-table .debit { color: red; }
+</style>
+"""
+
+
+def _escape(values: pd.Series) -> pd.Series:
+    values = values.astype(object).where(values.notna(), "").astype(str)
+    return (
+        values.str.replace("&", "&amp;", regex=False)
+        .str.replace("<", "&lt;", regex=False)
+        .str.replace(">", "&gt;", regex=False)
+        .str.replace('"', "&quot;", regex=False)
+        # The row pieces are concatenated as object: pandas 3 cannot add an empty "str" Series to one
+        .astype(object)
+    )
+
+
+def _thousands(values: np.ndarray) -> pd.Series:
+    """``f"{v:,.0f}"`` for a whole column."""
+    rounded = np.round(values)
+    digits = pd.Series(np.abs(rounded).astype(np.int64).astype(str), dtype=object)
+    grouped = digits.str.replace(r"(\d)(?=(\d{3})+$)", r"\1,", regex=True).astype(object)
+    return pd.Series(np.where(rounded < 0, "-", ""), dtype=object) + grouped
+
+
+def signed_amounts(df: pd.DataFrame) -> pd.DataFrame:
+    """Formatted amount ("+₹1,200" / "-₹300" / "₹0") and its CSS class per row."""
+    amounts = pd.to_numeric(df["Amount"], errors="coerce").fillna(0).to_numpy(dtype=float)
+    kinds = df["Transaction Type"].astype(object).where(df["Transaction Type"].notna(), "").astype(str).str.lower()
+    credit = kinds.str.contains("credit", regex=False).to_numpy()
+    debit = kinds.str.contains("debit", regex=False).to_numpy() & ~credit
+
+    sign = np.select([credit, debit], ["+", "-"], default="")
+    text = pd.Series(sign, dtype=object) + "₹" + _thousands(amounts)
+    css = np.select([credit, debit], ["credit", "debit"], default="")
+    return pd.DataFrame({"Amount": text.to_numpy(), "Class": css.astype(object)}, index=df.index)
+
+
+def bill_links(bills: pd.Series) -> pd.Series:
+    urls = bills.astype(object).where(bills.notna(), "").astype(str)
+    is_link = urls.str.startswith("http")
+    links = '<a href="' + _escape(urls) + '" target="_blank">View Bill</a>'
+    return links.where(is_link, "")
+
+
+def render_ledger_html(df: pd.DataFrame) -> str:
+    """HTML table for a (windowed) slice of the bank transactions."""
+    amounts = signed_amounts(df)
+    dates = df["Date"].dt.strftime("%Y-%m-%d").fillna("")
+    rows = (
+        "<tr><td>" + dates.astype(object)
+        + "</td><td>" + _escape(df["Transaction By"])
+        + "</td><td>" + _escape(df["Transaction Type"])
+        + "</td><td>" + _escape(df["Reason"])
+        + '</td><td class="' + amounts["Class"] + '">' + amounts["Amount"]
+        + "</td><td>" + bill_links(df["Bill"])
+        + "</td></tr>"
+    )
+    header = "".join(f"<th>{col}</th>" for col in LEDGER_COLUMNS)
+    return (
+        f'<table class="ledger-table"><thead><tr>{header}</tr></thead><tbody>'
+        + "".join(rows)
+        + "</tbody></table>"
+    )
@@ -0,0 +1,137 @@
+"""Concurrent loading of the data sheets.
+
+Every sheet is fetched and parsed on its own worker thread.  Each attempt has
+its own timeout and failed or timed-out attempts are retried up to a fixed
+number of times, so one slow sheet no longer delays the others.
+"""
+import logging
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Callable, Dict
+
+import pandas as pd
+
+
+logger = logging.getLogger(__name__)
+
+
+class SheetLoadError(RuntimeError):
+    """A sheet could not be loaded within the retry policy."""
+
+    def __init__(self, name, cause):
+        super().__init__(f"Failed to load '{name}': {cause}")
+        self.name = name
+        self.cause = cause
+
+
+class SheetSchemaError(ValueError):
+    """The sheet was fetched but is missing required columns (never retried)."""
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    attempts: int = 3
+    timeout: float = 30.0  # seconds per attempt
+    backoff: float = 0.5  # seconds, multiplied by the attempt number
+
+
+DEFAULT_POLICY = RetryPolicy()
+
+
+@dataclass(frozen=True)
+class DataBundle:
+    collection: pd.DataFrame
+    expense: pd.DataFrame
+    investment: pd.DataFrame
+    bank: pd.DataFrame
+    timings: Dict[str, float] = field(default_factory=dict)
+    total_seconds: float = 0.0
+    errors: Dict[str, str] = field(default_factory=dict)
+
+
+def run_concurrently(tasks: Dict[str, Callable], policy: RetryPolicy = DEFAULT_POLICY):
+    """Run every task on its own thread; return (results, timings) keyed by task name.
+
+    Timed-out attempts cannot be interrupted, they are abandoned and retried on
+    a fresh thread.  SheetSchemaError results are returned as-is.
+    """
+    results, timings = {}, {}
+    attempts = {name: 0 for name in tasks}
+    pending = {}
+    executor = ThreadPoolExecutor(
+        max_workers=max(len(tasks) * policy.attempts, 1),
+        thread_name_prefix="sheet-load",
+    )
+
+    def submit(name):
+        attempts[name] += 1
+        pending[executor.submit(tasks[name])] = (name, time.perf_counter())
+
+    def retry_or_fail(name, error):
+        logger.warning("Attempt %d for %s failed: %s", attempts[name], name, error)
+        if attempts[name] >= policy.attempts:
+            raise SheetLoadError(name, error)
+        time.sleep(policy.backoff * attempts[name])
+        submit(name)
+
+    try:
+        for name in tasks:
+            submit(name)
+
+        while pending:
+            next_deadline = min(started for _, started in pending.values()) + policy.timeout
+            done, _ = wait(
+                list(pending),
+                timeout=max(next_deadline - time.perf_counter(), 0),
+                return_when=FIRST_COMPLETED,
+            )
+            for future in done:
+                name, started = pending.pop(future)
+                error = future.exception()
+                if error is None or isinstance(error, SheetSchemaError):
+                    results[name] = error if error is not None else future.result()
+                    timings[name] = time.perf_counter() - started
+                else:
+                    retry_or_fail(name, error)
+
+            now = time.perf_counter()
+            for future, (name, started) in list(pending.items()):
+                if now - started >= policy.timeout:
+                    del pending[future]
+                    future.cancel()
+                    retry_or_fail(name, TimeoutError(f"no response after {policy.timeout:g}s"))
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    return results, timings
+
+
+def load_bundle(loaders: Dict[str, Callable], policy: RetryPolicy = DEFAULT_POLICY) -> DataBundle:
+    """Load collection, expense, investment and bank frames concurrently."""
+    started = time.perf_counter()
+    results, timings = run_concurrently(loaders, policy)
+    total = time.perf_counter() - started
+
+    frames, errors = {}, {}
+    for name, result in results.items():
+        if isinstance(result, SheetSchemaError):
+            errors[name] = str(result)
+            frames[name] = pd.DataFrame()
+        else:
+            frames[name] = result
+
+    logger.info(
+        "Cold start: %.2fs (%s)",
+        total,
+        ", ".join(f"{name} {seconds:.2f}s" for name, seconds in sorted(timings.items())),
+    )
+    return DataBundle(
+        collection=frames["collection"],
+        expense=frames["expense"],
+        investment=frames["investment"],
+        bank=frames["bank"],
+        timings=timings,
+        total_seconds=total,
+        errors=errors,
+    )
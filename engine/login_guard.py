@@ -0,0 +1,172 @@
+"""Password verification off the script thread, with attempt throttling.
+
+bcrypt is deliberately slow (~250 ms at cost 12) and used to run on the
+Streamlit script thread, so a burst of logins serialised behind it.
+PasswordVerifier runs it on a small shared thread pool (bcrypt releases the
+GIL, so threads hash in parallel) and turns attempts away without hashing
+when the pool is saturated or when the username or client IP has too many
+recent failures.  Successful logins with a hash below the configured cost
+are rehashed in the background and handed to ``on_rehash`` for storage.
+"""
+import logging
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeout
+from dataclasses import dataclass
+from typing import Callable, Deque, Dict, Optional
+
+import bcrypt
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_ROUNDS = 12
+
+
+def hash_rounds(stored_hash: str) -> Optional[int]:
+    """Cost factor of a ``$2b$12$...`` hash, None if it cannot be read."""
+    parts = stored_hash.split("$")
+    try:
+        return int(parts[2])
+    except (IndexError, ValueError):
+        return None
+
+
+class AttemptLimiter:
+    """Sliding window of failed attempts per key (username or IP)."""
+
+    def __init__(self, max_failures: int, window: float):
+        self.max_failures = max_failures
+        self.window = window
+        self._failures: Dict[str, Deque[float]] = {}
+        self._lock = threading.Lock()
+
+    def _recent(self, key: str, now: float) -> Deque[float]:
+        failures = self._failures.get(key)
+        if failures is None:
+            return deque()
+        while failures and now - failures[0] > self.window:
+            failures.popleft()
+        if not failures:
+            del self._failures[key]
+        return failures
+
+    def retry_after(self, key: str) -> float:
+        """Seconds until ``key`` may try again; 0 when it is not throttled."""
+        now = time.time()
+        with self._lock:
+            failures = self._recent(key, now)
+            if len(failures) < self.max_failures:
+                return 0.0
+            return failures[len(failures) - self.max_failures] + self.window - now
+
+    def fail(self, key: str):
+        with self._lock:
+            self._failures.setdefault(key, deque()).append(time.time())
+
+    def reset(self, key: str):
+        with self._lock:
+            self._failures.pop(key, None)
+
+
+@dataclass(frozen=True)
+class Verification:
+    ok: bool
+    # "ok", "invalid", "unknown" (no such user), "throttled" or "busy"
+    reason: str
+    seconds: float = 0.0
+    retry_after: float = 0.0
+
+
+class PasswordVerifier:
+    def __init__(
+        self,
+        workers: int = 2,
+        max_pending: int = 8,
+        rounds: int = DEFAULT_ROUNDS,
+        per_user: Optional[AttemptLimiter] = None,
+        per_ip: Optional[AttemptLimiter] = None,
+        timeout: float = 10.0,
+        on_rehash: Optional[Callable[[str, str], None]] = None,
+    ):
+        self.rounds = rounds
+        self.timeout = timeout
+        self.on_rehash = on_rehash
+        self.per_user = per_user or AttemptLimiter(max_failures=5, window=5 * 60)
+        self.per_ip = per_ip or AttemptLimiter(max_failures=20, window=5 * 60)
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="bcrypt")
+        # Hashes queued or running; attempts beyond this are turned away
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self._latencies: Deque[float] = deque(maxlen=500)
+        self.counts: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def _count(self, result: Verification) -> Verification:
+        with self._lock:
+            self.counts[result.reason] = self.counts.get(result.reason, 0) + 1
+            if result.reason in ("ok", "invalid"):
+                self._latencies.append(result.seconds)
+        return result
+
+    def _throttled(self, username: str, ip: Optional[str]) -> float:
+        wait = self.per_user.retry_after(username)
+        if ip:
+            wait = max(wait, self.per_ip.retry_after(ip))
+        return wait
+
+    def _fail(self, username: str, ip: Optional[str]):
+        self.per_user.fail(username)
+        if ip:
+            self.per_ip.fail(ip)
+
+    def verify(self, username: str, password: str, stored_hash: Optional[str], ip: Optional[str] = None) -> Verification:
+        """Check ``password`` against ``stored_hash`` (None for an unknown user)."""
+        wait = self._throttled(username, ip)
+        if wait > 0:
+            return self._count(Verification(False, "throttled", retry_after=wait))
+        if stored_hash is None:
+            self._fail(username, ip)
+            return self._count(Verification(False, "unknown"))
+        if not self._slots.acquire(blocking=False):
+            return self._count(Verification(False, "busy"))
+
+        started = time.perf_counter()
+        try:
+            future = self._pool.submit(bcrypt.checkpw, password.encode(), stored_hash.encode())
+            future.add_done_callback(lambda _: self._slots.release())
+        except BaseException:
+            self._slots.release()
+            raise
+        try:
+            ok = future.result(timeout=self.timeout)
+        except FutureTimeout:
+            return self._count(Verification(False, "busy"))
+        seconds = time.perf_counter() - started
+
+        if not ok:
+            self._fail(username, ip)
+            return self._count(Verification(False, "invalid", seconds))
+        self.per_user.reset(username)
+        rounds = hash_rounds(stored_hash)
+        if self.on_rehash is not None and rounds is not None and rounds < self.rounds:
+            self._pool.submit(self._rehash, username, password)
+        return self._count(Verification(True, "ok", seconds))
+
+    def _rehash(self, username: str, password: str):
+        try:
+            new_hash = bcrypt.hashpw(password.encode(), bcrypt.gensalt(self.rounds)).decode()
+            self.on_rehash(username, new_hash)
+        except Exception:  # noqa: BLE001 - the login already succeeded; retried on the next one
+            logger.exception("Rehashing the password of %s failed", username)
+
+    def stats(self) -> dict:
+        with self._lock:
+            latencies = sorted(self._latencies)
+            counts = dict(self.counts)
+
+        def percentile(q):
+            return round(latencies[min(len(latencies) - 1, int(q * len(latencies)))] * 1e3, 1) if latencies else None
+
+        return {**counts, "p50 (ms)": percentile(0.5), "p95 (ms)": percentile(0.95)}
@@ -0,0 +1,53 @@
+"""Loss matrix: per-row shortfall against the 300/day collection target.
+
+A driver who runs two vehicles on the same day is only expected to bring in
+one day's target.  The first vehicle carries the combined shortfall and the
+second is either zeroed or, when the driver covered their target, booked to
+"Zero Collection" as a company loss.
+"""
+import numpy as np
+import pandas as pd
+
+
+DAILY_TARGET = 300
+COMPANY_LOSS_NAME = "Zero Collection"
+
+
+def apply_loss_matrix_logic(input_df: pd.DataFrame) -> pd.DataFrame:
+    df_proc = input_df.dropna(subset=["Collection Date"])
+    df_proc = df_proc.assign(
+        Amount=(DAILY_TARGET - pd.to_numeric(df_proc["Amount"], errors="coerce").fillna(0))
+    )
+
+    # groupby() drops rows without a driver name, keep that behaviour
+    df_proc = df_proc[df_proc["Name"].notna()]
+    df_proc = df_proc.sort_values(by=["Collection Date", "Name", "Vehicle No"], kind="mergesort")
+
+    # 🔹 Group size / position of every row within its (date, driver) group
+    grouped = df_proc.groupby(["Collection Date", "Name"], sort=False, observed=True)["Amount"]
+    group_size = grouped.transform("size").to_numpy()
+    rank = grouped.cumcount().to_numpy()
+    total = grouped.transform("sum").to_numpy()
+
+    names = df_proc["Name"].to_numpy()
+    multi = (group_size > 1) & (names != COMPANY_LOSS_NAME)
+    is_first = multi & (rank == 0)
+    is_second = multi & (rank == 1)
+
+    # 🔹 First row carries the combined shortfall, second row the full total
+    first_loss = total - DAILY_TARGET
+    driver_covered = first_loss <= -DAILY_TARGET
+    amount = df_proc["Amount"].to_numpy()
+    amount = np.where(is_first, np.where(driver_covered, 0, first_loss), amount)
+    amount = np.where(is_second, total, amount)
+
+    df_proc = df_proc.assign(Amount=amount)
+    company_rows = is_second & ~driver_covered
+    if company_rows.any():
+        if isinstance(df_proc["Name"].dtype, pd.CategoricalDtype) and COMPANY_LOSS_NAME not in df_proc["Name"].cat.categories:
+            df_proc["Name"] = df_proc["Name"].cat.add_categories([COMPANY_LOSS_NAME])
+        df_proc.loc[company_rows, "Name"] = COMPANY_LOSS_NAME
+
+    # Only the first two rows of a multi-vehicle day are kept
+    keep = ~multi | (rank < 2)
+    return df_proc[keep].reset_index(drop=True)
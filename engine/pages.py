@@ -0,0 +1,186 @@
+"""What each dashboard page computes, without Streamlit.
+
+main.py reads the widgets, calls these with the pipeline's tables and
+renders the result; benchmarks/suite.py times the same calls on a synthetic
+fleet.  Range filters come in two flavours: the page presets ("All",
+"Current Month", "Last 6 Months", "Current Year", "Custom Date") and, for
+the monthly totals, the month-aligned start that lets a page read a rollup
+instead of grouping rows.
+"""
+from datetime import date
+from typing import Optional, Tuple
+
+import pandas as pd
+
+from engine.data_model import MONTH_NAMES
+from engine.ledger import Ledger
+from engine.ledger_view import LEDGER_COLUMNS
+from engine.loss_matrix import COMPANY_LOSS_NAME
+from engine.rollups import MonthlyRollup
+from engine.time_index import TimeIndex
+
+
+def month_aligned_start(range_option: str, today: pd.Timestamp):
+    """First month covered by a range filter that starts on a month boundary
+    (None for "All"), or False when the range cuts through a month."""
+    if range_option == "All":
+        return None
+    if range_option == "Current Month":
+        return today.to_period("M")
+    if range_option == "Current Year":
+        return pd.Period(year=today.year, month=1, freq="M")
+    return False
+
+
+def filter_period(index: TimeIndex, range_option: str, today: pd.Timestamp, start=None, end=None) -> pd.DataFrame:
+    """Rows of a page preset; "Custom Date" keeps every row until both ``start`` and ``end`` are picked."""
+    if range_option != "Custom Date":
+        return index.preset(range_option, today)
+    if isinstance(start, date) and isinstance(end, date):
+        return index.between(start, end)
+    return index.frame
+
+
+def loss_totals(losses: pd.DataFrame) -> Tuple[float, float, float]:
+    """(total, company, driver) loss of loss-matrix rows; company loss is the "Zero Collection" rows."""
+    if losses.empty or "Amount" not in losses.columns:
+        return 0, 0, 0
+    total = losses["Amount"].sum()
+    company = losses.loc[losses["Name"] == COMPANY_LOSS_NAME, "Amount"].sum()
+    return total, company, total - company
+
+
+# ── Dashboard ────────────────────────────────────────────
+def dashboard_metrics(balances: pd.DataFrame, ledger: Ledger, losses_by_date: TimeIndex, today: pd.Timestamp) -> dict:
+    """All-time totals, balances and this month's collection / loss figures."""
+    month = losses_by_date.between(today.replace(day=1), today + pd.offsets.MonthEnd(0))
+    total_loss, company_loss, _ = loss_totals(month)
+    total_loss, company_loss = max(0, total_loss), max(0, company_loss)
+    bank_balance = ledger.balance()
+    month_collection = balances["Month Collection"].sum()
+    return {
+        "total_collection": balances["Collection"].sum(),
+        "total_investment": balances["Investment"].sum() + ledger.total("Investment_Credit"),
+        "total_expense": balances["Expense"].sum() + balances["Bank Expense Debit"].sum(),
+        "bank_balance": bank_balance,
+        "net_balance": balances["Remaining Fund"].sum() + bank_balance,
+        "month_collection": month_collection,
+        "month_expense": balances["Month Expense"].sum(),
+        "month_total_loss": total_loss,
+        "month_company_loss": company_loss,
+        "month_driver_loss": max(0, total_loss - company_loss),
+        "month_collection_pct": round(month_collection / (month_collection + total_loss) * 100),
+        "month_loss_pct": round(total_loss / (month_collection + total_loss) * 100),
+    }
+
+
+# ── Grouped Data ─────────────────────────────────────────
+def grouped_collections(
+    collection: pd.DataFrame, group_by: str = "Name", month: str = "All", top_n: int = 10
+) -> pd.DataFrame:
+    """Top ``top_n`` groups by amount, with totals, collection count and averages, of one "Month-Year" or all."""
+    if month != "All":
+        collection = collection[collection["Month-Year"] == month]
+    grouped = collection.groupby(group_by, as_index=False, observed=True).agg({
+        "Amount": "sum",
+        "Distance": "sum",
+        "Collection Date": "count",
+    }).rename(columns={"Collection Date": "Total Collections"})
+    grouped["Avg Amount"] = grouped["Amount"] / grouped["Total Collections"]
+    grouped["Avg Distance"] = grouped["Distance"] / grouped["Total Collections"]
+    return grouped.sort_values(by="Amount", ascending=False).head(top_n)
+
+
+# ── Expenses ─────────────────────────────────────────────
+def expense_totals(
+    rollup: MonthlyRollup, rows: pd.DataFrame, range_option: str, today: pd.Timestamp, expense_by: str = "All"
+) -> pd.Series:
+    """Amount Used per (Month, Expense By): from the rollup for month-aligned ranges, else grouped from ``rows``."""
+    start = month_aligned_start(range_option, today)
+    if start is False:
+        months = rows["Date"].dt.to_period("M").rename("Month")
+        return rows.groupby([months, "Expense By"], observed=True)["Amount Used"].sum()
+    totals = rollup.totals(
+        by=["Expense By"], start=start, where=None if expense_by == "All" else {"Expense By": expense_by}
+    )["Amount Used"]
+    return totals[totals.index.get_level_values("Expense By").notna()]
+
+
+def expense_month_on_month(totals: pd.Series, months) -> pd.DataFrame:
+    """YearMonth x Expense By pivot of ``totals`` over ``months``."""
+    totals = totals[totals.index.get_level_values("Month").isin(months)]
+    pivot = totals.unstack("Expense By").fillna(0).sort_index()
+    pivot.index = pivot.index.astype(str).rename("YearMonth")
+    return pivot
+
+
+# ── Collection Data ──────────────────────────────────────
+def collection_kpis(collection: pd.DataFrame) -> dict:
+    mean_by_vehicle = collection.groupby("Vehicle No", observed=True)["Amount"].mean()
+    return {
+        "total_collection": collection["Amount"].sum(),
+        "vehicles": collection["Vehicle No"].nunique(),
+        "best_vehicle": mean_by_vehicle.idxmax(),
+        "worst_vehicle": mean_by_vehicle.idxmin(),
+        "records": len(collection),
+    }
+
+
+def collection_month_totals(
+    rollup: MonthlyRollup, rows: pd.DataFrame, range_option: str, today: pd.Timestamp, vehicle: str = "All"
+) -> pd.Series:
+    """Amount per month: from the rollup for month-aligned ranges, else grouped from ``rows``."""
+    start = month_aligned_start(range_option, today)
+    if start is False:
+        return rows.groupby(rows["Collection Date"].dt.to_period("M"))["Amount"].sum()
+    return rollup.totals(start=start, where=None if vehicle == "All" else {"Vehicle No": vehicle})["Amount"]
+
+
+def collection_log(rows: pd.DataFrame) -> pd.DataFrame:
+    """Collection records, newest first (stable for same-day records)."""
+    return rows.sort_values("Collection Date", ascending=False, kind="mergesort")
+
+
+# ── Bank Transaction ─────────────────────────────────────
+def closing_balance(rows: pd.DataFrame) -> float:
+    """Credits minus debits of the transactions in ``rows``."""
+    kinds = rows["Transaction Type"].str.lower()
+    credit = rows.loc[kinds.str.contains("credit", na=False), "Amount"].sum()
+    debit = rows.loc[kinds.str.contains("debit", na=False), "Amount"].sum()
+    return credit - debit
+
+
+def bank_monthly_summary(rollup: MonthlyRollup, rows: Optional[pd.DataFrame] = None) -> pd.DataFrame:
+    """Amount per calendar month name x Transaction Type, of ``rows`` or (None) of every transaction."""
+    if rows is not None:
+        by_month = rows.groupby(["Month", "Transaction Type"], observed=True)["Amount"]
+    else:
+        totals = rollup.totals(by=["Transaction Type"])["Amount"]
+        totals = totals[totals.index.get_level_values("Transaction Type").notna()]
+        # Calendar-ordered month names, like the rows' "Month" column
+        month_names = pd.CategoricalIndex(
+            totals.index.get_level_values("Month").strftime("%B"), dtype=MONTH_NAMES, name="Month"
+        )
+        by_month = totals.groupby([month_names, totals.index.get_level_values("Transaction Type")], observed=True)
+    return by_month.sum().unstack(fill_value=0).reset_index()
+
+
+def bank_log(rows: pd.DataFrame) -> pd.DataFrame:
+    """Ledger columns of ``rows``, newest first."""
+    return rows[LEDGER_COLUMNS].sort_values(by="Date", ascending=False, kind="mergesort")
+
+
+# ── Performance ──────────────────────────────────────────
+def filter_losses(
+    losses_by_date: TimeIndex, start=None, end=None, vehicle: str = "All", driver: str = "All"
+) -> pd.DataFrame:
+    """Loss-matrix rows between ``start`` and ``end`` (all rows unless both are given), of one vehicle / driver."""
+    if start is not None and end is not None:
+        losses = losses_by_date.between(start, end)
+    else:
+        losses = losses_by_date.frame
+    if vehicle != "All":
+        losses = losses[losses["Vehicle No"] == vehicle]
+    if driver != "All":
+        losses = losses[losses["Name"] == driver]
+    return losses
@@ -0,0 +1,15 @@
+"""Page windows over sorted frames, shared by the card grid and the bank log."""
+import math
+
+import pandas as pd
+
+
+def page_count(n_rows: int, page_size: int) -> int:
+    return max(1, math.ceil(n_rows / page_size))
+
+
+def page_window(df: pd.DataFrame, page: int, page_size: int) -> pd.DataFrame:
+    """Rows of the 1-based ``page``; out of range pages are clamped."""
+    page = min(max(1, page), page_count(len(df), page_size))
+    start = (page - 1) * page_size
+    return df.iloc[start:start + page_size]
@@ -0,0 +1,96 @@
+"""Pending-collection detection.
+
+Every vehicle is expected to report one collection per day, starting from its
+baseline date (the tracking start date, or its first collection if it joined
+the fleet later) up to the end of the tracking window.  A (vehicle, day) pair
+with no collection row is pending.
+"""
+import numpy as np
+import pandas as pd
+
+from engine.data_model import strip_text
+
+
+PENDING_COLUMNS = [
+    "Missing Date",
+    "Vehicle No",
+    "Last Meter Reading",
+    "Last Assigned Name",
+    "Last Collected Amount",
+    "Last Collection date",
+]
+
+
+def _to_objects(series):
+    # NaN -> None so downstream str()/quote() calls match the old row-by-row output
+    values = series.astype(object)
+    return values.where(series.notna(), None)
+
+
+def find_pending_collections(df: pd.DataFrame, start_date, end_date) -> pd.DataFrame:
+    """Return one row per missing (vehicle, day) between start_date and end_date.
+
+    Works in a single pass: the expected (vehicle, day) grid is built with
+    array ops, anti-joined against the observed collections and the last known
+    meter reading / amount / driver is attached with an as-of join.
+    """
+    start = pd.Timestamp(start_date).normalize()
+    end = pd.Timestamp(end_date).normalize()
+
+    observed = pd.DataFrame({
+        "Vehicle No": strip_text(df["Vehicle No"]),
+        "Collection Date": pd.to_datetime(df["Collection Date"], errors="coerce").dt.normalize(),
+        "Meter Reading": df["Meter Reading"],
+        "Amount": df["Amount"],
+        "Name": df["Name"],
+    }).dropna(subset=["Collection Date"])
+
+    if observed.empty or end < start:
+        return pd.DataFrame(columns=PENDING_COLUMNS)
+
+    # 🔹 Baseline per vehicle: first collection, but never before the tracking start
+    first_dates = observed.groupby("Vehicle No", observed=True)["Collection Date"].min()
+    baseline = first_dates.clip(lower=start)
+    n_days = ((end - baseline).dt.days + 1).clip(lower=0).to_numpy()
+
+    # 🔹 Expected grid: each vehicle is active on every day from its baseline to the end
+    total = int(n_days.sum())
+    offsets = np.arange(total) - np.repeat(np.cumsum(n_days) - n_days, n_days)
+    grid_vehicles = np.repeat(first_dates.index.to_numpy(), n_days)
+    grid_dates = np.repeat(baseline.to_numpy(), n_days) + offsets.astype("timedelta64[D]")
+
+    # 🔹 Anti-join against observed (vehicle, day) pairs
+    expected_keys = pd.MultiIndex.from_arrays([grid_vehicles, grid_dates])
+    observed_keys = pd.MultiIndex.from_arrays([observed["Vehicle No"], observed["Collection Date"]])
+    is_missing = ~expected_keys.isin(observed_keys)
+
+    missing = pd.DataFrame({
+        "Missing Date": grid_dates[is_missing],
+        "Vehicle No": grid_vehicles[is_missing],
+    })
+    if missing.empty:
+        return pd.DataFrame(columns=PENDING_COLUMNS)
+
+    # 🔹 Last known row strictly before each missing day
+    missing = missing.sort_values("Missing Date", kind="mergesort")
+    history = observed.sort_values("Collection Date", kind="mergesort")
+    missing["Vehicle No"] = missing["Vehicle No"].astype(history["Vehicle No"].dtype)
+    merged = pd.merge_asof(
+        missing,
+        history,
+        left_on="Missing Date",
+        right_on="Collection Date",
+        by="Vehicle No",
+        allow_exact_matches=False,
+        direction="backward",
+    )
+    merged = merged.sort_values(["Missing Date", "Vehicle No"], kind="mergesort").reset_index(drop=True)
+
+    return pd.DataFrame({
+        "Missing Date": merged["Missing Date"].dt.date,
+        "Vehicle No": merged["Vehicle No"],
+        "Last Meter Reading": _to_objects(merged["Meter Reading"]),
+        "Last Assigned Name": _to_objects(merged["Name"]),
+        "Last Collected Amount": _to_objects(merged["Amount"]),
+        "Last Collection date": _to_objects(merged["Collection Date"].dt.date),
+    })[PENDING_COLUMNS]
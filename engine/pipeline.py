@@ -0,0 +1,185 @@
+"""Headless dashboard engine.
+
+Pipeline wires a DataSource to the per-dataset cache and the derived-table
+graph every page reads from (ledger, partner balances, loss matrix, monthly
+rollups, date indexes, ...).  Nothing here imports Streamlit or needs
+secrets, so the same tables can be built in a worker process, a batch job or
+a benchmark:
+
+    python -m engine.pipeline exports/ loss_matrix collection_monthly
+"""
+import argparse
+import os
+import time
+from typing import Dict, Iterable, Optional
+
+import pandas as pd
+
+from engine.balances import discover_partners, partner_balances
+from engine.cleaning import (
+    COLLECTION_COLUMNS,
+    clean_bank,
+    clean_collection,
+    clean_expense,
+    clean_investment,
+    missing_investment_columns,
+)
+from engine.data_cache import DatasetCache
+from engine.data_model import normalize_bank, normalize_collection, normalize_expense, normalize_investment
+from engine.ingest import IngestReport
+from engine.lazy import DerivedTables
+from engine.ledger import Ledger
+from engine.loader import SheetSchemaError
+from engine.loss_matrix import apply_loss_matrix_logic
+from engine.rollups import build_rollup
+from engine.snapshot_store import SnapshotStore
+from engine.sources import DataSource, LocalFileSource
+from engine.time_index import TimeIndex
+
+
+DATASETS = ["collection", "expense", "investment", "bank"]
+
+# Seconds before a dataset is re-fetched in the background
+DEFAULT_TTLS = {
+    "collection": 5 * 60,
+    "expense": 15 * 60,
+    "investment": 60 * 60,
+    "bank": 15 * 60,
+}
+
+
+def prepare_collection(df: pd.DataFrame) -> pd.DataFrame:
+    return normalize_collection(clean_collection(df))
+
+
+def prepare_expense(df: pd.DataFrame) -> pd.DataFrame:
+    return normalize_expense(clean_expense(df))
+
+
+def prepare_investment(df: pd.DataFrame) -> pd.DataFrame:
+    # Ensure required columns exist
+    missing_columns = missing_investment_columns(df)
+    if missing_columns:
+        raise SheetSchemaError(f"❌ Missing columns in Investment Data: {missing_columns}")
+    return normalize_investment(clean_investment(df))
+
+
+def prepare_bank(df: pd.DataFrame) -> pd.DataFrame:
+    return normalize_bank(clean_bank(df))
+
+
+PREPARERS = {
+    "collection": prepare_collection,
+    "expense": prepare_expense,
+    "investment": prepare_investment,
+    "bank": prepare_bank,
+}
+
+
+def performance_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """Dated collection rows, missing amounts counted as 0."""
+    perf_df = df.dropna(subset=["Collection Date"])[COLLECTION_COLUMNS]
+    return perf_df.assign(Amount=perf_df["Amount"].fillna(0))
+
+
+def register_tables(tables: DerivedTables) -> DerivedTables:
+    """Every derived table the pages read, with its dependencies."""
+    tables.register("ledger", ["bank"], Ledger)
+    tables.register("partners", ["collection", "expense", "investment", "ledger"], discover_partners)
+
+    @tables.derived("partner_balances", "collection", "expense", "investment", "ledger")
+    def build_partner_balances(df, expense_df, investment_df, ledger):
+        return partner_balances(df, expense_df, investment_df, ledger, month=df["Month-Year"].max())
+
+    tables.register("performance", ["collection"], performance_frame)
+
+    # Loss Matrix over the full history
+    tables.register("loss_matrix", ["performance"], apply_loss_matrix_logic)
+
+    # Date-sorted copies for range filters
+    tables.register("collection_by_date", ["collection"], lambda df: TimeIndex(df, "Collection Date"))
+    tables.register("expense_by_date", ["expense"], lambda expense_df: TimeIndex(expense_df, "Date"))
+    tables.register("bank_by_date", ["bank"], lambda bank_df: TimeIndex(bank_df, "Date"))
+    tables.register("loss_matrix_by_date", ["loss_matrix"], lambda lm: TimeIndex(lm, "Collection Date"))
+
+    # Monthly rollups, updated in place of a rebuild when rows are only appended
+    @tables.derived("collection_monthly", "collection", incremental=True)
+    def build_collection_monthly(df, previous):
+        return build_rollup(df, "Collection Date", ["Received By", "Vehicle No"], ["Amount"], previous)
+
+    @tables.derived("expense_monthly", "expense", incremental=True)
+    def build_expense_monthly(expense_df, previous):
+        return build_rollup(expense_df, "Date", ["Expense By"], ["Amount Used"], previous)
+
+    @tables.derived("bank_monthly", "bank", incremental=True)
+    def build_bank_monthly(bank_df, previous):
+        return build_rollup(bank_df, "Date", ["Transaction By", "Transaction Type"], ["Amount"], previous)
+
+    return tables
+
+
+class Pipeline:
+    def __init__(
+        self,
+        source: DataSource,
+        ttls: Optional[Dict[str, float]] = None,
+        snapshot_dir: Optional[str] = None,
+    ):
+        self.source = source
+        # Last ingestion of every sheet (parse time, peak memory)
+        self.reports: Dict[str, IngestReport] = {}
+        self.cache = DatasetCache(
+            {name: (lambda name=name: self.load(name)) for name in DATASETS},
+            ttls=ttls if ttls is not None else DEFAULT_TTLS,
+            store=SnapshotStore(snapshot_dir) if snapshot_dir else None,
+            snapshot_names=DATASETS,
+            # A manual refresh re-downloads the sheet instead of syncing from the last row
+            on_invalidate=source.invalidate,
+        )
+        self.tables = register_tables(DerivedTables(self.cache))
+
+    def load(self, name: str) -> pd.DataFrame:
+        """Read one sheet from the source and clean it (no caching)."""
+        frame, report = self.source.read(name)
+        self.reports[name] = report
+        return PREPARERS[name](frame)
+
+    def get(self, name: str):
+        return self.tables.get(name)
+
+    def get_many(self, names: Iterable[str]) -> Dict[str, object]:
+        return self.tables.get_many(names)
+
+    def ingest_stats(self) -> pd.DataFrame:
+        return pd.DataFrame([
+            {
+                "Sheet": name,
+                "Source": report.source,
+                "Rows": report.rows,
+                "Parse (s)": round(report.seconds, 3),
+                "Peak (MB)": round(report.peak_mb, 2),
+            }
+            for name, report in self.reports.items()
+        ])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build dashboard tables from local CSV exports.")
+    parser.add_argument("directory", help="directory with collection.csv, expense.csv, investment.csv, bank.csv")
+    parser.add_argument("tables", nargs="*", help="tables to build (default: all)")
+    parser.add_argument("--snapshot-dir", help="also write the cleaned datasets here, for the app to start from")
+    args = parser.parse_args(argv)
+
+    pipeline = Pipeline(LocalFileSource(args.directory), snapshot_dir=args.snapshot_dir)
+    names = args.tables or [*DATASETS, *pipeline.tables.names]
+    started = time.perf_counter()
+    pipeline.get_many(names)
+    print(pipeline.ingest_stats().to_string(index=False))
+    print(pipeline.tables.stats().to_string(index=False))
+    print(f"built {len(names)} tables in {time.perf_counter() - started:.2f}s")
+    if args.snapshot_dir:
+        print(f"snapshots in {os.path.abspath(args.snapshot_dir)}")
+
+
+if __name__ == "__main__":
+    main()
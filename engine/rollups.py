@@ -0,0 +1,123 @@
+"""Monthly rollups: month x entity x measure sums.
+
+A rollup is built once per data version.  When a new version only adds rows
+(the common case: sheets are append-only), only the added rows are grouped
+and merged into the previous rollup; edited or deleted rows trigger a full
+rebuild.  Pages slice the rollup instead of grouping raw rows, so monthly
+views cost O(months x entities).
+"""
+from dataclasses import dataclass
+from typing import Dict, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+def _row_hashes(df: pd.DataFrame, columns) -> np.ndarray:
+    return pd.util.hash_pandas_object(df[list(columns)], index=False).to_numpy()
+
+
+def _occurrence(sorted_values: np.ndarray) -> np.ndarray:
+    """0 for the first occurrence of each value in a sorted array, 1 for the second, ..."""
+    positions = np.arange(sorted_values.size)
+    if sorted_values.size == 0:
+        return positions
+    is_first = np.empty(sorted_values.size, dtype=bool)
+    is_first[0] = True
+    np.not_equal(sorted_values[1:], sorted_values[:-1], out=is_first[1:])
+    return positions - np.maximum.accumulate(np.where(is_first, positions, 0))
+
+
+def _count_in(sorted_values: np.ndarray, values: np.ndarray) -> np.ndarray:
+    return np.searchsorted(sorted_values, values, side="right") - np.searchsorted(sorted_values, values, side="left")
+
+
+def _added_rows(hashes: np.ndarray, order: np.ndarray, previous_hashes: np.ndarray) -> Optional[np.ndarray]:
+    """Boolean mask of the rows not in ``previous_hashes`` (a sorted multiset), or
+    None when some previous row is gone, i.e. rows were edited or deleted.
+
+    ``order`` sorts ``hashes``.
+    """
+    current = hashes[order]
+    if not (_occurrence(previous_hashes) < _count_in(current, previous_hashes)).all():
+        return None
+    added = np.empty(hashes.size, dtype=bool)
+    added[order] = _occurrence(current) >= _count_in(previous_hashes, current)
+    return added
+
+
+@dataclass(frozen=True)
+class MonthlyRollup:
+    date_col: str
+    entities: Tuple[str, ...]
+    measures: Tuple[str, ...]
+    # One row per (Month, *entities): measure sums and the number of source rows
+    table: pd.DataFrame
+    # Sorted source row hashes, to find the rows added by the next version
+    row_hashes: np.ndarray
+    mode: str = "full"
+
+    @property
+    def months(self) -> pd.PeriodIndex:
+        return pd.PeriodIndex(self.table["Month"].unique(), freq="M").sort_values()
+
+    def totals(
+        self,
+        by: Sequence[str] = (),
+        start: Optional[pd.Period] = None,
+        where: Optional[Dict[str, object]] = None,
+    ) -> pd.DataFrame:
+        """Measure sums per Month (and ``by``), from ``start`` on, for rows matching ``where``."""
+        table = self.table
+        if start is not None:
+            table = table[table["Month"] >= start]
+        for column, value in (where or {}).items():
+            table = table[table[column] == value]
+        return table.groupby(["Month", *by], observed=True, dropna=False)[[*self.measures, "Rows"]].sum()
+
+
+def _aggregate(df: pd.DataFrame, date_col, entities, measures) -> pd.DataFrame:
+    months = df[date_col].dt.to_period("M").rename("Month")
+    table = (
+        df.assign(Rows=1)
+        .groupby([months, *[df[e] for e in entities]], observed=True, dropna=False)[[*measures, "Rows"]]
+        .sum()
+        .reset_index()
+    )
+    # Rows without a date have no month
+    return table[table["Month"].notna()]
+
+
+def _merge(previous: pd.DataFrame, added: pd.DataFrame, entities, measures) -> pd.DataFrame:
+    combined = pd.concat([previous, added], ignore_index=True)
+    return (
+        combined.groupby(["Month", *entities], observed=True, dropna=False)[[*measures, "Rows"]]
+        .sum()
+        .reset_index()
+    )
+
+
+def build_rollup(
+    df: pd.DataFrame,
+    date_col: str,
+    entities: Sequence[str],
+    measures: Sequence[str],
+    previous: Optional[MonthlyRollup] = None,
+) -> MonthlyRollup:
+    """Rollup of ``df``, reusing ``previous`` when ``df`` only adds rows to it."""
+    entities, measures = tuple(entities), tuple(measures)
+    hashes = _row_hashes(df, (date_col, *entities, *measures))
+    order = np.argsort(hashes)
+    row_hashes = hashes[order]
+
+    if previous is not None and (previous.entities, previous.measures) == (entities, measures):
+        added = _added_rows(hashes, order, previous.row_hashes)
+        if added is not None:
+            if not added.any():
+                return MonthlyRollup(date_col, entities, measures, previous.table, row_hashes, "unchanged")
+            delta = _aggregate(df[added], date_col, entities, measures)
+            table = _merge(previous.table, delta, entities, measures)
+            return MonthlyRollup(date_col, entities, measures, table, row_hashes, "append")
+
+    table = _aggregate(df, date_col, entities, measures)
+    return MonthlyRollup(date_col, entities, measures, table, row_hashes, "full")
@@ -0,0 +1,87 @@
+"""Signed, stateless session tokens.
+
+A token carries the username, role, display name, issue time and expiry,
+signed with HMAC-SHA256 under a server secret:
+
+    base64url(json claims) "." base64url(signature)
+
+The app keeps it in the URL (``?session=...``), so a reload or a new tab
+resumes the session from the token alone, with no auth-sheet read or
+bcrypt check.  Tokens cannot be revoked one by one; rotating the secret
+logs everybody out.  Anyone holding the URL holds the session until it
+expires, so keep the TTL short.
+"""
+import base64
+import hashlib
+import hmac
+import json
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+
+DEFAULT_TTL = 12 * 60 * 60
+
+
+def _b64encode(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode("ascii")
+
+
+def _b64decode(text: str) -> bytes:
+    return base64.urlsafe_b64decode(text + "=" * (-len(text) % 4))
+
+
+@dataclass(frozen=True)
+class SessionClaims:
+    username: str
+    role: str
+    name: str
+    issued_at: float
+    expires_at: float
+
+    def remaining(self, now: Optional[float] = None) -> float:
+        return self.expires_at - (time.time() if now is None else now)
+
+
+class SessionTokens:
+    def __init__(self, secret: str, ttl: float = DEFAULT_TTL):
+        if not secret:
+            raise ValueError("a session secret is required")
+        self._key = secret.encode()
+        self.ttl = ttl
+
+    def _sign(self, payload: str) -> str:
+        return _b64encode(hmac.new(self._key, payload.encode(), hashlib.sha256).digest())
+
+    def issue(self, username: str, role: str, name: str, now: Optional[float] = None) -> str:
+        now = time.time() if now is None else now
+        claims = {"u": username, "r": role, "n": name, "iat": int(now), "exp": int(now + self.ttl)}
+        payload = _b64encode(json.dumps(claims, separators=(",", ":")).encode())
+        return f"{payload}.{self._sign(payload)}"
+
+    def verify(self, token: Optional[str], now: Optional[float] = None) -> Optional[SessionClaims]:
+        """Claims of a well-signed, unexpired token; None otherwise."""
+        # Issued tokens are ASCII; a hand-edited one may not be (compare_digest raises on non-ASCII str)
+        if not token or not token.isascii() or token.count(".") != 1:
+            return None
+        payload, signature = token.split(".")
+        if not hmac.compare_digest(signature, self._sign(payload)):
+            return None
+        try:
+            claims = json.loads(_b64decode(payload))
+            session = SessionClaims(
+                username=str(claims["u"]),
+                role=str(claims["r"]),
+                name=str(claims["n"]),
+                issued_at=float(claims["iat"]),
+                expires_at=float(claims["exp"]),
+            )
+        except (ValueError, KeyError, TypeError):
+            return None
+        if session.remaining(now) <= 0:
+            return None
+        return session
+
+    def needs_refresh(self, session: SessionClaims, now: Optional[float] = None) -> bool:
+        """True past half of the token's lifetime (re-issue so active users stay signed in)."""
+        return session.remaining(now) < self.ttl / 2
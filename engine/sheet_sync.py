@@ -0,0 +1,110 @@
+"""Incremental sync of a worksheet into a local text snapshot.
+
+The sheets are append-only in normal use (Google Form responses), so after the
+first full download only rows below the last synced one are fetched.  Each
+sync also re-reads the header, the last synced row and one block of
+``verify_block`` earlier rows, walking through the sheet a block per sync; if
+any of them changed, rows were edited, inserted or deleted above the sync
+point and the snapshot is rebuilt from a full download.  An edit anywhere is
+therefore seen within ``synced rows / verify_block`` syncs, at the latest by
+the periodic full reload (``full_reload_every``), and ``invalidate()`` forces
+a full download on the next sync (a manual refresh).
+"""
+import threading
+import time
+
+import pandas as pd
+
+from engine.cleaning import raw_rows_to_frame
+
+
+def column_letter(n: int) -> str:
+    letters = ""
+    while n > 0:
+        n, rem = divmod(n - 1, 26)
+        letters = chr(65 + rem) + letters
+    return letters
+
+
+def _pad(row, width):
+    row = list(row[:width])
+    return row + [""] * (width - len(row))
+
+
+class SheetSync:
+    def __init__(self, worksheet, full_reload_every: int = 50, verify_block: int = 200):
+        self.worksheet = worksheet
+        self.full_reload_every = full_reload_every
+        self.verify_block = verify_block
+        self.header = None
+        self.rows = []  # raw sheet rows below the header, blank rows included
+        self.frame = None
+        self.last_sync = None
+        self.last_mode = None
+        self._syncs_since_full = 0
+        self._verify_from = 0  # first synced row of the next block to re-check
+        self._lock = threading.Lock()
+
+    @property
+    def synced_rows(self) -> int:
+        return len(self.rows)
+
+    def sync(self) -> pd.DataFrame:
+        """Bring the snapshot up to date and return it as a text frame."""
+        with self._lock:
+            if not self.header or self._syncs_since_full >= self.full_reload_every:
+                self._full_reload()
+            else:
+                self._incremental()
+            self.last_sync = time.time()
+            return self.frame
+
+    def invalidate(self):
+        """Download the whole sheet on the next sync."""
+        with self._lock:
+            self._syncs_since_full = self.full_reload_every
+
+    def _full_reload(self):
+        values = self.worksheet.get_all_values()
+        self.header = values[0] if values else []
+        self.rows = [_pad(row, len(self.header)) for row in values[1:]]
+        self.frame = raw_rows_to_frame(self.header, self.rows)
+        self._syncs_since_full = 0
+        self._verify_from = 0
+        self.last_mode = "full"
+
+    def _incremental(self):
+        width = len(self.header)
+        # Sheet row of the last synced data row (the header is row 1)
+        anchor_row = self.synced_rows + 1
+        anchor = self.rows[-1] if self.rows else self.header
+        # Rows above the anchor, one block per sync (the anchor itself is checked by the tail)
+        checked = self.synced_rows - 1
+        start = self._verify_from if self._verify_from < checked else 0
+        stop = min(start + self.verify_block, max(checked, 0))
+        ranges = [f"A1:{column_letter(width)}1", f"A{anchor_row}:{column_letter(width)}"]
+        if stop > start:
+            ranges.append(f"A{start + 2}:{column_letter(width)}{stop + 1}")
+        header_range, tail_range, *block_range = self.worksheet.batch_get(ranges)
+        header = _pad(header_range[0], width) if header_range else []
+        tail = [_pad(row, width) for row in tail_range]
+        block = [_pad(row, width) for row in (block_range[0] if block_range else [])]
+        # The API leaves out trailing blank rows of a range
+        block += [[""] * width] * (stop - start - len(block))
+
+        if header != self.header or not tail or tail[0] != anchor or block != self.rows[start:stop]:
+            self._full_reload()
+            return
+        self._verify_from = stop
+
+        new_rows = tail[1:]
+        self._syncs_since_full += 1
+        if not new_rows:
+            self.last_mode = "unchanged"
+            return
+
+        self.rows.extend(new_rows)
+        appended = raw_rows_to_frame(self.header, new_rows)
+        if not appended.empty:
+            self.frame = pd.concat([self.frame, appended], ignore_index=True)
+        self.last_mode = "append"
@@ -0,0 +1,96 @@
+"""On-disk snapshots of the cleaned frames.
+
+After a restart the app is served from the last snapshot straight away (see
+engine.data_cache) and the sheets are re-fetched in the background once the
+snapshot is older than its TTL.  Snapshots are Parquet when pyarrow is
+installed, pickle otherwise; a snapshot written with another SCHEMA_VERSION
+is ignored.
+"""
+import json
+import logging
+import os
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+import pandas as pd
+
+
+logger = logging.getLogger(__name__)
+
+# Bump whenever the cleaned frames change shape so old snapshots are not served
+SCHEMA_VERSION = 4
+
+try:
+    import pyarrow  # noqa: F401
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+
+
+@dataclass(frozen=True)
+class Snapshot:
+    frame: pd.DataFrame
+    saved_at: float
+
+    @property
+    def age(self) -> float:
+        return time.time() - self.saved_at
+
+
+class SnapshotStore:
+    def __init__(self, directory: str, schema_version: int = SCHEMA_VERSION):
+        self.directory = directory
+        self.schema_version = schema_version
+        os.makedirs(directory, exist_ok=True)
+
+    def _meta_path(self, name):
+        return os.path.join(self.directory, f"{name}.json")
+
+    def save(self, name: str, df: pd.DataFrame, saved_at: Optional[float] = None):
+        fmt = "parquet" if HAS_PYARROW else "pickle"
+        data_path = os.path.join(self.directory, f"{name}.{fmt}")
+        tmp_path = data_path + ".tmp"
+        try:
+            if fmt == "parquet":
+                df.to_parquet(tmp_path, index=False)
+            else:
+                df.to_pickle(tmp_path)
+        except (ValueError, TypeError) as e:
+            # Mixed-type object columns Arrow cannot encode
+            logger.warning("Parquet snapshot of %s failed (%s), using pickle", name, e)
+            fmt = "pickle"
+            data_path = os.path.join(self.directory, f"{name}.{fmt}")
+            tmp_path = data_path + ".tmp"
+            df.to_pickle(tmp_path)
+        os.replace(tmp_path, data_path)
+
+        meta = {
+            "schema_version": self.schema_version,
+            "saved_at": saved_at if saved_at is not None else time.time(),
+            "format": fmt,
+            "rows": len(df),
+        }
+        with open(self._meta_path(name) + ".tmp", "w") as f:
+            json.dump(meta, f)
+        os.replace(self._meta_path(name) + ".tmp", self._meta_path(name))
+
+    def load(self, name: str) -> Optional[Snapshot]:
+        try:
+            with open(self._meta_path(name)) as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if meta.get("schema_version") != self.schema_version:
+            return None
+
+        data_path = os.path.join(self.directory, f"{name}.{meta['format']}")
+        try:
+            if meta["format"] == "parquet":
+                frame = pd.read_parquet(data_path)
+            else:
+                frame = pd.read_pickle(data_path)
+        except Exception as e:
+            logger.warning("Ignoring unreadable snapshot %s: %s", name, e)
+            return None
+        return Snapshot(frame=frame, saved_at=meta["saved_at"])
@@ -0,0 +1,131 @@
+"""Pluggable data sources for the four sheets.
+
+A source turns a sheet name ("collection", "expense", "investment", "bank")
+into a typed frame plus an IngestReport, using the sheet's SheetSpec.  The
+engine does not care where the rows come from:
+
+* GspreadSource  - Sheets API through gspread, synced incrementally
+* GvizCsvSource  - the public gviz CSV export, streamed in chunks
+* LocalFileSource - CSV exports on disk (offline runs, batch jobs)
+* FrameSource    - raw text frames already in memory (benchmarks, workers)
+
+gspread and google-auth are only imported when a Sheets API connection is
+opened, so the other sources work without them.
+"""
+import os
+import threading
+from typing import Dict, Mapping, Optional, Tuple
+from urllib.parse import quote
+
+import pandas as pd
+
+from engine.ingest import SHEET_SPECS, IngestReport, ingest_frame, stream_csv
+from engine.loader import DEFAULT_POLICY, RetryPolicy, run_concurrently
+from engine.sheet_sync import SheetSync
+
+
+# Worksheet (tab) of every dataset in its spreadsheet
+SHEET_NAMES = {
+    "collection": "collection",
+    "expense": "expense",
+    "investment": "Investment_Details",
+    "bank": "Bank_Transaction",
+}
+
+SHEETS_SCOPES = ["https://www.googleapis.com/auth/spreadsheets", "https://www.googleapis.com/auth/drive"]
+
+
+def gviz_csv_url(sheet_id: str, sheet_name: str) -> str:
+    return f"https://docs.google.com/spreadsheets/d/{sheet_id}/gviz/tq?tqx=out:csv&sheet={quote(sheet_name)}"
+
+
+def open_worksheets(
+    service_account_info: dict,
+    locations: Mapping[str, Tuple[str, str]],
+    policy: RetryPolicy = DEFAULT_POLICY,
+) -> Dict[str, object]:
+    """Open ``{name: (spreadsheet id, worksheet name)}`` concurrently with one gspread client."""
+    import gspread
+    from google.oauth2.service_account import Credentials
+
+    creds = Credentials.from_service_account_info(service_account_info, scopes=SHEETS_SCOPES)
+    client = gspread.authorize(creds)
+    worksheets, _ = run_concurrently({
+        name: (lambda sheet_id=sheet_id, tab=tab: client.open_by_key(sheet_id).worksheet(tab))
+        for name, (sheet_id, tab) in locations.items()
+    }, policy)
+    return worksheets
+
+
+class DataSource:
+    """Base class: ``read(name)`` returns the typed frame and its IngestReport."""
+
+    label = "source"
+
+    def read(self, name: str) -> Tuple[pd.DataFrame, IngestReport]:
+        raise NotImplementedError
+
+    def invalidate(self, name: Optional[str] = None):
+        """Forget incremental state, so the next read of ``name`` (None: every sheet) is a full download."""
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.label})"
+
+
+class GspreadSource(DataSource):
+    label = "sheets api"
+
+    def __init__(self, worksheets: Mapping[str, object], full_reload_every: int = 50):
+        # One incremental sync per sheet, kept for the life of the source
+        self.syncs = {name: SheetSync(ws, full_reload_every=full_reload_every) for name, ws in worksheets.items()}
+
+    def read(self, name):
+        return ingest_frame(self.syncs[name].sync(), SHEET_SPECS[name], source=self.label)
+
+    def invalidate(self, name=None):
+        for sync in (self.syncs.values() if name is None else [self.syncs[name]]):
+            sync.invalidate()
+
+
+class GvizCsvSource(DataSource):
+    label = "gviz csv"
+
+    def __init__(self, sheet_ids: Mapping[str, str], sheet_names: Mapping[str, str] = SHEET_NAMES, chunksize: int = 10_000):
+        self.urls = {name: gviz_csv_url(sheet_id, sheet_names[name]) for name, sheet_id in sheet_ids.items()}
+        self.chunksize = chunksize
+
+    def read(self, name):
+        return stream_csv(self.urls[name], SHEET_SPECS[name], chunksize=self.chunksize, label=self.label)
+
+
+class LocalFileSource(DataSource):
+    label = "local csv"
+
+    def __init__(self, directory: str, pattern: str = "{name}.csv", chunksize: int = 10_000):
+        self.directory = directory
+        self.pattern = pattern
+        self.chunksize = chunksize
+
+    def path(self, name: str) -> str:
+        return os.path.join(self.directory, self.pattern.format(name=name))
+
+    def read(self, name):
+        return stream_csv(self.path(name), SHEET_SPECS[name], chunksize=self.chunksize, label=self.label)
+
+
+class FrameSource(DataSource):
+    label = "memory"
+
+    def __init__(self, frames: Mapping[str, pd.DataFrame]):
+        self.frames = dict(frames)
+        self._lock = threading.Lock()
+
+    def update(self, name: str, frame: pd.DataFrame):
+        with self._lock:
+            self.frames[name] = frame
+
+    def read(self, name):
+        with self._lock:
+            frame = self.frames[name]
+        return ingest_frame(frame, SHEET_SPECS[name], source=self.label)
+
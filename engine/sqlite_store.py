@@ -0,0 +1,311 @@
+"""Local SQLite copy of the four sheets and the auth table.
+
+The store keeps one table per dataset, typed after its SheetSpec (dates as
+ISO text, numbers NUMERIC so whole amounts stay integers).  SqliteSource
+serves the engine from it.  The store holds the ingested sheet rows, not
+the cleaned frames (no Distance, Previous Amount or calendar columns), so
+pages keep filtering and grouping the in-memory tables; the one page query
+run in SQL is the Expenses month-on-month total for a range that cuts
+through a month (``monthly_totals``), and only its indexes are created.
+With an upstream source (the Sheets) every read is taken from the upstream and
+written through to the store (only appended rows are inserted, and nothing
+is written when the frame is unchanged), and the local rows are served when
+the upstream cannot be reached, so the dashboard keeps working offline.
+Without an upstream it is a plain local backend, e.g. for tests and batch
+jobs:
+
+    python -m engine.sqlite_store data.db import exports/
+    python -m engine.sqlite_store data.db stats
+"""
+import argparse
+import logging
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterable, Mapping, Optional, Sequence, Tuple
+
+import pandas as pd
+
+from engine.data_cache import frame_fingerprint
+from engine.ingest import SHEET_SPECS, IngestReport, ingest_frame
+from engine.sources import DataSource, LocalFileSource
+
+
+logger = logging.getLogger(__name__)
+
+AUTH_TABLE = "auth"
+AUTH_COLUMNS = ["Username", "Password", "Role", "Name"]
+
+# Date column of every dataset (range scans)
+DATE_COLUMNS = {name: spec.dates[0] for name, spec in SHEET_SPECS.items()}
+
+# Indexes of the queries pages run (Expenses month-on-month: date range, optionally one person), date last
+INDEXES = {
+    "expense": [("Date",), ("Expense By", "Date")],
+}
+
+
+def _quote(identifier: str) -> str:
+    return '"' + identifier.replace('"', '""') + '"'
+
+
+def _column_type(spec, column) -> str:
+    return "NUMERIC" if column in spec.numbers else "TEXT"
+
+
+def _to_rows(df: pd.DataFrame, spec) -> pd.DataFrame:
+    """Typed frame -> SQLite-ready frame: ISO dates, plain strings, None for missing."""
+    out = pd.DataFrame(index=df.index)
+    for column in spec.columns:
+        if column not in df.columns:
+            out[column] = None
+        elif column in spec.dates:
+            out[column] = df[column].dt.strftime("%Y-%m-%d")
+        else:
+            out[column] = df[column].astype(object)
+    return out.astype(object).where(out.notna(), None)
+
+
+class SqliteStore:
+    def __init__(self, path: str):
+        self.path = path
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._write_lock = threading.Lock()
+        with self._connect() as conn:
+            # Readers keep working while a sync writes
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._create_schema(conn)
+
+    @contextmanager
+    def _connect(self):
+        # One short-lived connection per call: cheap for SQLite and safe across threads
+        conn = sqlite3.connect(self.path, timeout=30)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def _create_schema(self, conn):
+        wanted = set()
+        for name, spec in SHEET_SPECS.items():
+            columns = ", ".join(f"{_quote(c)} {_column_type(spec, c)}" for c in spec.columns)
+            conn.execute(f"CREATE TABLE IF NOT EXISTS {_quote(name)} (_row INTEGER PRIMARY KEY, {columns})")
+            for index in INDEXES.get(name, []):
+                index_name = f"ix_{name}_" + "_".join(c.lower().replace(" ", "_") for c in index)
+                wanted.add(index_name)
+                conn.execute(
+                    f"CREATE INDEX IF NOT EXISTS {_quote(index_name)} ON {_quote(name)} "
+                    f"({', '.join(_quote(c) for c in index)})"
+                )
+        # Indexes of earlier versions that no query uses only slow down the syncs
+        existing = conn.execute("SELECT name FROM sqlite_master WHERE type = 'index' AND name LIKE 'ix!_%' ESCAPE '!'")
+        for (index_name,) in existing.fetchall():
+            if index_name not in wanted:
+                conn.execute(f"DROP INDEX {_quote(index_name)}")
+        conn.execute(
+            f"CREATE TABLE IF NOT EXISTS {AUTH_TABLE} ("
+            + ", ".join(f"{_quote(c)} TEXT" + (" PRIMARY KEY" if c == "Username" else "") for c in AUTH_COLUMNS)
+            + ")"
+        )
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS _sync "
+            "(name TEXT PRIMARY KEY, rows INTEGER, synced_at REAL, source TEXT, fingerprint TEXT)"
+        )
+        if "fingerprint" not in {row[1] for row in conn.execute("PRAGMA table_info(_sync)")}:
+            conn.execute("ALTER TABLE _sync ADD COLUMN fingerprint TEXT")
+
+    # ── writes ───────────────────────────────────────────
+    def _insert(self, conn, name: str, df: pd.DataFrame, source: str, total_rows: int, fingerprint: int):
+        spec = SHEET_SPECS[name]
+        placeholders = ", ".join("?" for _ in spec.columns)
+        columns = ", ".join(_quote(c) for c in spec.columns)
+        conn.executemany(
+            f"INSERT INTO {_quote(name)} ({columns}) VALUES ({placeholders})",
+            _to_rows(df, spec).itertuples(index=False, name=None),
+        )
+        conn.execute(
+            "INSERT OR REPLACE INTO _sync (name, rows, synced_at, source, fingerprint) VALUES (?, ?, ?, ?, ?)",
+            (name, total_rows, time.time(), source, str(fingerprint)),
+        )
+
+    def replace(self, name: str, df: pd.DataFrame, source: str = "import") -> int:
+        """Replace a dataset with a typed frame (as returned by a DataSource)."""
+        with self._write_lock, self._connect() as conn:
+            conn.execute(f"DELETE FROM {_quote(name)}")
+            self._insert(conn, name, df, source, len(df), frame_fingerprint(df))
+        return len(df)
+
+    def sync(self, name: str, df: pd.DataFrame, source: str = "import") -> str:
+        """Bring a dataset up to date with ``df`` writing as little as possible.
+
+        Returns "unchanged" (same fingerprint: nothing written), "append" (the
+        stored rows are an unchanged prefix of ``df``: only the new rows are
+        inserted) or "replace".
+        """
+        fingerprint = frame_fingerprint(df)
+        with self._connect() as conn:
+            synced = conn.execute("SELECT rows, fingerprint FROM _sync WHERE name = ?", (name,)).fetchone()
+        stored_rows, stored_fingerprint = synced if synced else (0, None)
+        if stored_fingerprint == str(fingerprint) and stored_rows == len(df):
+            return "unchanged"
+        if 0 < stored_rows < len(df) and str(frame_fingerprint(df.iloc[:stored_rows])) == stored_fingerprint:
+            with self._write_lock, self._connect() as conn:
+                self._insert(conn, name, df.iloc[stored_rows:], source, len(df), fingerprint)
+            return "append"
+        self.replace(name, df, source)
+        return "replace"
+
+    def replace_auth(self, df: pd.DataFrame) -> int:
+        users = df.reindex(columns=AUTH_COLUMNS).astype(str).drop_duplicates("Username", keep="first")
+        with self._write_lock, self._connect() as conn:
+            conn.execute(f"DELETE FROM {AUTH_TABLE}")
+            conn.executemany(
+                f"INSERT INTO {AUTH_TABLE} VALUES ({', '.join('?' for _ in AUTH_COLUMNS)})",
+                users.itertuples(index=False, name=None),
+            )
+        return len(users)
+
+    def sync_from(self, source: DataSource, names: Iterable[str] = tuple(SHEET_SPECS)) -> Dict[str, int]:
+        """Import the given sheets from another source; rows written per sheet."""
+        written = {}
+        for name in names:
+            frame, _ = source.read(name)
+            written[name] = self.replace(name, frame, source=source.label)
+        return written
+
+    # ── reads ────────────────────────────────────────────
+    def query(self, sql: str, params: Sequence = ()) -> pd.DataFrame:
+        with self._connect() as conn:
+            return pd.read_sql_query(sql, conn, params=list(params))
+
+    @staticmethod
+    def _where(name, start=None, end=None, where: Optional[Mapping[str, object]] = None) -> Tuple[str, list]:
+        clauses, params = [], []
+        for column, value in (where or {}).items():
+            clauses.append(f"{_quote(column)} = ?")
+            params.append(value)
+        date_col = _quote(DATE_COLUMNS[name])
+        # Dates are whole days: a bound inside a day excludes that day, like TimeIndex.between
+        if start is not None:
+            clauses.append(f"{date_col} >= ?")
+            params.append(pd.Timestamp(start).ceil("D").strftime("%Y-%m-%d"))
+        if end is not None:
+            clauses.append(f"{date_col} <= ?")
+            params.append(pd.Timestamp(end).floor("D").strftime("%Y-%m-%d"))
+        return (" WHERE " + " AND ".join(clauses)) if clauses else "", params
+
+    def rows(self, name: str, start=None, end=None, where: Optional[Mapping[str, object]] = None) -> pd.DataFrame:
+        """Rows of a dataset, in sheet order, optionally within [start, end] and matching ``where``."""
+        spec = SHEET_SPECS[name]
+        clause, params = self._where(name, start, end, where)
+        columns = ", ".join(_quote(c) for c in spec.columns)
+        return self.query(f"SELECT {columns} FROM {_quote(name)}{clause} ORDER BY _row", params)
+
+    def totals(
+        self,
+        name: str,
+        by: Sequence[str],
+        measure: str,
+        start=None,
+        end=None,
+        where: Optional[Mapping[str, object]] = None,
+        monthly: bool = False,
+    ) -> pd.DataFrame:
+        """SUM(measure) and row count per ``by`` (and "Month-Year" with ``monthly``)."""
+        keys = [_quote(c) for c in by]
+        if monthly:
+            keys.insert(0, f"substr({_quote(DATE_COLUMNS[name])}, 1, 7) AS {_quote('Month-Year')}")
+        group = ", ".join(str(i + 1) for i in range(len(keys)))
+        clause, params = self._where(name, start, end, where)
+        sql = (
+            f"SELECT {', '.join(keys)}, SUM({_quote(measure)}) AS {_quote(measure)}, COUNT(*) AS Rows "
+            f"FROM {_quote(name)}{clause}"
+            + (f" GROUP BY {group} ORDER BY {group}" if keys else "")
+        )
+        return self.query(sql, params)
+
+    def monthly_totals(
+        self,
+        name: str,
+        by: Sequence[str],
+        measure: str,
+        start=None,
+        end=None,
+        where: Optional[Mapping[str, object]] = None,
+    ) -> pd.Series:
+        """SUM(measure) per (Month, *by), shaped like the pandas groupby pages use.
+
+        Undated rows and rows with a missing ``by`` key are dropped, as a
+        groupby on ``date.dt.to_period("M")`` and the keys drops them.
+        """
+        totals = self.totals(name, by, measure, start=start, end=end, where=where, monthly=True)
+        totals = totals.dropna(subset=["Month-Year", *by])
+        month = pd.PeriodIndex(totals["Month-Year"], freq="M", name="Month")
+        index = pd.MultiIndex.from_arrays([month, *(totals[c] for c in by)], names=["Month", *by])
+        return pd.Series(totals[measure].to_numpy(dtype="float64"), index=index, name=measure)
+
+    def auth_frame(self) -> pd.DataFrame:
+        return self.query(f"SELECT * FROM {AUTH_TABLE}")
+
+    def stats(self) -> pd.DataFrame:
+        synced = self.query("SELECT * FROM _sync").set_index("name")
+        return pd.DataFrame([
+            {
+                "Table": name,
+                "Rows": int(synced.loc[name, "rows"]) if name in synced.index else 0,
+                "Synced": pd.Timestamp(synced.loc[name, "synced_at"], unit="s").floor("s") if name in synced.index else None,
+                "From": synced.loc[name, "source"] if name in synced.index else "-",
+                "Indexes": len(INDEXES.get(name, [])),
+            }
+            for name in SHEET_SPECS
+        ])
+
+
+class SqliteSource(DataSource):
+    label = "sqlite"
+
+    def __init__(self, store: SqliteStore, upstream: Optional[DataSource] = None):
+        self.store = store
+        self.upstream = upstream
+
+    def read(self, name) -> Tuple[pd.DataFrame, IngestReport]:
+        if self.upstream is not None:
+            try:
+                frame, report = self.upstream.read(name)
+            except Exception as e:  # noqa: BLE001 - any upstream failure falls back to the local copy
+                logger.warning("Reading %s from %s failed, serving the local copy: %s", name, self.upstream.label, e)
+            else:
+                self.store.sync(name, frame, source=self.upstream.label)
+                return frame, report
+        frame = self.store.rows(name)
+        for column in SHEET_SPECS[name].dates:
+            frame[column] = pd.to_datetime(frame[column], format="%Y-%m-%d", errors="coerce")
+        return ingest_frame(frame, SHEET_SPECS[name], source=self.label)
+
+    def invalidate(self, name=None):
+        if self.upstream is not None:
+            self.upstream.invalidate(name)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Local SQLite copy of the dashboard sheets.")
+    parser.add_argument("database")
+    commands = parser.add_subparsers(dest="command", required=True)
+    importer = commands.add_parser("import", help="import collection/expense/investment/bank CSV exports")
+    importer.add_argument("directory")
+    commands.add_parser("stats", help="rows and last sync per table")
+    args = parser.parse_args(argv)
+
+    store = SqliteStore(args.database)
+    if args.command == "import":
+        written = store.sync_from(LocalFileSource(args.directory))
+        print(", ".join(f"{name}: {rows:,} rows" for name, rows in written.items()))
+    print(store.stats().to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""Date-sorted frames answering range filters with binary search.
+
+Every page filters by date ranges ("1 Week" ... "Max", "Current Month",
+custom dates).  A TimeIndex keeps a frame sorted by its date column once per
+data version, so a range is two ``searchsorted`` calls and a positional slice
+instead of a boolean mask over every row.
+"""
+from typing import Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+# Rolling windows ending today
+ROLLING_PRESETS = {
+    "1 Week": pd.DateOffset(weeks=1),
+    "1 Month": pd.DateOffset(months=1),
+    "3 Months": pd.DateOffset(months=3),
+    "Last 3 Months": pd.DateOffset(months=3),
+    "6 Months": pd.DateOffset(months=6),
+    "Last 6 Months": pd.DateOffset(months=6),
+    "1 Year": pd.DateOffset(years=1),
+    "3 Years": pd.DateOffset(years=3),
+    "5 Years": pd.DateOffset(years=5),
+}
+
+
+def preset_range(preset: str, today: pd.Timestamp) -> Tuple[Optional[pd.Timestamp], Optional[pd.Timestamp]]:
+    """(start, end) of a range preset; None means unbounded.
+
+    "All" keeps undated rows as well, "Max" every dated row.
+    """
+    if preset in ROLLING_PRESETS:
+        return today - ROLLING_PRESETS[preset], None
+    if preset == "Current Month":
+        return today.replace(day=1), None
+    if preset == "Current Year":
+        return today.replace(month=1, day=1), None
+    if preset == "Max":
+        return pd.Timestamp.min, None
+    if preset == "All":
+        return None, None
+    raise ValueError(f"Unknown date range preset: {preset!r}")
+
+
+class TimeIndex:
+    def __init__(self, df: pd.DataFrame, date_col: str):
+        self.date_col = date_col
+        dates = df[date_col]
+        # Stable sort keeps the original order within a day; undated rows go last
+        order = np.argsort(dates.to_numpy(dtype="datetime64[ns]"), kind="stable")
+        self.frame = df.iloc[order]
+        self._dates = self.frame[date_col].to_numpy(dtype="datetime64[ns]")
+        self._n_dated = int(dates.notna().sum())
+
+    def __len__(self):
+        return len(self.frame)
+
+    def _position(self, value, side):
+        value = pd.Timestamp(value).as_unit("ns").to_datetime64()
+        return int(np.searchsorted(self._dates[:self._n_dated], value, side=side))
+
+    def between(self, start=None, end=None) -> pd.DataFrame:
+        """Rows with ``start <= date <= end``; with neither bound every row, undated included."""
+        if start is None and end is None:
+            return self.frame
+        lo = 0 if start is None else self._position(start, "left")
+        hi = self._n_dated if end is None else self._position(end, "right")
+        return self.frame.iloc[lo:max(lo, hi)]
+
+    def preset(self, preset: str, today: pd.Timestamp) -> pd.DataFrame:
+        return self.between(*preset_range(preset, today))
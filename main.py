@@ -2,31 +2,50 @@ import streamlit as st
 import pandas as pd
 import numpy as np
 import time
-import bcrypt
+import os
 import matplotlib.pyplot as plt
-import gspread
-from google.oauth2.service_account import Credentials
 from datetime import date, time, datetime, timedelta
 import pytz
 from urllib.parse import quote
 import streamlit.components.v1 as components
 
+from engine.auth_store import AuthStore
+from engine.balances import monthly_partner_summary
+from engine.cards import CARD_PAGE_SIZES, render_collection_cards
+from engine.data_model import enable_copy_on_write
+from engine.downsample import BUCKET_LABELS, RANGE_BUCKETS, downsample_chart
+from engine.figure_cache import FigureCache, render_png
+from engine.instrumentation import RerunProfile, activate
+from engine.loader import DEFAULT_POLICY, RetryPolicy, SheetLoadError
+from engine.login_guard import DEFAULT_ROUNDS, AttemptLimiter, PasswordVerifier
+from engine.ledger_view import LEDGER_PAGE_SIZES, LEDGER_TABLE_CSS, render_ledger_html
+from engine.pages import (
+    bank_log,
+    bank_monthly_summary,
+    closing_balance,
+    collection_kpis,
+    collection_log,
+    collection_month_totals,
+    dashboard_metrics,
+    expense_month_on_month,
+    expense_totals,
+    filter_losses,
+    filter_period,
+    grouped_collections,
+    loss_totals,
+    month_aligned_start,
+)
+from engine.paging import page_count, page_window
+from engine.pending import find_pending_collections
+from engine.pipeline import DATASETS, Pipeline
+from engine.session_tokens import SessionTokens
+from engine.sources import SHEET_NAMES, GspreadSource, GvizCsvSource, LocalFileSource, open_worksheets
+from engine.sqlite_store import SqliteSource, SqliteStore
+from engine.time_index import preset_range
 
 
 
 
-# Function to get the background color based on amount
-def get_background_style(amount):
-    if amount == 0:
-        return "linear-gradient(135deg, #fc0324, #99021a);"  # Blood Red Gradient - Very Bad
-    elif 1 <= amount <= 299:
-        return "linear-gradient(135deg, #4da6ff, #0077b6);"  # Good
-    elif amount == 300:
-        return "linear-gradient(135deg, #FFD400, #FFB800);"  # Happy
-    elif amount > 300:
-        return "linear-gradient(135deg, #00FF7F, #00994C);"  # More Happy
-    return "linear-gradient(135deg, #4da6ff, #0077b6);"  # Default
-
 
 # HTML + CSS for both sets of cards
 html_content = """
@@ -177,9 +196,16 @@ buttons_html = """
         <div class="button-container">
         """
 
+# Shared cached frames must never be mutated in place
+enable_copy_on_write()
+
 # Streamlit App Configuration
 st.set_page_config(page_title="Google Sheets Dashboard", layout="wide")
 
+# ⏱️ Stage timings, cache hits and shipped bytes of this rerun (admin panel in the sidebar)
+profile = RerunProfile(label="login", capture_cprofile=st.session_state.pop("profile_next_rerun", False))
+activate(profile)
+
 
 # Load Google Sheet IDs securely
 AUTH_SHEET_ID = st.secrets["sheets"]["AUTH_SHEET_ID"]
@@ -194,25 +220,83 @@ BANK_SHEET_ID = st.secrets["sheets"]["BANK_SHEET_ID"]
 AUTH_SHEET_NAME = "Sheet1"
 
 
-# --- DATA LOADING ---
-COLLECTION_SHEET_NAME = "collection"
-COLLECTION_CSV_URL = f"https://docs.google.com/spreadsheets/d/{COLLECTION_SHEET_ID}/gviz/tq?tqx=out:csv&sheet={COLLECTION_SHEET_NAME}"
-
-# --- EXPENSE DATA ---
+# --- DATA SOURCES ---
+SHEET_IDS = {
+    "collection": COLLECTION_SHEET_ID,
+    "expense": EXPENSE_SHEET_ID,
+    "investment": INVESTMENT_SHEET_ID,
+    "bank": BANK_SHEET_ID,
+}
 
-EXPENSE_SHEET_NAME = "expense"
-EXPENSE_CSV_URL = f"https://docs.google.com/spreadsheets/d/{EXPENSE_SHEET_ID}/gviz/tq?tqx=out:csv&sheet={EXPENSE_SHEET_NAME}"
+# "gspread" (Sheets API, incremental sync), "gviz" (streamed CSV export), "local" (CSV files
+# in DATA_DIR) or "sqlite" (local SQLite copy at SQLITE_PATH, synced from the Sheets when reachable)
+DATA_SOURCE = st.secrets["sheets"].get("DATA_SOURCE", "gspread")
+SQLITE_PATH = st.secrets["sheets"].get(
+    "SQLITE_PATH", os.path.join(os.path.dirname(os.path.abspath(__file__)), ".data", "vayuvolt.db")
+)
+
+# --- LOCAL SNAPSHOTS ---
+SNAPSHOT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".snapshots")
+
+# --- CACHE TTLs (seconds) ---
+AUTH_TTL_SECONDS = 10 * 60
+
+# --- SHEETS CONNECTION ---
+# With a local SQLite copy to fall back on: one short attempt, and no new attempt for a
+# minute after a failure, so offline reruns are not held up by the retry policy
+SHEETS_POLICY = RetryPolicy(attempts=1, timeout=10.0) if DATA_SOURCE == "sqlite" else DEFAULT_POLICY
+SHEETS_RETRY_SECONDS = 60
+
+# --- SESSIONS ---
+# Secret signing the session tokens kept in the URL; without it every reload asks for a login
+SESSION_SECRET = st.secrets.get("session", {}).get("SECRET")
+SESSION_TTL_SECONDS = 12 * 60 * 60
+
+# --- LOGIN ---
+# bcrypt cost for new/rehashed passwords, and threads hashing logins concurrently
+BCRYPT_ROUNDS = int(st.secrets.get("auth", {}).get("BCRYPT_ROUNDS", DEFAULT_ROUNDS))
+BCRYPT_WORKERS = int(st.secrets.get("auth", {}).get("BCRYPT_WORKERS", 2))
+
+# --- PAGES ---
+# Datasets and derived tables each page needs (see engine.pipeline.register_tables)
+PAGE_TABLES = {
+    "Dashboard": ["collection", "collection_by_date", "ledger", "partner_balances", "loss_matrix_by_date"],
+    "Monthly Summary": ["collection_monthly", "expense_monthly", "partners"],
+    "Grouped Data": ["collection"],
+    "Expenses": ["expense", "expense_by_date", "expense_monthly", "ledger", "partners"],
+    "Investment": ["investment", "bank", "partners"],
+    "Collection Data": ["collection", "collection_by_date", "collection_monthly"],
+    "Bank Transaction": ["bank", "bank_by_date", "bank_monthly", "ledger"],
+    "Performance": ["performance", "loss_matrix", "loss_matrix_by_date"],
+}
 
-# --- INVESTMENT DATA ---
+# --- PARTNERS ---
+# Short display names; partners not listed here are shown with their full name
+PARTNER_LABELS = {
+    "Govind Kumar": "Govind",
+    "Kumar Gaurav": "Gaurav",
+}
 
-INVESTMENT_SHEET_NAME = "Investment_Details"
-INVESTMENT_CSV_URL = f"https://docs.google.com/spreadsheets/d/{INVESTMENT_SHEET_ID}/gviz/tq?tqx=out:csv&sheet={INVESTMENT_SHEET_NAME}"
 
+def partner_label(name):
+    return PARTNER_LABELS.get(name, name)
 
-# --- Bank DATA ---
 
-BANK_SHEET_NAME = "Bank_Transaction"
-BANK_CSV_URL = f"https://docs.google.com/spreadsheets/d/{BANK_SHEET_ID}/gviz/tq?tqx=out:csv&sheet={BANK_SHEET_NAME}"
+def paginate(frame, key, page_sizes, label="Rows per page"):
+    """Page size / page number controls; returns the rows of the chosen page."""
+    col1, col2, col3 = st.columns([1, 1, 2])
+    page_size = col1.selectbox(label, page_sizes, index=1, key=f"{key}_page_size")
+    n_pages = page_count(len(frame), page_size)
+    # Filters can shrink the frame below the remembered page
+    if st.session_state.get(f"{key}_page", 1) > n_pages:
+        st.session_state[f"{key}_page"] = n_pages
+    page_number = col2.number_input("Page", min_value=1, max_value=n_pages, step=1, key=f"{key}_page")
+    visible = page_window(frame, page_number, page_size)
+    first_row = (page_number - 1) * page_size
+    col3.caption(
+        f"Showing {first_row + 1 if len(visible) else 0:,}–{first_row + len(visible):,} of {len(frame):,} rows"
+    )
+    return visible
 
 # ✅ Load credentials from Streamlit Secrets (Create a Copy)
 creds_dict = dict(st.secrets["gcp_service_account"])  # Create a mutable copy
@@ -220,1495 +304,1135 @@ creds_dict = dict(st.secrets["gcp_service_account"])  # Create a mutable copy
 # ✅ Fix private key formatting
 creds_dict["private_key"] = creds_dict["private_key"].replace("\\n", "\n")
 
-# ✅ Function to Connect to Google Sheets (with Caching)
-@st.cache_resource  # Cache for 5 minutes
+# ✅ Function to Connect to Google Sheets (connection resources live for the whole process)
+@st.cache_resource
 def connect_to_sheets():
-    try:
-        creds = Credentials.from_service_account_info(
-            creds_dict, 
-            scopes=["https://www.googleapis.com/auth/spreadsheets", "https://www.googleapis.com/auth/drive"]
-        )
-        client = gspread.authorize(creds)
-        
-        # Open sheets once and reuse them
-        AUTH_sheet = client.open_by_key(st.secrets["sheets"]["AUTH_SHEET_ID"]).worksheet(AUTH_SHEET_NAME)
-        COLLECTION_sheet = client.open_by_key(st.secrets["sheets"]["COLLECTION_SHEET_ID"]).worksheet(COLLECTION_SHEET_NAME)
-        EXPENSE_sheet = client.open_by_key(st.secrets["sheets"]["EXPENSE_SHEET_ID"]).worksheet(EXPENSE_SHEET_NAME)
-        INVESTMENT_sheet = client.open_by_key(st.secrets["sheets"]["INVESTMENT_SHEET_ID"]).worksheet(INVESTMENT_SHEET_NAME)
-        BANK_sheet = client.open_by_key(st.secrets["sheets"]["BANK_SHEET_ID"]).worksheet(BANK_SHEET_NAME)
-        
-        return AUTH_sheet, COLLECTION_sheet, EXPENSE_sheet, INVESTMENT_sheet , BANK_sheet
-
-    except Exception as e:
-        st.error(f"❌ Failed to connect to Google Sheets: {e}")
-        st.stop()
+    # Open sheets once (concurrently) and reuse them; failures are not cached, so the next rerun retries
+    return open_worksheets(creds_dict, {
+        "auth": (AUTH_SHEET_ID, AUTH_SHEET_NAME),
+        **{name: (SHEET_IDS[name], SHEET_NAMES[name]) for name in DATASETS},
+    }, policy=SHEETS_POLICY)
 
 
+@st.cache_resource
+def get_sheets_outage():
+    # Last failed connection, shared by every session
+    return {"at": 0.0, "error": None}
 
 
-# ✅ Get cached sheets
-AUTH_sheet, COLLECTION_sheet, EXPENSE_sheet, INVESTMENT_sheet ,BANK_sheet= connect_to_sheets()
-
-# Function to load authentication data securely
-@st.cache_resource # Cache for 5 minutes
-def load_auth_data():
-    data = AUTH_sheet.get_all_records()
-    df = pd.DataFrame(data)
-    return df
-
-# Load authentication data
-auth_df = load_auth_data()
-
-# Function to Verify Password
-def verify_password(stored_hash, entered_password):
-    return bcrypt.checkpw(entered_password.encode(), stored_hash.encode())
+def open_sheets():
+    """connect_to_sheets(); with a local copy to serve, a recent failure is re-raised instead of retried."""
+    outage = get_sheets_outage()
+    since_failure = datetime.now().timestamp() - outage["at"]
+    if sqlite_store is not None and outage["error"] is not None and since_failure < SHEETS_RETRY_SECONDS:
+        raise ConnectionError(f"{outage['error']} (retrying in {SHEETS_RETRY_SECONDS - since_failure:.0f}s)")
+    try:
+        sheets = connect_to_sheets()
+    except Exception as e:
+        outage.update(at=datetime.now().timestamp(), error=e)
+        raise
+    outage["error"] = None
+    return sheets
+
+
+# ✅ Local SQLite copy of the sheets and users (DATA_SOURCE = "sqlite")
+@st.cache_resource
+def get_sqlite_store():
+    return SqliteStore(SQLITE_PATH) if DATA_SOURCE == "sqlite" else None
+
+sqlite_store = get_sqlite_store()
+
+# Everything after this point may end the run early (st.rerun / st.stop);
+# the rerun's log record is written in the finally block either way
+try:
+    # ✅ Get cached sheets
+    with profile.stage("connect sheets"):
+        try:
+            worksheets = open_sheets()
+        except Exception as e:
+            if sqlite_store is None:
+                st.error(f"❌ Failed to connect to Google Sheets: {e}")
+                st.stop()
+            st.warning(f"⚠️ Google Sheets unreachable, serving the local copy: {e}")
+            worksheets = {}
+
+    # Function to load authentication data securely
+    def read_auth_sheet():
+        # Called from the shared AuthStore, so reconnect here rather than use this rerun's worksheets
+        try:
+            auth_sheet = open_sheets()["auth"]
+        except Exception:
+            if sqlite_store is None:
+                raise
+            return sqlite_store.auth_frame()
+        data = auth_sheet.get_all_records()
+        df = pd.DataFrame(data)
+        if sqlite_store is not None:
+            sqlite_store.replace_auth(df)
+        return df
 
-# Initialize Session State for Authentication
-if "authenticated" not in st.session_state:
-    st.session_state.authenticated = False
-    st.session_state.user_role = None
-    st.session_state.username = None
-    st.session_state.user_name = None
+    # ✅ Username index over the auth sheet, loaded on the first login attempt (not on dashboard reruns)
+    @st.cache_resource
+    def get_auth_store():
+        return AuthStore(read_auth_sheet, ttl=AUTH_TTL_SECONDS)
+
+    # Write a password rehashed at the current cost back to the auth sheet
+    def store_rehashed_password(username, new_hash):
+        auth_sheet = open_sheets()["auth"]
+        values = auth_sheet.get_all_values()
+        header = values[0]
+        user_col, password_col = header.index("Username"), header.index("Password")
+        for row_number, row in enumerate(values[1:], start=2):
+            if str(row[user_col]).strip() == username:
+                auth_sheet.update_cell(row_number, password_col + 1, new_hash)
+                break
+        get_auth_store().update(username, Password=new_hash)
+
+    # ✅ bcrypt runs on a small shared pool, with per-username and per-IP throttling of failed attempts
+    @st.cache_resource
+    def get_password_verifier():
+        return PasswordVerifier(
+            workers=BCRYPT_WORKERS,
+            rounds=BCRYPT_ROUNDS,
+            per_user=AttemptLimiter(max_failures=5, window=5 * 60),
+            per_ip=AttemptLimiter(max_failures=20, window=5 * 60),
+            on_rehash=store_rehashed_password,
+        )
 
-# --- LOGIN PAGE ---
-if not st.session_state.authenticated:
-    st.title("🔒 Secure Login")
-    username = st.text_input("👤 Username")
-    password = st.text_input("🔑 Password", type="password")
-    login_button = st.button("Login")
 
-    if login_button:
-        user_data = auth_df[auth_df["Username"] == username]
+    def client_ip():
+        context = getattr(st, "context", None)
+        return getattr(context, "ip_address", None)
 
-        if not user_data.empty:
-            stored_hash = user_data.iloc[0]["Password"]
-            role = user_data.iloc[0]["Role"]
-            name = user_data.iloc[0]["Name"]
+    # ✅ Signed session token in the URL: reloads and new tabs resume without a login
+    session_tokens = SessionTokens(SESSION_SECRET, ttl=SESSION_TTL_SECONDS) if SESSION_SECRET else None
 
-            if verify_password(stored_hash, password):
-                st.session_state.authenticated = True
-                st.session_state.user_role = role
-                st.session_state.username = username
-                st.session_state.user_name = name
-                st.experimental_set_query_params(logged_in="true")
 
-                st.success(f"✅ Welcome, {name}!")
-                st.rerun()
-            else:
-                st.error("❌ Invalid Credentials")
-        else:
-            st.error("❌ User not found")
+    def start_session(username, role, name):
+        st.session_state.authenticated = True
+        st.session_state.user_role = role
+        st.session_state.username = username
+        st.session_state.user_name = name
+        if session_tokens is not None:
+            st.query_params["session"] = session_tokens.issue(username, role, name)
 
-# --- LOGGED-IN USER SEES DASHBOARD ---
-else:
-    if st.sidebar.button("🚪 Logout"):
+    # Initialize Session State for Authentication
+    if "authenticated" not in st.session_state:
         st.session_state.authenticated = False
         st.session_state.user_role = None
         st.session_state.username = None
         st.session_state.user_name = None
-        st.experimental_set_query_params(logged_in="false")
-        st.rerun()
 
-    st.sidebar.write(f"👤 **Welcome, {st.session_state.user_name}!**")
+    if not st.session_state.authenticated and session_tokens is not None and "session" in st.query_params:
+        claims = session_tokens.verify(st.query_params["session"])
+        if claims is None:
+            # Expired or tampered with
+            del st.query_params["session"]
+        elif session_tokens.needs_refresh(claims):
+            start_session(claims.username, claims.role, claims.name)
+        else:
+            st.session_state.authenticated = True
+            st.session_state.user_role = claims.role
+            st.session_state.username = claims.username
+            st.session_state.user_name = claims.name
+
+    # --- LOGIN PAGE ---
+    if not st.session_state.authenticated:
+        st.title("🔒 Secure Login")
+        username = st.text_input("👤 Username")
+        password = st.text_input("🔑 Password", type="password")
+        login_button = st.button("Login")
+
+        if login_button:
+            username = username.strip()
+            user_data = get_auth_store().lookup(username)
+            stored_hash = user_data["Password"] if user_data is not None else None
+            with profile.stage("verify password"):
+                result = get_password_verifier().verify(username, password, stored_hash, ip=client_ip())
+
+            if result.ok:
+                start_session(username, user_data["Role"], user_data["Name"])
+
+                st.success(f"✅ Welcome, {user_data['Name']}!")
+                st.rerun()
+            elif result.reason == "throttled":
+                st.error(f"⏳ Too many failed attempts, try again in {result.retry_after:.0f}s")
+            elif result.reason == "busy":
+                st.warning("⌛ Too many logins in progress, please try again in a moment")
+            elif result.reason == "unknown":
+                st.error("❌ User not found")
+            else:
+                st.error("❌ Invalid Credentials")
 
-    @st.cache_resource # Cache for 5 minutes
-    def load_data(url):
-        df = pd.read_csv(url, dayfirst=True, dtype={"Vehicle No": str})  # Ensure Vehicle No remains a string
-        
-        df['Collection Date'] = pd.to_datetime(df['Collection Date'], dayfirst=True, errors='coerce').dt.date
-        df['Amount'] = pd.to_numeric(df['Amount'], errors='coerce')
-        df['Meter Reading'] = pd.to_numeric(df['Meter Reading'], errors='coerce')
+    # --- LOGGED-IN USER SEES DASHBOARD ---
+    else:
+        if st.sidebar.button("🚪 Logout"):
+            st.session_state.authenticated = False
+            st.session_state.user_role = None
+            st.session_state.username = None
+            st.session_state.user_name = None
+            st.query_params.pop("session", None)
+            st.rerun()
+
+        st.sidebar.write(f"👤 **Welcome, {st.session_state.user_name}!**")
+
+        # ✅ Headless engine: data source, per-dataset cache (own TTL, served from disk
+        # after a restart) and the derived tables, built only when a page asks for them
+        @st.cache_resource
+        def get_pipeline():
+            if DATA_SOURCE == "gviz":
+                source = GvizCsvSource(SHEET_IDS)
+            elif DATA_SOURCE == "local":
+                source = LocalFileSource(st.secrets["sheets"]["DATA_DIR"])
+            elif DATA_SOURCE == "sqlite":
+                upstream = GspreadSource({name: worksheets[name] for name in DATASETS}) if worksheets else None
+                source = SqliteSource(sqlite_store, upstream=upstream)
+            else:
+                source = GspreadSource({name: worksheets[name] for name in DATASETS})
+            return Pipeline(source, snapshot_dir=SNAPSHOT_DIR)
 
-        # Assuming df is your DataFrame and it's already sorted by 'Collection Date'
-        df = df.sort_values(by=['Vehicle No', 'Collection Date'])
+        pipeline = get_pipeline()
+        data_cache, derived_tables = pipeline.cache, pipeline.tables
+        if isinstance(pipeline.source, SqliteSource) and pipeline.source.upstream is None and worksheets:
+            # Sheets reachable again: resume syncing the local copy
+            pipeline.source.upstream = GspreadSource({name: worksheets[name] for name in DATASETS})
 
-        # Calculate distance for each vehicle separately
-        df['Distance'] = df.groupby('Vehicle No')['Meter Reading'].diff().fillna(0)
+        # ✅ Chart frames and rendered figures, reused until their data or filters change
+        @st.cache_resource
+        def get_figure_cache():
+            return FigureCache(max_entries=64, max_bytes=32 * 1024 * 1024)
 
-        # Replace negative distances with the average of positive distances
-        positive_avg_distance = df[df['Distance'] > 0]['Distance'].mean()
-        df.loc[df['Distance'] < 0, 'Distance'] = np.round(positive_avg_distance)
+        figure_cache = get_figure_cache()
 
-        # Month-Year Column
-        df['Month-Year'] = pd.to_datetime(df['Collection Date']).dt.strftime('%Y-%m')
+        def cached_chart(chart_id, datasets, params, build):
+            """``build()`` through the figure cache, keyed by the datasets' versions and ``params``.
 
-        return df[['Collection Date', 'Vehicle No', 'Amount', 'Meter Reading', 'Name', 'Distance', 'Month-Year','Received By']]
+            The versions are those of the frames this page was given, not the cache's current
+            ones: a revalidation landing mid-run must not file a chart of old data as new.
+            """
+            key = (tuple(table_versions[name] for name in datasets), params)
+            return figure_cache.get(chart_id, key, build)
 
-    @st.cache_resource  # Cache for 5 minutes
-    def load_expense_data(url):
-        df = pd.read_csv(url, dayfirst=True, dtype={"Vehicle No": str})  # Ensure Vehicle No remains a string
-        df['Date'] = pd.to_datetime(df['Date'], dayfirst=True, errors='coerce').dt.date
-        df['Amount Used'] = pd.to_numeric(df['Amount Used'], errors='coerce')
-        df['Month-Year'] = pd.to_datetime(df['Date']).dt.strftime('%Y-%m')
-        return df[['Date', 'Vehicle No', 'Reason of Expense', 'Amount Used', 'Any Bill', 'Month-Year','Expense By']]
-    
-    @st.cache_resource  # Cache for 5 minutes    
-    def load_investment_data(url):
-        df = pd.read_csv(url, dayfirst=True)
+        # --- DASHBOARD UI ---
+        st.sidebar.header("📂 Navigation")
+        page = st.sidebar.radio("Go to:", list(PAGE_TABLES))
 
-        # Strip spaces from column names to avoid formatting issues
-        df.columns = df.columns.str.strip()
+        # Only this page's datasets are fetched and only its tables are built
+        try:
+            tables, table_versions = derived_tables.get_versioned(PAGE_TABLES[page])
+        except SheetLoadError as e:
+            st.error(f"❌ {e}")
+            st.stop()
 
-        # Ensure required columns exist
-        required_columns = ["Date", "Investment Type", "Amount", "Comment", "Received From"]
-        missing_columns = [col for col in required_columns if col not in df.columns]
+        for message in data_cache.errors(derived_tables.datasets(PAGE_TABLES[page])).values():
+            st.error(message)
 
-        if missing_columns:
-            st.error(f"❌ Missing columns in Investment Data: {missing_columns}")
-            return pd.DataFrame()  # Return empty DataFrame to avoid crashing
+        today = pd.Timestamp.today().normalize()
 
-        # Rename columns for consistency
-        df.rename(columns={"Amount": "Investment Amount", "Received From": "Investor Name"}, inplace=True)
+        # Page compute + render, closed by the timing panel below
+        profile.label = page
+        profile.start(f"page {page}")
 
-        # Convert data types
-        df['Date'] = pd.to_datetime(df['Date'], dayfirst=True, errors='coerce').dt.date
-        df['Investment Amount'] = pd.to_numeric(df['Investment Amount'], errors='coerce')
-        df['Month-Year'] = pd.to_datetime(df['Date']).dt.strftime('%Y-%m')
+        if page == "Dashboard":
+            df, balances = tables["collection"], tables["partner_balances"]
 
-        return df[['Date', 'Investment Type', 'Investment Amount', 'Comment', 'Investor Name', 'Month-Year']]
+            # === Combined totals and this month's losses (one grouped pass over every frame) ===
+            metrics = dashboard_metrics(balances, tables["ledger"], tables["loss_matrix_by_date"], today)
 
-    @st.cache_resource
-    def load_bank_data(url):
-        df = pd.read_csv(url, dayfirst=True)
-        df['Date'] = pd.to_datetime(df['Date'], dayfirst=True, errors='coerce').dt.date
-        df['Month-Year'] = pd.to_datetime(df['Date']).dt.strftime('%Y-%m')
-        return df
+            st.title("📊 VayuVolt Dashboard")
+            
+            # Get latest month
+            last_month = df['Month-Year'].max()
 
-    
+            cols = st.columns(5 + len(balances))
+            cols[0].metric(label="💰 Total Collection", value=f"₹{metrics['total_collection']:,.0f}")
+            cols[1].metric(label="📉 Total Expenses", value=f"₹{metrics['total_expense']:,.0f}")
+            cols[2].metric(label="💸 Total Investment", value=f"₹{metrics['total_investment']:,.0f}")
+            for col, (partner, remaining_fund) in zip(cols[3:], balances["Remaining Fund"].items()):
+                col.metric(label=f"💵 {partner_label(partner)} Balance", value=f"₹{remaining_fund:,.0f}")
+            cols[-2].metric(label="🏦 Bank Balance", value=f"₹{metrics['bank_balance']:,.0f}")
+            cols[-1].metric(label="🏦 Net Balance", value=f"₹{metrics['net_balance']:,.0f}")
 
 
-    df = load_data(COLLECTION_CSV_URL)
-    expense_df = load_expense_data(EXPENSE_CSV_URL)
-    investment_df = load_investment_data(INVESTMENT_CSV_URL)
-    bank_df = load_bank_data(BANK_CSV_URL)
+            st.markdown("---")
+            formatted_last_month = pd.to_datetime(last_month).strftime("%b %Y")  
+            st.subheader("📅 "+formatted_last_month+"   Overview")
 
+            col4, col5, col6, col7, col8, col9, col10 = st.columns(7)
+            col4.metric(label="📈"+formatted_last_month+"  Collection", value=f"₹{metrics['month_collection']:,.0f}")
+            col5.metric(label=" ", value=f"{metrics['month_collection_pct']:,.0f}%", delta=f"{metrics['month_collection_pct']:,.0f}%", delta_color="normal")
+            col6.metric(label="📉"+formatted_last_month+" Expenses", value=f"₹{metrics['month_expense']:,.0f}")
+            col7.metric(label="📉"+formatted_last_month+" Driver Loss", value= f"{metrics['month_driver_loss']:,.0f}")
+            col8.metric(label="📉"+formatted_last_month+" Company Loss",value= f"{metrics['month_company_loss']:,.0f}")
+            col9.metric(label="📉"+formatted_last_month+" Total Loss",value= f"{metrics['month_total_loss']:,.0f}")
+            col10.metric(label=" ", value=f"{metrics['month_loss_pct']:,.0f}%", delta=f"{metrics['month_loss_pct']:,.0f}%", delta_color="inverse")
 
-    # Calculate credits and debits
-    # Ensure Amount is numeric
-    bank_df['Amount'] = pd.to_numeric(bank_df['Amount'], errors='coerce').fillna(0)
 
-    # Calculate total credits and debits
-    Collection_Credit_Bank=bank_df[bank_df['Transaction Type'].isin(['Collection_Credit'])]['Amount'].sum()
-    Investment_Credit_Bank=bank_df[bank_df['Transaction Type'].isin(['Investment_Credit'])]['Amount'].sum()
-    Payment_Credit_Bank=bank_df[bank_df['Transaction Type'].isin(['Payment_Credit'])]['Amount'].sum()
-    ## by ayush
-    settlement_credit = bank_df[bank_df['Transaction Type'].isin(['Settlement_Credit'])]['Amount'].sum()
 
-    total_credits = Collection_Credit_Bank+Investment_Credit_Bank+Payment_Credit_Bank+settlement_credit
 
-    Expence_Debit_Bank=bank_df[bank_df['Transaction Type'].isin(['Expence_Debit'])]['Amount'].sum()
-    
-    Settlement_Debit_Bank=bank_df[bank_df['Transaction Type'].isin(['Settlement_Debit'])]['Amount'].sum()
-    total_debits = Expence_Debit_Bank+Settlement_Debit_Bank
+            st.markdown("---")
+            
+            # === RADIO BUTTONS CENTERED BELOW CHART ===
+            col1, col2, col3 = st.columns([1, 3, 1])  # Center the middle column
+            with col2:
+                range_option = st.radio(
+                    "",
+                    ["1 Week", "1 Month", "3 Months", "6 Months", "1 Year", "3 Years", "5 Years", "Max"],
+                    horizontal=True,
+                    index =2
+                )
+            
+            # Filter data based on selected date range (binary search on the date index)
+            def build_trend(now, raw):
+                trend = tables["collection_by_date"].preset(range_option, now).set_index("Collection Date")[["Amount", "Distance"]]
+                # Long ranges: keep the points that preserve the shape of the lines
+                return (trend if raw else downsample_chart(trend, range_option)), len(trend)
+
+            now = pd.to_datetime("today")
+            show_raw = st.session_state.get("trend_raw_points", False)
+            trend_df, trend_points = cached_chart(
+                "dashboard trend", ["collection"], (range_option, now.date(), show_raw), lambda: build_trend(now, show_raw)
+            )
+            
+            # === RERENDER CHART ===
+            st.line_chart(profile.ship("trend chart", trend_df))
+            col1, col2 = st.columns([3, 1])
+            col1.caption(f"Showing {len(trend_df):,} of {trend_points:,} points")
+            col2.toggle("Show all points", key="trend_raw_points")
 
-    bank_balance = total_credits - total_debits
 
-    # === Individual Summary ===
-    # Initialize all required variables
-    # For Govind Kumar
-    govind_collection_credit = 0
-    govind_settlement_credit = 0
-    govind_investment_credit = 0
-    govind_total_credit = 0
-    govind_expense_debit = 0
-    govind_settlement_debit = 0
-    govind_total_debit = 0
+            ## changes start here by Ayush
 
-    # For Kumar Gaurav
-    gaurav_collection_credit = 0
-    gaurav_settlement_credit = 0
-    gaurav_investment_credit = 0
-    gaurav_total_credit = 0
-    gaurav_expense_debit = 0
-    gaurav_settlement_debit = 0
-    gaurav_total_debit = 0
+            
+            # Pending Collection
+            # Start date for pending collection tracking
+            start_date = date(2025, 8, 1)
+            
+            # Get all unique vehicle numbers
+            baseline_vehicles = df['Vehicle No'].unique()
 
-    # Filter data by person and assign values
-    govind_df = bank_df[bank_df['Transaction By'] == 'Govind Kumar']
-    gaurav_df = bank_df[bank_df['Transaction By'] == 'Kumar Gaurav']
+            # If no vehicles found for the dataset, show warning
+            if len(baseline_vehicles)==0:
+                st.warning("no rows found for 1 august")
+                baseline_vehicles = df['Vehicle No'].unique()
 
-    # Govind Kumar
-    govind_collection_credit = govind_df[govind_df['Transaction Type'] == 'Collection_Credit']['Amount'].sum()
-    govind_settlement_credit = govind_df[govind_df['Transaction Type'] == 'Settlement_Credit']['Amount'].sum()
-    govind_investment_credit = govind_df[govind_df['Transaction Type'] == 'Investment_Credit']['Amount'].sum()
-    govind_total_credit = govind_collection_credit + govind_settlement_credit + govind_investment_credit
+            # Get the current time in Asia/Kolkata timezone and Get today's date and yesterday's date
+            tz = pytz.timezone("Asia/Kolkata")
+            now = datetime.now(tz)
+            latest_date = now.date()
+            yesterday = latest_date - timedelta(days=1)
+            cur_hour = now.hour
+            # If current time is after 4 PM, include today in the date range, else only till yesterday
+            end_date = latest_date if cur_hour >= 16 else yesterday
 
-    govind_expense_debit = govind_df[govind_df['Transaction Type'] == 'Expence_Debit']['Amount'].sum()
-    govind_settlement_debit = govind_df[govind_df['Transaction Type'] == 'Settlement_Debit']['Amount'].sum()
-    govind_total_debit = govind_expense_debit + govind_settlement_debit
+            # --- Identify missing collection entries (one vectorized pass over vehicles x days)
+            with profile.stage("pending collections", rows=len(df)):
+                missing_df = find_pending_collections(df, start_date, end_date)
 
-    # Kumar Gaurav
-    gaurav_collection_credit = gaurav_df[gaurav_df['Transaction Type'] == 'Collection_Credit']['Amount'].sum()
-    gaurav_settlement_credit = gaurav_df[gaurav_df['Transaction Type'] == 'Settlement_Credit']['Amount'].sum()
-    gaurav_investment_credit = gaurav_df[gaurav_df['Transaction Type'] == 'Investment_Credit']['Amount'].sum()
-    gaurav_total_credit = gaurav_collection_credit + gaurav_settlement_credit + gaurav_investment_credit
 
-    gaurav_expense_debit = gaurav_df[gaurav_df['Transaction Type'] == 'Expence_Debit']['Amount'].sum()
-    gaurav_settlement_debit = gaurav_df[gaurav_df['Transaction Type'] == 'Settlement_Debit']['Amount'].sum()
-    gaurav_total_debit = gaurav_expense_debit + gaurav_settlement_debit
+            # Display pending collection data        
+            
+            if missing_df.empty:
+                st.write("### 🔍 Recent Collection:")
+                Recent_Collection = df.sort_values(by="Collection Date", ascending=False).head(14)
+                cards_html = html_content + render_collection_cards(Recent_Collection) + "</div>"
 
-    #------------Bank Calculation End-----------------
+                # Render HTML
+                components.html(profile.ship("recent collection cards", cards_html), height=300, scrolling=True)
+            else:
+                st.subheader("🕒 Pending Collection:")
+                form_base = "https://docs.google.com/forms/d/e/1FAIpQLSdnNBpKKxpWVkrZfj0PLKW8K26-3i0bO43hBADOHvGcpGqjvA/viewform?usp=pp_url"
 
+                
 
+                # Add each button to the HTML string
+                profile.start("pending buttons")
+                for _, row in missing_df.iterrows():
+                    form_link = (
+                        f"{form_base}"
+                        f"&entry.1817078140={quote(str(row['Missing Date']))}"
+                        f"&entry.424776091={quote(str(row['Vehicle No']))}"
+                        f"&entry.1100483606={quote(str(row['Last Collected Amount']))}"  
+                        f"&entry.1947342081={quote(str(row['Last Meter Reading']))}"
+                        f"&entry.1812763042={quote(str(row['Last Assigned Name']))}"
+                        f"&entry.1925700467={quote('Govind Kumar')}"
+                    )
+
+                    buttons_html += f"""
+        <a href="{form_link}" target="_blank" class="custom-btn">
+            <span class="vehicle-no">{row['Vehicle No']}</span>
+            <span class="missing-date">{row['Missing Date']}</span>
+        </a>
+        """
 
-    #-------------Remaining Balance at you ----------
+                buttons_html += "</div>"
+                profile.stop("pending buttons", rows=len(missing_df))
 
+                # Render all buttons at once
+                st.markdown(profile.ship("pending buttons", buttons_html), unsafe_allow_html=True)
+                
 
 
 
+            ## changes by ayush end here ##############################
 
-    #---------------Remaining Balance calculation end------------
-    ## Current month loss calculation ##
-    # ---------- Base DF ----------
-    perf_df = df.copy()
-    perf_df["Collection Date"] = pd.to_datetime(
-    perf_df["Collection Date"], dayfirst=True, errors="coerce"
-    ).dt.normalize()
-    perf_df["Amount"] = pd.to_numeric(perf_df["Amount"], errors="coerce").fillna(0)
-    perf_df = perf_df.dropna(subset=["Collection Date"])
+        elif page == "Monthly Summary":
+            partners = tables["partners"]
+            st.title("📊 Monthly Summary Report")
+        
+            # --- Monthly Aggregation (sliced from the monthly rollups) ---
+            monthly_summary = monthly_partner_summary(tables["collection_monthly"], tables["expense_monthly"], partners)
+            monthly_summary = monthly_summary.rename(columns={
+                f"{p} {kind}": f"{partner_label(p)} {kind}" for p in partners for kind in ("Collection", "Expense")
+            })
+        
+            # === UI ===
+            st.subheader("📅 Monthly Breakdown")
+            st.dataframe(profile.ship("monthly summary", monthly_summary).style.format({
+                col: ("{:+.1f}%" if col.endswith("(%)") else "₹{:.0f}")
+                for col in monthly_summary.columns if col != "Month-Year"
+            }), use_container_width=True)
+        
+            # === Charts ===
+            chart_option = st.radio("📊 Show Chart for:", ["Collection vs Expense", "Net Balance Trend"])
+            
+            if chart_option == "Collection vs Expense":
+                chart_df = cached_chart(
+                    "monthly collection vs expense", DATASETS, (),
+                    lambda: monthly_summary[["Month-Year", "Total Collection", "Total Expense"]].set_index("Month-Year"),
+                )
+                st.bar_chart(chart_df)
+            else:
+                net_df = cached_chart(
+                    "monthly net balance", DATASETS, (),
+                    lambda: monthly_summary[["Month-Year", "Net Balance"]].set_index("Month-Year"),
+                )
+                st.line_chart(net_df)
+        
+            # === Download Option ===
+            csv = monthly_summary.to_csv(index=False).encode("utf-8")
+            st.download_button("⬇️ Download Monthly Summary (CSV)", data=csv, file_name="monthly_summary.csv", mime="text/csv")
 
 
-        #st.write(f"start_date: {custom_start_date}, end_date: {custom_end_date}")
+        elif page == "Grouped Data":
+            df = tables["collection"]
+            st.title("🔍 Grouped Collection Data")
+        
+            group_by = st.sidebar.radio("🔄 Group Data By:", ["Name", "Vehicle No"])
+            selected_month = st.sidebar.selectbox("📅 Select Month-Year:", ["All"] + sorted(df['Month-Year'].unique(), reverse=True))
+        
+            chart_type = st.sidebar.radio("📈 Show Chart For:", ["Amount", "Distance", "Both"])
+            top_n = st.sidebar.slider("🔢 Show Top N Groups", min_value=3, max_value=20, value=10)
+        
+            # Totals, counts and averages of the top N groups of the selected month
+            grouped_df = cached_chart(
+                "grouped table", ["collection"], (group_by, selected_month, top_n),
+                lambda: grouped_collections(df, group_by, selected_month, top_n),
+            )
+        
+            # Display Data
+            st.subheader(f"📊 Top {top_n} - Grouped by {group_by}")
+            st.dataframe(grouped_df.style.format({
+                "Amount": "₹{:.0f}",
+                "Distance": "{:.0f} km",
+                "Avg Amount": "₹{:.0f}",
+                "Avg Distance": "{:.1f} km"
+            }), use_container_width=True)
+        
+            # Download CSV
+            csv_grouped = grouped_df.to_csv(index=False).encode("utf-8")
+            st.download_button("⬇️ Download Grouped Data", data=csv_grouped, file_name="grouped_data.csv", mime="text/csv")
+        
+            # Chart View
+            st.subheader("📈 Grouped Chart")
+        
+            columns = ["Amount", "Distance"] if chart_type == "Both" else chart_type
+            grouped_chart = cached_chart(
+                "grouped", ["collection"], (group_by, selected_month, top_n, chart_type),
+                lambda: grouped_df.set_index(group_by)[columns],
+            )
+            if chart_type == "Both":
+                st.line_chart(grouped_chart)
+            else:
+                st.bar_chart(grouped_chart)
+        
 
-    # ---------- Loss Matrix preprocessing ----------
-    def apply_loss_matrix_logic(input_df: pd.DataFrame) -> pd.DataFrame:
-        df_proc = input_df.copy()
-        df_proc = df_proc.dropna(subset=["Collection Date"]).copy()
-        df_proc["Amount"] = pd.to_numeric(df_proc["Amount"], errors="coerce").fillna(0)
+        elif page == "Expenses":
+            expense_df, ledger, partners = tables["expense"], tables["ledger"], tables["partners"]
+            expense_monthly = tables["expense_monthly"]
+            st.title("💸 Expense Insights")
+        
+            # Add Expense Button
+            col1, col2 = st.columns([6, 1])
+            with col2:
+                st.markdown(
+                    f'<a href="https://forms.gle/y1F2diJeG6WBfTmu9" target="_blank">'
+                    f'<button style="background-color:#4CAF50; color:white; padding:8px 16px; font-size:14px; border:none; border-radius:5px;">➕ Add Expenses</button>'
+                    f'</a>',
+                    unsafe_allow_html=True
+                )
+        
+            # ─────────────────────────────────────────────────────
+            # 🔹 Static Metrics (Not Filter Dependent)
+            total_manual_expense = expense_df["Amount Used"].sum()
+            total_bank_expense = sum(ledger.total("Expence_Debit", partner) for partner in partners)
+            total_expense = total_manual_expense + total_bank_expense
+        
+            col1, col2, col3 = st.columns(3)
+            col1.metric("🧾 Manual Entry Expense (Sheet)", f"₹{total_manual_expense:,.0f}")
+            col2.metric("🏦 Bank Debits (" + " + ".join(partner_label(p) for p in ledger.people) + ")", f"₹{total_bank_expense:,.0f}")
+            col3.metric("💰 Total Expense (Combined)", f"₹{total_expense:,.0f}")
+        
+            st.markdown("---")
+        
+            # ─────────────────────────────────────────────────────
+            # 🔹 Filter: Expense By
+            st.sidebar.markdown("### 🔍 Filter")
+            expense_by_options = ["All"] + sorted(expense_df["Expense By"].dropna().unique().tolist())
+            selected_expense_by = st.sidebar.selectbox("Expense By", expense_by_options)
+            # ─────────────────────────────────────────────────────
+            #edit by ayush
+            st.sidebar.markdown("**📅 Filter By Date**")
+
+            year_month_option = st.sidebar.selectbox(
+                "",
+                ["All", "Current Month", "Last 6 Months", "Current Year", "Custom Date"],
+                key="exp_range_select",
+            )
 
-        # Subtract 300 and flip sign
-        df_proc["Amount"] = (df_proc["Amount"] - 300) * -1
+            custom_start_date, custom_end_date = None, None
+            if year_month_option == "Custom Date":
+                min_date = date(2024, 1, 1)
+                max_date = date.today()
 
-        # Handle multi-vehicle for same driver/date
-        df_proc = df_proc.sort_values(by=["Collection Date", "Name", "Vehicle No"])
-        updated_rows = []
-        grouped = df_proc.groupby(["Collection Date", "Name"], group_keys=False)
+                custom_start_date = st.sidebar.date_input(
+                    "Select Start Date",
+                    value=date.today(),
+                    min_value=min_date,
+                    max_value=max_date,
+                    key="exp_start_date_picker"
+                )
 
-        for (date, driver), group in grouped:
-            if driver != "Zero Collection" and len(group) > 1:
-                total_amt = group["Amount"].sum()
+                if custom_start_date < max_date:
+                    next_day = custom_start_date + timedelta(days=1)
+                    custom_end_date = st.sidebar.date_input(
+                        "Select End Date",
+                        value=next_day,
+                        min_value=next_day,
+                        max_value=max_date,
+                        key="exp_end_date_picker"
+                    )
 
-                first_loss = (total_amt - 300) #* -1
+            today = pd.Timestamp.today().normalize()
 
-                second_loss = 300 + first_loss
+        
+            # ─────────────────────────────────────────────────────
+            #apply date filter (binary search on the date index)
+            filtered_df = filter_period(tables["expense_by_date"], year_month_option, today, custom_start_date, custom_end_date)
 
-                first_row = group.iloc[0].copy().to_dict()
-                second_row = group.iloc[1].copy().to_dict()
+            # 🔹 Apply expense by Filter
+            if selected_expense_by != "All":
+                filtered_df = filtered_df[filtered_df["Expense By"] == selected_expense_by]
 
-                if first_loss <= -300:
-                    first_loss = 0
+        
+            # ─────────────────────────────────────────────────────
+            # 🔹 Month-on-Month Summary (Last 12 Months)
+            st.subheader("📊 Month-on-Month Expense (Last 12 Months)")
+        
+            def build_expense_pivot():
+                if sqlite_store is not None and month_aligned_start(year_month_option, today) is False:
+                    # Range cuts through a month: indexed range scan + GROUP BY on the local SQLite copy
+                    if year_month_option != "Custom Date":
+                        start, end = preset_range(year_month_option, today)
+                    elif isinstance(custom_start_date, date) and isinstance(custom_end_date, date):
+                        start, end = custom_start_date, custom_end_date
+                    else:
+                        start, end = None, None
+                    momo = sqlite_store.monthly_totals(
+                        "expense", ["Expense By"], "Amount Used", start=start, end=end,
+                        where=None if selected_expense_by == "All" else {"Expense By": selected_expense_by},
+                    )
                 else:
-                    second_row["Name"] = "Zero Collection"
+                    # Whole months are read from the rollup, other ranges grouped from the filtered rows
+                    momo = expense_totals(expense_monthly, filtered_df, year_month_option, today, selected_expense_by)
+                return expense_month_on_month(momo, expense_monthly.months[-12:])
+
+            pivot_df = cached_chart(
+                "expense month-on-month", ["expense"],
+                (year_month_option, selected_expense_by, custom_start_date, custom_end_date, today),
+                build_expense_pivot,
+            )
+            st.bar_chart(pivot_df)
 
+            # 🔹 Total of Filtered Data
+            total_filtered_expense = filtered_df["Amount Used"].sum()
+            st.metric("📌 Total Filtered Expense", f"₹{total_filtered_expense:,.0f}")
 
-                first_row["Amount"] = first_loss
-                second_row["Amount"] = second_loss
-                     
 
-                updated_rows.extend([first_row, second_row])
-            else:
-                updated_rows.extend(group.to_dict("records"))
 
-        return pd.DataFrame(updated_rows)
-    # Apply new Loss Matrix logic
-    perf_df_lm = apply_loss_matrix_logic(perf_df)
-    # apply your exact driver vs company split here
 
-    #-------- current month loss ---------#
-    today = pd.Timestamp.today().normalize()
-    current_month_df = perf_df_lm[
-        (perf_df_lm["Collection Date"].dt.year == today.year) &
-        (perf_df_lm["Collection Date"].dt.month == today.month)
-        ]
-    current_total_loss = max(0, current_month_df["Amount"].sum() if not current_month_df.empty else 0)
-    current_company_loss = max(0, current_month_df.loc[current_month_df["Name"] == "Zero Collection", "Amount"].sum() if not current_month_df.empty else 0)
-    current_driver_loss = max(0, current_total_loss - current_company_loss)
-
-    
+            # ─────────────────────────────────────────────────────
+            # 🔹 View Filtered Table with Clickable Links
+            st.subheader("📋 Filtered Expense Table")
+            display_df = filtered_df.sort_values(by="Date", ascending=False).copy()
+            if "Any Bill" in display_df.columns:
+                url_mask = display_df["Any Bill"].astype(str).str.startswith("http")
+                display_df.loc[~url_mask, "Any Bill"] = None  # hide non-URLs
 
+            st.dataframe(
+                profile.ship("expense table", display_df),
+                use_container_width = True,
+                height = 420,
+                column_config={
+                    "Any Bill": st.column_config.LinkColumn("Any Bill", display_text="View Bill"),
+                    "Amount Used": st.column_config.NumberColumn("Amount Used", format="₹%d"),
+                    "Date": st.column_config.DateColumn("Date", format="YYYY-MM-DD"),
+                    "Month Key": None,
+                },
+                hide_index=False
+            )
 
 
-    # --- DASHBOARD UI ---
-    st.sidebar.header("📂 Navigation")
-    page = st.sidebar.radio("Go to:", ["Dashboard", "Monthly Summary", "Grouped Data", "Expenses", "Investment", "Collection Data", "Bank Transaction", "Performance" ])
 
-    if page == "Dashboard":
-        st.title("📊 VayuVolt Dashboard")
         
-        # Get latest month
-        last_month = df['Month-Year'].max()
-
-        # Optional: Clean column names in case of leading/trailing spaces
-        df.columns = df.columns.str.strip()
-        expense_df.columns = expense_df.columns.str.strip()
-        investment_df.columns = investment_df.columns.str.strip()
+        elif page == "Investment":
+            investment_df, bank_df, partners = tables["investment"], tables["bank"], tables["partners"]
+            st.title("📈 Investment Details")
         
-        # === Individual Totals (Govind Kumar) ===
-        govind_total_collection = df[df['Received By'].isin(['Govind Kumar'])]['Amount'].sum()
-        govind_total_investment = investment_df[investment_df['Investor Name'].isin(['Govind Kumar'])]['Investment Amount'].sum()
-        govind_total_expense = expense_df[expense_df['Expense By'].isin(['Govind Kumar'])]['Amount Used'].sum()
-
-        govind_last_month_collection = df[(df['Received By'].isin(['Govind Kumar'])) & (df['Month-Year'] == last_month)]['Amount'].sum()
-        govind_last_month_expense = expense_df[(expense_df['Expense By'].isin(['Govind Kumar'])) & (expense_df['Month-Year'] == last_month)]['Amount Used'].sum()
-
-        # === Individual Totals (Kumar Gaurav) ===
-        gaurav_total_collection = df[df['Received By'].isin(['Kumar Gaurav'])]['Amount'].sum()
-        gaurav_total_investment = investment_df[investment_df['Investor Name'].isin(['Kumar Gaurav'])]['Investment Amount'].sum()
-        gaurav_total_expense = expense_df[expense_df['Expense By'].isin(['Kumar Gaurav'])]['Amount Used'].sum()
-
-        gaurav_last_month_collection = df[(df['Received By'].isin(['Kumar Gaurav'])) & (df['Month-Year'] == last_month)]['Amount'].sum()
-        gaurav_last_month_expense = expense_df[(expense_df['Expense By'].isin(['Kumar Gaurav'])) & (expense_df['Month-Year'] == last_month)]['Amount Used'].sum()
-
-        # === Combined Totals ===
-        total_collection = govind_total_collection + gaurav_total_collection
-        total_investment = govind_total_investment + gaurav_total_investment + Investment_Credit_Bank
-        total_expense = govind_total_expense + gaurav_total_expense + govind_expense_debit +gaurav_expense_debit
-
-        remaining_fund_gaurav= (gaurav_total_collection - gaurav_total_expense - gaurav_collection_credit + gaurav_settlement_debit - gaurav_settlement_credit + gaurav_total_investment)
-        remaining_fund_govind= (govind_total_collection - govind_total_expense - govind_collection_credit + govind_settlement_debit - govind_settlement_credit + govind_total_investment)
-        Net_balance=remaining_fund_gaurav + remaining_fund_govind + bank_balance
-
-        last_month_collection = govind_last_month_collection + gaurav_last_month_collection
-        last_month_expense = govind_last_month_expense + gaurav_last_month_expense
-
-        collection_percentage_current_month = round((last_month_collection/(last_month_collection + current_total_loss)) * 100)
-        total_loss_percentage_current_month = round((current_total_loss/(last_month_collection + current_total_loss)) * 100)
-  
-
-        col1, col2, col3, col4, col5,col6,col7 = st.columns(7)
-        col1.metric(label="💰 Total Collection", value=f"₹{total_collection:,.0f}")
-        col2.metric(label="📉 Total Expenses", value=f"₹{total_expense:,.0f}")
-        col3.metric(label="💸 Total Investment", value=f"₹{total_investment:,.0f}")
-        col4.metric(label="💵 Govind Balance", value=f"₹{remaining_fund_govind:,.0f}")
-        col5.metric(label="💵 Gaurav Balance", value=f"₹{remaining_fund_gaurav:,.0f}")
-        col6.metric(label="🏦 Bank Balance", value=f"₹{bank_balance:,.0f}")
-        col7.metric(label="🏦 Net Balance", value=f"₹{Net_balance:,.0f}")
-
-
-        st.markdown("---")
-        formatted_last_month = pd.to_datetime(last_month).strftime("%b %Y")  
-        st.subheader("📅 "+formatted_last_month+"   Overview")
-
-        col4, col5, col6, col7, col8, col9, col10 = st.columns(7)
-        col4.metric(label="📈"+formatted_last_month+"  Collection", value=f"₹{last_month_collection:,.0f}")
-        col5.metric(label=" ", value=f"{collection_percentage_current_month:,.0f}%", delta=f"{collection_percentage_current_month:,.0f}%", delta_color="normal")
-        col6.metric(label="📉"+formatted_last_month+" Expenses", value=f"₹{last_month_expense:,.0f}")
-        col7.metric(label="📉"+formatted_last_month+" Driver Loss", value= f"{max(current_driver_loss,0):,.0f}")
-        col8.metric(label="📉"+formatted_last_month+" Company Loss",value= f"{max(current_company_loss,0):,.0f}")
-        col9.metric(label="📉"+formatted_last_month+" Total Loss",value= f"{max(current_total_loss,0):,.0f}")
-        col10.metric(label=" ", value=f"{total_loss_percentage_current_month:,.0f}%", delta=f"{total_loss_percentage_current_month:,.0f}%", delta_color="inverse")
-
-
-
-
-        st.markdown("---")
+            # Add Investment Button (Top Right)
+            col1, col2 = st.columns([6, 1])
+            with col2:
+                st.markdown(
+                    f'<a href="https://forms.gle/tse55G9Mp6CBqSmT9" target="_blank">'
+                    f'<button style="background-color:#4CAF50; color:white; padding:8px 16px; font-size:14px; border:none; border-radius:5px;">➕ Add Investment</button>'
+                    f'</a>',
+                    unsafe_allow_html=True
+                )
         
-        # Convert Collection Date to datetime
-        df["Collection Date"] = pd.to_datetime(df["Collection Date"])
+            # --- 1. From Investment Sheet ---
+            sheet_total_investment = investment_df["Investment Amount"].sum()
         
-        # Default full data before filtering
-        filtered_df = df.copy()
+            # --- 2. From Bank Transactions ---
+            bank_investment_df = bank_df[bank_df["Transaction Type"] == "Investment_Credit"].copy()
         
-        # === RADIO BUTTONS CENTERED BELOW CHART ===
-        col1, col2, col3 = st.columns([1, 3, 1])  # Center the middle column
-        with col2:
-            range_option = st.radio(
-                "",
-                ["1 Week", "1 Month", "3 Months", "6 Months", "1 Year", "3 Years", "5 Years", "Max"],
-                horizontal=True,
-                index =2
-            )
+            # Rename for consistency
+            bank_investment_df.rename(columns={
+                "Transaction By": "Investor Name",
+                "Amount": "Investment Amount",
+                "Reason": "Comment"
+            }, inplace=True)
         
-        # Determine the date range based on selection
-        today = pd.to_datetime("today")
-        if range_option == "1 Week":
-            start_date = today - pd.Timedelta(weeks=1)
-        elif range_option == "1 Month":
-            start_date = today - pd.DateOffset(months=1)
-        elif range_option == "3 Months":
-            start_date = today - pd.DateOffset(months=3)
-        elif range_option == "6 Months":
-            start_date = today - pd.DateOffset(months=6)
-        elif range_option == "1 Year":
-            start_date = today - pd.DateOffset(years=1)
-        elif range_option == "3 Years":
-            start_date = today - pd.DateOffset(years=3)
-        elif range_option == "5 Years":
-            start_date = today - pd.DateOffset(years=5)
-        else:
-            start_date = df["Collection Date"].min()
+            # Add source, clean and align columns
+            investment_df_clean = investment_df.assign(Source="Manual Sheet")[["Date", "Investor Name", "Investment Amount", "Investment Type", "Comment", "Month-Year", "Source"]]
+            bank_investment_df_clean = bank_investment_df.assign(Source="Bank Transaction", **{"Investment Type": "Bank Credit"})
         
-        # Filter data based on selected date range
-        filtered_df = df[df["Collection Date"] >= start_date]
+            # Final order of bank data
+            bank_investment_df_clean = bank_investment_df_clean[["Date", "Investor Name", "Investment Amount", "Investment Type", "Comment", "Month-Year", "Source"]]
         
-        # === RERENDER CHART ===
-        st.line_chart(filtered_df.set_index("Collection Date")[["Amount", "Distance"]])
-
-
-        ## changes start here by Ayush
-
+            # Combine both
+            full_investment_df = pd.concat([investment_df_clean, bank_investment_df_clean], ignore_index=True)
         
-        # Pending Collection
-        # Clean 'Vehicle No' column: ensure all values are strings with no leading/trailing spaces
-        df['Vehicle No'] = df['Vehicle No'].astype(str).str.strip()
-        # Convert 'Collection Date' to datetime format (day first), coerce invalid values to NaT, and keep only the date part
-        df['Collection Date'] = pd.to_datetime(df['Collection Date'], dayfirst=True, errors='coerce').dt.date
+            # --- Total Summary ---
+            total_combined_investment = full_investment_df["Investment Amount"].sum()
         
-        # Start date for pending collection tracking
-        start_date = date(2025, 8, 1)
+            col1, col2, col3 = st.columns(3)
+            col1.metric("📄 From Sheet", f"₹{sheet_total_investment:,.0f}")
+            col2.metric("🏦 From Bank", f"₹{bank_investment_df['Investment Amount'].sum():,.0f}")
+            col3.metric("💰 Total Investment", f"₹{total_combined_investment:,.0f}")
         
-        # Get all unique vehicle numbers
-        baseline_vehicles = df['Vehicle No'].unique()
-
-        # If no vehicles found for the dataset, show warning
-        if len(baseline_vehicles)==0:
-            st.warning("no rows found for 1 august")
-            baseline_vehicles = df['Vehicle No'].unique()
-
-        # Get the current time in Asia/Kolkata timezone and Get today's date and yesterday's date
-        tz = pytz.timezone("Asia/Kolkata")
-        now = datetime.now(tz)
-        latest_date = now.date()
-        yesterday = latest_date - timedelta(days=1)
-        cur_hour = now.hour
-        # If current time is after 4 PM, include today in the date range, else only till yesterday
-        if cur_hour >= 16:
-            all_dates = pd.date_range(start=start_date, end=latest_date)
-        else:
-            all_dates = pd.date_range(start=start_date, end= yesterday)
-        all_dates = [d.date() for d in all_dates.to_pydatetime()]
-
-        # Determine baseline collection dates for each vehicle 
-        first_dates = df.groupby('Vehicle No')['Collection Date'].min()
-        baseline_dates = {}
-        for v,f_date in first_dates.items():
-            if f_date <= start_date:
-                baseline_dates[v] = start_date
-            else:
-                baseline_dates[v] = f_date
-
-        # --- Identify missing collection entries
-        missing_entries = []
-
-        for cur_date in all_dates:
-            # Vehicles that should be active on this date
-            active_vehicles = [v for v, base_date in baseline_dates.items() if base_date <= cur_date]
-            # Vehicles that actually have a collection entry on this date
-            vehicles_on_date = df[df['Collection Date'] == cur_date]['Vehicle No'].unique()
-
-            # Vehicles that are missing collection on this date
-            missing_vehicles = [v for v in active_vehicles if v not in vehicles_on_date]
-            for v in missing_vehicles:
-                # Get vehicle's collection history before the current date
-                vehicle_history= df[(df['Vehicle No']== v) & (df['Collection Date']< cur_date)].sort_values('Collection Date')
-
-                # Filter rows with non-zero collection amounts
-                #non_zero_history = vehicle_history[vehicle_history['Amount'] > 0]
-                if not vehicle_history.empty:
-                    # Last date when non-zero collection happened
-                    last_row = vehicle_history.iloc[-1]
-                    last_collection_date = last_row['Collection Date']
-                    last_amount = last_row['Amount']
-                    last_meter_reading = last_row['Meter Reading']
-                    last_driver_name = last_row['Name']
-                
-
+            st.markdown("---")
+        
+            # --- 📊 Split Charts in Equal Bordered Columns ---
+            col1, col2 = st.columns(2)
+        
+            with col1:
+                st.markdown("#### 👥 Investment Share (" + " vs ".join(partner_label(p) for p in partners) + ")")
+                def draw_investment_pie():
+                    pie_df = full_investment_df[full_investment_df["Investor Name"].isin(partners)]
+                    investor_totals = pie_df.groupby("Investor Name", as_index=False, observed=True)["Investment Amount"].sum()
+                    if investor_totals.empty:
+                        return None
+                    fig1, ax1 = plt.subplots(figsize=(3.5, 3.5))
+                    ax1.pie(
+                        investor_totals["Investment Amount"],
+                        labels=investor_totals["Investor Name"],
+                        autopct='%1.1f%%',
+                        startangle=90,
+                        colors=plt.cm.Pastel1.colors
+                    )
+                    ax1.axis("equal")
+                    return render_png(fig1)
+
+                pie_png = cached_chart("investment share", ["investment", "bank"], tuple(partners), draw_investment_pie)
+                if pie_png is not None:
+                    st.image(pie_png)
                 else:
-                    # If no non-zero collection ever happened
-                    last_collection_date =None
-                    last_amount = None
-                    last_meter_reading = None
-                    last_driver_name = None
-   
-                
-                missing_entries.append({"Missing Date": cur_date, "Vehicle No":v, "Last Meter Reading": last_meter_reading, "Last Assigned Name": last_driver_name, "Last Collected Amount": last_amount, "Last Collection date": last_collection_date })
-        
-        missing_df = pd.DataFrame(missing_entries)
-
-
-        # Display pending collection data        
-        
-        if missing_df.empty:
-            st.write("### 🔍 Recent Collection:")
-            Recent_Collection = df.sort_values(by="Collection Date", ascending=False).head(14)
-            Recent_Collection["Collection Date"] = pd.to_datetime(Recent_Collection["Collection Date"])
-            Recent_Collection["Collection Date"] = Recent_Collection["Collection Date"].dt.strftime("%d %b %Y")
-            for _, row in Recent_Collection.iterrows():
-                bg_style = get_background_style(row['Amount'])
-                        
-                html_content += f"""
-                    <div class="card" style="background: {bg_style}">
-                        <div class="vehicle-no">{row['Vehicle No']}</div>
-                        <div class="card-header">
-                            <div class="date">{row['Collection Date']}</div>
-                            <div class="meter-reading-header">{row['Meter Reading']} Km</div>
-                        </div>
-                        <div class="info-row">
-                            <div class="info-left">
-                                <div class="info-value">₹ {row['Amount']}</div>
-                                <div class="info-value">{row['Distance']} km</div>
-                            </div>
-                            <div class="info-right">
-                                <div class="info-value name">{row['Name']}</div>
-                            </div>
-                        </div>
-                    </div>
-                """
-
-            html_content += "</div>"
-
-            # Render HTML
-            components.html(html_content, height=300, scrolling=True)
-        else:
-            st.subheader("🕒 Pending Collection:")
-            form_base = "https://docs.google.com/forms/d/e/1FAIpQLSdnNBpKKxpWVkrZfj0PLKW8K26-3i0bO43hBADOHvGcpGqjvA/viewform?usp=pp_url"
+                    st.info("No investment data available for any partner.")
+        
+            with col2:
+                st.markdown("#### 🧾 Manual vs Bank Investment by Investor")
+        
+                def build_comparison():
+                    manual_df = investment_df_clean[investment_df_clean["Investor Name"].isin(partners)]
+                    bank_df_investor = bank_investment_df_clean[bank_investment_df_clean["Investor Name"].isin(partners)]
+                    manual_summary = manual_df.groupby("Investor Name", observed=True)["Investment Amount"].sum().rename("Manual Sheet")
+                    bank_summary = bank_df_investor.groupby("Investor Name", observed=True)["Investment Amount"].sum().rename("Bank Transaction")
+                    return pd.concat([manual_summary, bank_summary], axis=1).fillna(0)
+
+                comparison_df = cached_chart("investment by source", ["investment", "bank"], tuple(partners), build_comparison)
+                st.bar_chart(comparison_df)
+        
+            st.markdown("---")
+        
+            # --- 🎯 Investor Filter + Summary ---
+            st.sidebar.markdown("### 🔎 Filter Investment Records by Investor")
+        
+            # Unique investor names
+            investors_list = full_investment_df["Investor Name"].dropna().unique().tolist()
+            investors_list.sort()
+            investors_list.insert(0, "All")
+        
+            selected_investor = st.sidebar.selectbox("Select Investor", investors_list)
+        
+            # Filter data
+            if selected_investor != "All":
+                filtered_df = full_investment_df[full_investment_df["Investor Name"] == selected_investor]
+            else:
+                filtered_df = full_investment_df
+        
+            # --- 💼 Total Investment by Each Investor ---
+            st.markdown("#### 💼 Total Investment by Each Investor")
+        
+            summary_by_investor = full_investment_df.groupby("Investor Name", observed=True)["Investment Amount"].sum().reset_index()
+            summary_by_investor.columns = ["Investor Name", "Total Investment (₹)"]
+            summary_by_investor["Total Investment (₹)"] = summary_by_investor["Total Investment (₹)"].apply(lambda x: f"₹{x:,.0f}")
+        
+            st.dataframe(summary_by_investor)
+            st.markdown("---")
+        
+            # --- 📋 Final Investment Table ---
+            if "Date" in filtered_df.columns:
+                filtered_df["Date"] = pd.to_datetime(filtered_df["Date"], dayfirst=True, errors="coerce")
+                filtered_df = filtered_df.dropna(subset=["Date"])
+                filtered_df = filtered_df.sort_values(by="Date", ascending=False)
+        
+                st.subheader("📋 All Investment Records")
+                st.dataframe(profile.ship("investment table", filtered_df))
+            else:
+                st.warning("⚠️ 'Date' column not found in investment data.")
 
-            
 
-            # Add each button to the HTML string
-            for _, row in missing_df.iterrows():
-                form_link = (
-                    f"{form_base}"
-                    f"&entry.1817078140={quote(str(row['Missing Date']))}"
-                    f"&entry.424776091={quote(str(row['Vehicle No']))}"
-                    f"&entry.1100483606={quote(str(row['Last Collected Amount']))}"  
-                    f"&entry.1947342081={quote(str(row['Last Meter Reading']))}"
-                    f"&entry.1812763042={quote(str(row['Last Assigned Name']))}"
-                    f"&entry.1925700467={quote('Govind Kumar')}"
+        
+        elif page == "Collection Data":
+            df, collection_by_date = tables["collection"], tables["collection_by_date"]
+            st.title("📊 Collection Data")
+
+            # Add Collection Button (Top Right)
+            col1, col2 = st.columns([6, 1])
+            with col2:
+                st.markdown(
+                    f'<a href="https://forms.gle/ZyvCBLFaPC1szPGd7" target="_blank">'
+                    f'<button style="background-color:#4CAF50; color:white; padding:8px 16px; font-size:14px; border:none; border-radius:5px;">➕ Add Collection</button>'
+                    f'</a>',
+                    unsafe_allow_html=True
                 )
-
-                buttons_html += f"""
-        <a href="{form_link}" target="_blank" class="custom-btn">
-            <span class="vehicle-no">{row['Vehicle No']}</span>
-            <span class="missing-date">{row['Missing Date']}</span>
-        </a>
-        """
-
-            buttons_html += "</div>"
-
-            # Render all buttons at once
-            st.markdown(buttons_html, unsafe_allow_html=True)
-            
-
+        
+            # "Previous Amount" / "Change" per vehicle are precomputed in the data model
+        
+            # KPIs based on all data
+            kpis = collection_kpis(df)
+        
+            # Show KPI Metrics
+            col1, col2, col3, col4, col5 = st.columns(5)
+            col1.metric("💰 Total Collection", f"₹{kpis['total_collection']:,.0f}")
+            col2.metric("🚐 Total Vehicles", kpis["vehicles"])
+            col3.metric("🏆 Best Vehicle", kpis["best_vehicle"])
+            col4.metric("📉 Worst Vehicle", kpis["worst_vehicle"])
+            col5.metric("📄 Total Records", kpis["records"])
+        
+            st.markdown("---")
+        
+        # edit by ayush starts
+            # Vehicle filter
+            st.sidebar.markdown("### 🚗 Filter by Vehicle")
+            #vehicle_list = ["All"] + sorted(df["Vehicle No"].unique())
+            #selected_vehicle = st.sidebar.selectbox("###🚗 Filter by Vehicle", vehicle_list)
+            selected_vehicle = st.sidebar.selectbox("", ["All"] + sorted(df["Vehicle No"].unique()),key = "vehicle_select",)
+        
 
 
-        ## changes by ayush end here ##############################
-
-    elif page == "Monthly Summary":
-        st.title("📊 Monthly Summary Report")
-    
-        # --- Monthly Aggregation ---
-        # Govind and Gaurav Collection
-        govind_monthly = df[df['Received By'] == 'Govind Kumar'].groupby('Month-Year', as_index=False)['Amount'].sum().rename(columns={"Amount": "Govind Collection"})
-        gaurav_monthly = df[df['Received By'] == 'Kumar Gaurav'].groupby('Month-Year', as_index=False)['Amount'].sum().rename(columns={"Amount": "Gaurav Collection"})
-    
-        # Govind and Gaurav Expenses
-        govind_expense_monthly = expense_df[expense_df['Expense By'] == 'Govind Kumar'].groupby('Month-Year', as_index=False)['Amount Used'].sum().rename(columns={"Amount Used": "Govind Expense"})
-        gaurav_expense_monthly = expense_df[expense_df['Expense By'] == 'Kumar Gaurav'].groupby('Month-Year', as_index=False)['Amount Used'].sum().rename(columns={"Amount Used": "Gaurav Expense"})
-    
-        # Merge all
-        monthly_summary = pd.merge(govind_monthly, gaurav_monthly, on="Month-Year", how="outer")
-        monthly_summary = pd.merge(monthly_summary, govind_expense_monthly, on="Month-Year", how="outer")
-        monthly_summary = pd.merge(monthly_summary, gaurav_expense_monthly, on="Month-Year", how="outer")
-    
-        monthly_summary.fillna(0, inplace=True)
-    
-        # Total columns
-        monthly_summary["Total Collection"] = monthly_summary["Govind Collection"] + monthly_summary["Gaurav Collection"]
-        monthly_summary["Total Expense"] = monthly_summary["Govind Expense"] + monthly_summary["Gaurav Expense"]
-    
-        # Net Balance
-        monthly_summary["Net Balance"] = monthly_summary["Total Collection"] - monthly_summary["Total Expense"]
-    
-        # Percentage Change
-        monthly_summary["Collection Change (%)"] = monthly_summary["Total Collection"].pct_change().fillna(0) * 100
-        monthly_summary["Expense Change (%)"] = monthly_summary["Total Expense"].pct_change().fillna(0) * 100
-    
-        # Reorder columns
-        ordered_columns = [
-            "Month-Year", 
-            "Govind Collection", "Gaurav Collection", 
-            "Total Collection", "Collection Change (%)", 
-            "Govind Expense", "Gaurav Expense", 
-            "Total Expense", "Expense Change (%)", 
-            "Net Balance"
-        ]
-        monthly_summary = monthly_summary[ordered_columns]
-    
-        # === UI ===
-        st.subheader("📅 Monthly Breakdown")
-        st.dataframe(monthly_summary.style.format({
-            "Govind Collection": "₹{:.0f}",
-            "Gaurav Collection": "₹{:.0f}",
-            "Total Collection": "₹{:.0f}",
-            "Collection Change (%)": "{:+.1f}%",
-            "Govind Expense": "₹{:.0f}",
-            "Gaurav Expense": "₹{:.0f}",
-            "Total Expense": "₹{:.0f}",
-            "Expense Change (%)": "{:+.1f}%",
-            "Net Balance": "₹{:.0f}"
-        }), use_container_width=True)
-    
-        # === Charts ===
-        chart_option = st.radio("📊 Show Chart for:", ["Collection vs Expense", "Net Balance Trend"])
-        
-        if chart_option == "Collection vs Expense":
-            chart_df = monthly_summary[["Month-Year", "Total Collection", "Total Expense"]].set_index("Month-Year")
-            st.bar_chart(chart_df)
-        else:
-            net_df = monthly_summary[["Month-Year", "Net Balance"]].set_index("Month-Year")
-            st.line_chart(net_df)
-    
-        # === Download Option ===
-        csv = monthly_summary.to_csv(index=False).encode("utf-8")
-        st.download_button("⬇️ Download Monthly Summary (CSV)", data=csv, file_name="monthly_summary.csv", mime="text/csv")
-
-
-    elif page == "Grouped Data":
-        st.title("🔍 Grouped Collection Data")
-    
-        group_by = st.sidebar.radio("🔄 Group Data By:", ["Name", "Vehicle No"])
-        selected_month = st.sidebar.selectbox("📅 Select Month-Year:", ["All"] + sorted(df['Month-Year'].unique(), reverse=True))
-    
-        chart_type = st.sidebar.radio("📈 Show Chart For:", ["Amount", "Distance", "Both"])
-        top_n = st.sidebar.slider("🔢 Show Top N Groups", min_value=3, max_value=20, value=10)
-    
-        # Filter by month
-        df_filtered = df.copy()
-        if selected_month != "All":
-            df_filtered = df[df['Month-Year'] == selected_month]
-    
-        # Grouping logic
-        grouped_df = df_filtered.groupby(group_by, as_index=False).agg({
-            "Amount": "sum",
-            "Distance": "sum",
-            "Collection Date": "count"
-        }).rename(columns={"Collection Date": "Total Collections"})
-    
-        # Add averages
-        grouped_df["Avg Amount"] = grouped_df["Amount"] / grouped_df["Total Collections"]
-        grouped_df["Avg Distance"] = grouped_df["Distance"] / grouped_df["Total Collections"]
-    
-        # Sort and get top N
-        grouped_df = grouped_df.sort_values(by="Amount", ascending=False).head(top_n)
-    
-        # Display Data
-        st.subheader(f"📊 Top {top_n} - Grouped by {group_by}")
-        st.dataframe(grouped_df.style.format({
-            "Amount": "₹{:.0f}",
-            "Distance": "{:.0f} km",
-            "Avg Amount": "₹{:.0f}",
-            "Avg Distance": "{:.1f} km"
-        }), use_container_width=True)
-    
-        # Download CSV
-        csv_grouped = grouped_df.to_csv(index=False).encode("utf-8")
-        st.download_button("⬇️ Download Grouped Data", data=csv_grouped, file_name="grouped_data.csv", mime="text/csv")
-    
-        # Chart View
-        st.subheader("📈 Grouped Chart")
-    
-        if chart_type == "Amount":
-            st.bar_chart(grouped_df.set_index(group_by)["Amount"])
-        elif chart_type == "Distance":
-            st.bar_chart(grouped_df.set_index(group_by)["Distance"])
-        else:
-            st.line_chart(grouped_df.set_index(group_by)[["Amount", "Distance"]])
-    
-
-    elif page == "Expenses":
-        st.title("💸 Expense Insights")
-    
-        # Add Expense Button
-        col1, col2 = st.columns([6, 1])
-        with col2:
-            st.markdown(
-                f'<a href="https://forms.gle/y1F2diJeG6WBfTmu9" target="_blank">'
-                f'<button style="background-color:#4CAF50; color:white; padding:8px 16px; font-size:14px; border:none; border-radius:5px;">➕ Add Expenses</button>'
-                f'</a>',
-                unsafe_allow_html=True
-            )
-    
-        # ─────────────────────────────────────────────────────
-        # 🔹 Preprocessing
-        expense_df["Date"] = pd.to_datetime(expense_df["Date"], errors='coerce')
-        expense_df["Year"] = expense_df["Date"].dt.year
-        expense_df["Month"] = expense_df["Date"].dt.strftime('%B')
-        expense_df["Month_Num"] = expense_df["Date"].dt.month
-        expense_df["YearMonth"] = expense_df["Date"].dt.to_period("M").astype(str)
-    
-        # ─────────────────────────────────────────────────────
-        # 🔹 Static Metrics (Not Filter Dependent)
-        total_manual_expense = expense_df["Amount Used"].sum()
-        total_bank_expense = govind_expense_debit + gaurav_expense_debit
-        total_expense = total_manual_expense + total_bank_expense
-    
-        col1, col2, col3 = st.columns(3)
-        col1.metric("🧾 Manual Entry Expense (Sheet)", f"₹{total_manual_expense:,.0f}")
-        col2.metric("🏦 Bank Debits (Govind + Gaurav)", f"₹{total_bank_expense:,.0f}")
-        col3.metric("💰 Total Expense (Combined)", f"₹{total_expense:,.0f}")
-    
-        st.markdown("---")
-    
-        # ─────────────────────────────────────────────────────
-        # 🔹 Filter: Expense By
-        st.sidebar.markdown("### 🔍 Filter")
-        expense_by_options = ["All"] + sorted(expense_df["Expense By"].dropna().unique().tolist())
-        selected_expense_by = st.sidebar.selectbox("Expense By", expense_by_options)
-        # ─────────────────────────────────────────────────────
-        #edit by ayush
-        st.sidebar.markdown("**📅 Filter By Date**")
-
-        year_month_option = st.sidebar.selectbox(
-            "",
-            ["All", "Current Month", "Last 6 Months", "Current Year", "Custom Date"],
-            key="exp_range_select",
-        )
-
-        custom_start_date, custom_end_date = None, None
-        if year_month_option == "Custom Date":
-            min_date = date(2024, 1, 1)
-            max_date = date.today()
-
-            custom_start_date = st.sidebar.date_input(
-                "Select Start Date",
-                value=date.today(),
-                min_value=min_date,
-                max_value=max_date,
-                key="exp_start_date_picker"
+            #custom_year, custom_month = None, None
+            st.sidebar.markdown("### 📅 Filter by Date")
+            year_month_option = st.sidebar.selectbox(
+                "",
+                ["All", "Current Month", "Last 6 Months", "Current Year", "Custom Date"],
+                key="range_select",
             )
 
-            if custom_start_date < max_date:
-                next_day = custom_start_date + timedelta(days=1)
-                custom_end_date = st.sidebar.date_input(
-                    "Select End Date",
-                    value=next_day,
-                    min_value=next_day,
+            custom_start_date, custom_end_date = None, None
+            if year_month_option == "Custom Date":
+                min_date = date(2024, 1, 1)
+                max_date = date.today()
+                #all_dates = sorted(filtered_df["Collection Date"].dt.date.dropna().unique().tolist())
+                #custom_start_date = st.sidebar.selectbox("Select Start Date" , [None] + all_dates,format_func=lambda d: "— Select start date —" if d is None else d.strftime("%d %b %Y"), key="start_date_select", index=0,)
+                #possible_end_dates = [d for d in all_dates if d > custom_start_date]
+                #years = sorted(pd.to_datetime(df["Collection Date"]).dt.year.unique())
+                #months = list(range(1,13))
+                #custom_year = st.sidebar.selectbox("Select Year", years)
+                #custom_month = st.sidebar.selectbox("Select Month", months, format_func=lambda x: pd.to_datetime(str(x), format='%m').strftime('%B'))
+                custom_start_date = st.sidebar.date_input(
+                    "Select Start Date",
+                    value=date.today(),
+                    min_value=min_date,
                     max_value=max_date,
-                    key="exp_end_date_picker"
+                    key="start_date_picker"
                 )
 
-        today = pd.Timestamp.today().normalize()
+                if custom_start_date<max_date:
+                    next_day = custom_start_date + timedelta(days=1)
+                    custom_end_date = st.sidebar.date_input(
+                        "Select End Date",
+                        value=next_day,
+                        min_value=next_day,
+                        max_value=max_date,
+                        key="end_date_picker"
+                    )
 
-    
-        # ─────────────────────────────────────────────────────
-        # 🔹 Apply expense by Filter
-        if selected_expense_by == "All":
-            filtered_df = expense_df.copy()
-        else:
-            filtered_df = expense_df[expense_df["Expense By"] == selected_expense_by]
-
-        #apply date filter
-        if year_month_option == "Current Month":
-            start_date = today.replace(day=1)
-            filtered_df = filtered_df[filtered_df["Date"] >= start_date]
-        elif year_month_option == "Last 6 Months":
-            start_date = today - pd.DateOffset(months=6)
-            filtered_df = filtered_df[filtered_df["Date"] >= start_date]
-        elif year_month_option == "Current Year":
-            start_date = today.replace(month=1, day=1)
-            filtered_df = filtered_df[filtered_df["Date"] >= start_date]
-        elif (year_month_option == "Custom Date" and isinstance(custom_start_date, date) and isinstance(custom_end_date, date)):
-            filtered_df = filtered_df[
-                (filtered_df["Date"].dt.date >= custom_start_date) & (filtered_df["Date"].dt.date <= custom_end_date)]
-
-    
-        # ─────────────────────────────────────────────────────
-        # 🔹 Month-on-Month Summary (Last 12 Months)
-        st.subheader("📊 Month-on-Month Expense (Last 12 Months)")
-    
-        recent_12_months = (
-            expense_df["YearMonth"]
-            .dropna()
-            .sort_values()
-            .unique()
-        )[-12:]
-    
-        momo_df = (
-            filtered_df[filtered_df["YearMonth"].isin(recent_12_months)]
-            .groupby(["YearMonth", "Expense By"])["Amount Used"]
-            .sum()
-            .reset_index()
-            .sort_values(by="YearMonth")
-        )
-    
-        pivot_df = momo_df.pivot(index="YearMonth", columns="Expense By", values="Amount Used").fillna(0)
-    
-        st.bar_chart(pivot_df)
-
-        # 🔹 Total of Filtered Data
-        total_filtered_expense = filtered_df["Amount Used"].sum()
-        st.metric("📌 Total Filtered Expense", f"₹{total_filtered_expense:,.0f}")
-
-
-
-
-        # ─────────────────────────────────────────────────────
-        # 🔹 View Filtered Table with Clickable Links
-        st.subheader("📋 Filtered Expense Table")
-        display_df = filtered_df.sort_values(by="Date", ascending=False).copy()
-        if "Any Bill" in display_df.columns:
-            url_mask = display_df["Any Bill"].astype(str).str.startswith("http")
-            display_df.loc[~url_mask, "Any Bill"] = None  # hide non-URLs
-
-        st.dataframe(
-            display_df,
-            use_container_width = True,
-            height = 420,
-            column_config={
-                "Any Bill": st.column_config.LinkColumn("Any Bill", display_text="View Bill"),
-                "Amount Used": st.column_config.NumberColumn("Amount Used", format="₹%d"),
-                "Date": st.column_config.DateColumn("Date", format="YYYY-MM-DD"),
-            },
-            hide_index=False
-        )
 
+            today = pd.Timestamp.today().normalize()
+            # apply year-month filter (binary search on the date index)
+            filtered_df = filter_period(collection_by_date, year_month_option, today, custom_start_date, custom_end_date)
 
+            # apply vehicle filter
+            if selected_vehicle != "All":
+                filtered_df = filtered_df[filtered_df["Vehicle No"] == selected_vehicle]
+            
 
-    
-    elif page == "Investment":
-        st.title("📈 Investment Details")
-    
-        # Add Investment Button (Top Right)
-        col1, col2 = st.columns([6, 1])
-        with col2:
-            st.markdown(
-                f'<a href="https://forms.gle/tse55G9Mp6CBqSmT9" target="_blank">'
-                f'<button style="background-color:#4CAF50; color:white; padding:8px 16px; font-size:14px; border:none; border-radius:5px;">➕ Add Investment</button>'
-                f'</a>',
-                unsafe_allow_html=True
-            )
-    
-        # --- 1. From Investment Sheet ---
-        sheet_total_investment = investment_df["Investment Amount"].sum()
-    
-        # --- 2. From Bank Transactions ---
-        bank_investment_df = bank_df[bank_df["Transaction Type"] == "Investment_Credit"].copy()
-    
-        # Rename for consistency
-        bank_investment_df.rename(columns={
-            "Transaction By": "Investor Name",
-            "Amount": "Investment Amount",
-            "Reason": "Comment"
-        }, inplace=True)
-    
-        # Add source
-        investment_df["Source"] = "Manual Sheet"
-        bank_investment_df["Source"] = "Bank Transaction"
-    
-        # Clean and align columns
-        investment_df_clean = investment_df[["Date", "Investor Name", "Investment Amount", "Investment Type", "Comment", "Month-Year", "Source"]]
-        bank_investment_df_clean = bank_investment_df[["Date", "Investor Name", "Investment Amount", "Comment", "Source"]]
-    
-        bank_investment_df_clean["Investment Type"] = "Bank Credit"
-        bank_investment_df_clean["Month-Year"] = pd.to_datetime(bank_investment_df_clean["Date"]).dt.strftime('%Y-%m')
-    
-        # Final order of bank data
-        bank_investment_df_clean = bank_investment_df_clean[["Date", "Investor Name", "Investment Amount", "Investment Type", "Comment", "Month-Year", "Source"]]
-    
-        # Combine both
-        full_investment_df = pd.concat([investment_df_clean, bank_investment_df_clean], ignore_index=True)
-    
-        # --- Total Summary ---
-        total_combined_investment = full_investment_df["Investment Amount"].sum()
-    
-        col1, col2, col3 = st.columns(3)
-        col1.metric("📄 From Sheet", f"₹{sheet_total_investment:,.0f}")
-        col2.metric("🏦 From Bank", f"₹{bank_investment_df['Investment Amount'].sum():,.0f}")
-        col3.metric("💰 Total Investment", f"₹{total_combined_investment:,.0f}")
-    
-        st.markdown("---")
-    
-        # --- 📊 Split Charts in Equal Bordered Columns ---
-        col1, col2 = st.columns(2)
-    
-        with col1:
-            st.markdown("#### 👥 Investment Share (Govind vs Gaurav)")
-            pie_df = full_investment_df[full_investment_df["Investor Name"].isin(["Govind Kumar", "Kumar Gaurav"])]
-            investor_totals = pie_df.groupby("Investor Name", as_index=False)["Investment Amount"].sum()
-    
-            if not investor_totals.empty:
-                fig1, ax1 = plt.subplots(figsize=(3.5, 3.5))
-                ax1.pie(
-                    investor_totals["Investment Amount"],
-                    labels=investor_totals["Investor Name"],
-                    autopct='%1.1f%%',
-                    startangle=90,
-                    colors=plt.cm.Pastel1.colors
+            
+        ## edit by ayush ends
+        
+            st.markdown("### 📈 Collection Trend")
+        
+            # Line chart with time range filter
+            # === RADIO BUTTONS CENTERED BELOW CHART WITHOUT LABEL ===
+            col1, col2, col3 = st.columns([1, 3, 1])
+            with col2:
+                range_option = st.radio(
+                    "",  # Remove label
+                    ["1 Week", "1 Month", "3 Months", "6 Months", "1 Year", "3 Years", "5 Years", "Max"],
+                    horizontal=True,
+                    index=2
                 )
-                ax1.axis("equal")
-                st.pyplot(fig1)
-            else:
-                st.info("No investment data available for Govind or Gaurav.")
-    
-        with col2:
-            st.markdown("#### 🧾 Manual vs Bank Investment by Investor")
-            manual_df = investment_df_clean[investment_df_clean["Investor Name"].isin(["Govind Kumar", "Kumar Gaurav"])]
-            bank_df_investor = bank_investment_df_clean[bank_investment_df_clean["Investor Name"].isin(["Govind Kumar", "Kumar Gaurav"])]
-    
-            manual_summary = manual_df.groupby("Investor Name")["Investment Amount"].sum().rename("Manual Sheet")
-            bank_summary = bank_df_investor.groupby("Investor Name")["Investment Amount"].sum().rename("Bank Transaction")
-    
-            comparison_df = pd.concat([manual_summary, bank_summary], axis=1).fillna(0)
-            st.bar_chart(comparison_df)
-    
-        st.markdown("---")
-    
-        # --- 🎯 Investor Filter + Summary ---
-        st.sidebar.markdown("### 🔎 Filter Investment Records by Investor")
-    
-        # Unique investor names
-        investors_list = full_investment_df["Investor Name"].dropna().unique().tolist()
-        investors_list.sort()
-        investors_list.insert(0, "All")
-    
-        selected_investor = st.sidebar.selectbox("Select Investor", investors_list)
-    
-        # Filter data
-        if selected_investor != "All":
-            filtered_df = full_investment_df[full_investment_df["Investor Name"] == selected_investor]
-        else:
-            filtered_df = full_investment_df
-    
-        # --- 💼 Total Investment by Each Investor ---
-        st.markdown("#### 💼 Total Investment by Each Investor")
-    
-        summary_by_investor = full_investment_df.groupby("Investor Name")["Investment Amount"].sum().reset_index()
-        summary_by_investor.columns = ["Investor Name", "Total Investment (₹)"]
-        summary_by_investor["Total Investment (₹)"] = summary_by_investor["Total Investment (₹)"].apply(lambda x: f"₹{x:,.0f}")
-    
-        st.dataframe(summary_by_investor)
-        st.markdown("---")
-    
-        # --- 📋 Final Investment Table ---
-        if "Date" in filtered_df.columns:
-            filtered_df["Date"] = pd.to_datetime(filtered_df["Date"], dayfirst=True, errors="coerce")
-            filtered_df = filtered_df.dropna(subset=["Date"])
-            filtered_df = filtered_df.sort_values(by="Date", ascending=False)
-    
-            st.subheader("📋 All Investment Records")
-            st.dataframe(filtered_df)
-        else:
-            st.warning("⚠️ 'Date' column not found in investment data.")
-
-
-    
-    elif page == "Collection Data":
-        st.title("📊 Collection Data")
-
-        # Add Collection Button (Top Right)
-        col1, col2 = st.columns([6, 1])
-        with col2:
-            st.markdown(
-                f'<a href="https://forms.gle/ZyvCBLFaPC1szPGd7" target="_blank">'
-                f'<button style="background-color:#4CAF50; color:white; padding:8px 16px; font-size:14px; border:none; border-radius:5px;">➕ Add Collection</button>'
-                f'</a>',
-                unsafe_allow_html=True
+            
+            # === FILTER BASED ON SELECTION ===
+            def build_vehicle_pivot(now, raw):
+                range_df = collection_by_date.preset(range_option, now)
+                filtered_chart_df = range_df.groupby(["Collection Date", "Vehicle No"], observed=True)["Amount"].sum().reset_index()
+                pivot = filtered_chart_df.pivot(index="Collection Date", columns="Vehicle No", values="Amount").fillna(0)
+                # Long ranges: weekly / monthly totals per vehicle instead of one point per day
+                return (pivot if raw else downsample_chart(pivot, range_option, how="sum")), len(pivot)
+
+            now = pd.to_datetime("today")
+            show_raw = st.session_state.get("vehicle_raw_points", False)
+            filtered_pivot, pivot_days = cached_chart(
+                "collection by vehicle", ["collection"], (range_option, now.date(), show_raw),
+                lambda: build_vehicle_pivot(now, show_raw),
             )
-    
-        # Ensure date column is in datetime format
-        df["Collection Date"] = pd.to_datetime(df["Collection Date"])
-    
-        # Sort by Collection Date descending
-        df = df.sort_values("Collection Date", ascending=False)
-    
-        # Calculate previous amount per vehicle
-        df = df.sort_values(["Vehicle No", "Collection Date"])
-        df["Previous Amount"] = df.groupby("Vehicle No")["Amount"].shift(1)
-        df["Change"] = df["Amount"] - df["Previous Amount"]
-    
-        # KPIs based on all data
-        total_collection = df["Amount"].sum()
-        total_vehicles = df["Vehicle No"].nunique()
-        best_vehicle = df.groupby("Vehicle No")["Amount"].mean().idxmax()
-        worst_vehicle = df.groupby("Vehicle No")["Amount"].mean().idxmin()
-    
-        # Show KPI Metrics
-        col1, col2, col3, col4, col5 = st.columns(5)
-        col1.metric("💰 Total Collection", f"₹{total_collection:,.0f}")
-        col2.metric("🚐 Total Vehicles", total_vehicles)
-        col3.metric("🏆 Best Vehicle", best_vehicle)
-        col4.metric("📉 Worst Vehicle", worst_vehicle)
-        col5.metric("📄 Total Records", len(df))
-    
-        st.markdown("---")
-    
-    # edit by ayush starts
-        # Vehicle filter
-        st.sidebar.markdown("### 🚗 Filter by Vehicle")
-        #vehicle_list = ["All"] + sorted(df["Vehicle No"].unique())
-        #selected_vehicle = st.sidebar.selectbox("###🚗 Filter by Vehicle", vehicle_list)
-        selected_vehicle = st.sidebar.selectbox("", ["All"] + sorted(df["Vehicle No"].unique()),key = "vehicle_select",)
-    
-
-        # ensure date column is datetime
-        df["Collection Date"] = pd.to_datetime(df["Collection Date"], dayfirst=True, errors="coerce")
-        #custom date
-        # apply vehicle filter
-        if selected_vehicle != "All":
-            filtered_df = df[df["Vehicle No"] == selected_vehicle].copy()
-        else:
-            filtered_df = df.copy()
-
-        #custom_year, custom_month = None, None
-        st.sidebar.markdown("### 📅 Filter by Date")
-        year_month_option = st.sidebar.selectbox(
-            "",
-            ["All", "Current Month", "Last 6 Months", "Current Year", "Custom Date"],
-            key="range_select",
-        )
-
-        custom_start_date, custom_end_date = None, None
-        if year_month_option == "Custom Date":
-            min_date = date(2024, 1, 1)
-            max_date = date.today()
-            #all_dates = sorted(filtered_df["Collection Date"].dt.date.dropna().unique().tolist())
-            #custom_start_date = st.sidebar.selectbox("Select Start Date" , [None] + all_dates,format_func=lambda d: "— Select start date —" if d is None else d.strftime("%d %b %Y"), key="start_date_select", index=0,)
-            #possible_end_dates = [d for d in all_dates if d > custom_start_date]
-            #years = sorted(pd.to_datetime(df["Collection Date"]).dt.year.unique())
-            #months = list(range(1,13))
-            #custom_year = st.sidebar.selectbox("Select Year", years)
-            #custom_month = st.sidebar.selectbox("Select Month", months, format_func=lambda x: pd.to_datetime(str(x), format='%m').strftime('%B'))
-            custom_start_date = st.sidebar.date_input(
-                "Select Start Date",
-                value=date.today(),
-                min_value=min_date,
-                max_value=max_date,
-                key="start_date_picker"
+            
+            # Rerender chart with filtered data
+            st.line_chart(profile.ship("vehicle chart", filtered_pivot))
+            bucket_freq = None if show_raw else RANGE_BUCKETS.get(range_option)
+            col1, col2 = st.columns([3, 1])
+            col1.caption(
+                f"{BUCKET_LABELS[bucket_freq]} totals of {pivot_days:,} days" if bucket_freq
+                else f"Showing {len(filtered_pivot):,} of {pivot_days:,} days"
             )
+            col2.toggle("Show all points", key="vehicle_raw_points")
+    ## edit by ayush starts
 
-            if custom_start_date<max_date:
-                next_day = custom_start_date + timedelta(days=1)
-                custom_end_date = st.sidebar.date_input(
-                    "Select End Date",
-                    value=next_day,
-                    min_value=next_day,
-                    max_value=max_date,
-                    key="end_date_picker"
-                )
-
+            
+            collection_amount = filtered_df["Amount"].sum()
+            selected_vehicle_display= selected_vehicle if selected_vehicle != "All" else "All Vehicles"
 
-        today = pd.Timestamp.today().normalize()
-        # apply year-month filter
-        if year_month_option == "Current Month":
-            start_date = today.replace(day=1)
-            filtered_df = filtered_df[filtered_df["Collection Date"] >= start_date]
-        elif year_month_option == "Last 6 Months":
-            start_date = today - pd.DateOffset(months=6)
-            filtered_df = filtered_df[filtered_df["Collection Date"] >= start_date]
-        elif year_month_option == "Current Year":
-            start_date = today.replace(month=1, day=1)
-            filtered_df = filtered_df[filtered_df["Collection Date"] >= start_date]
-        elif (year_month_option == "Custom Date" and isinstance(custom_start_date, date) and isinstance(custom_end_date, date)):
-            filtered_df = filtered_df[
-                (filtered_df["Collection Date"].dt.date >= custom_start_date)&
-                (filtered_df["Collection Date"].dt.date <= custom_end_date)
-            ]
-        
-
-        
-    ## edit by ayush ends
-    
-        st.markdown("### 📈 Collection Trend")
-    
-        # Line chart with time range filter
-        chart_df = df.groupby(["Collection Date", "Vehicle No"])["Amount"].sum().reset_index()
-        chart_df["Collection Date"] = pd.to_datetime(chart_df["Collection Date"])
-        
-        
-        # === RADIO BUTTONS CENTERED BELOW CHART WITHOUT LABEL ===
-        col1, col2, col3 = st.columns([1, 3, 1])
-        with col2:
-            range_option = st.radio(
-                "",  # Remove label
-                ["1 Week", "1 Month", "3 Months", "6 Months", "1 Year", "3 Years", "5 Years", "Max"],
-                horizontal=True,
-                index=2
+            monthly_totals = collection_month_totals(
+                tables["collection_monthly"], filtered_df, year_month_option, today, selected_vehicle
             )
-        
-        # === FILTER BASED ON SELECTION ===
-        today = pd.to_datetime("today")
-        if range_option == "1 Week":
-            start_date = today - pd.Timedelta(weeks=1)
-        elif range_option == "1 Month":
-            start_date = today - pd.DateOffset(months=1)
-        elif range_option == "3 Months":
-            start_date = today - pd.DateOffset(months=3)
-        elif range_option == "6 Months":
-            start_date = today - pd.DateOffset(months=6)
-        elif range_option == "1 Year":
-            start_date = today - pd.DateOffset(years=1)
-        elif range_option == "3 Years":
-            start_date = today - pd.DateOffset(years=3)
-        elif range_option == "5 Years":
-            start_date = today - pd.DateOffset(years=5)
-        else:
-            start_date = chart_df["Collection Date"].min()
-        
-        # Apply the filter
-        filtered_chart_df = chart_df[chart_df["Collection Date"] >= start_date]
-        filtered_pivot = filtered_chart_df.pivot(index="Collection Date", columns="Vehicle No", values="Amount").fillna(0)
-        
-        # Rerender chart with filtered data
-        st.line_chart(filtered_pivot)
-## edit by ayush starts
+            best_month = monthly_totals.idxmax().strftime('%B %Y') if not monthly_totals.empty else "N/A"
+            worst_month = monthly_totals.idxmin().strftime('%B %Y') if not monthly_totals.empty else "N/A"
 
-        
-        collection_amount = filtered_df["Amount"].sum()
-        selected_vehicle_display= selected_vehicle if selected_vehicle != "All" else "All Vehicles"
-
-        monthly_totals = filtered_df.groupby(pd.to_datetime(filtered_df["Collection Date"]).dt.to_period("M"))["Amount"].sum()
-        best_month = monthly_totals.idxmax().strftime('%B %Y') if not monthly_totals.empty else "N/A"
-        worst_month = monthly_totals.idxmin().strftime('%B %Y') if not monthly_totals.empty else "N/A"
+            col1, col2 = st.columns(2)
+            col1.metric("🚐 Selected Vehicle", selected_vehicle_display)
+            col2.metric("💰 Collection Amount", f"₹{collection_amount:,.0f}")
+            
 
-        col1, col2 = st.columns(2)
-        col1.metric("🚐 Selected Vehicle", selected_vehicle_display)
-        col2.metric("💰 Collection Amount", f"₹{collection_amount:,.0f}")
+            st.markdown("---")
+    ### edit by ayush ends
+            
+            st.markdown("### 📄 Collection Records")
         
-
-        st.markdown("---")
-### edit by ayush ends
+            # Columns to show
+            display_cols = ["Collection Date", "Vehicle No", "Amount", "Meter Reading", "Name", "Distance"]
         
-        st.markdown("### 📄 Collection Records")
-    
-        # Columns to show
-        display_cols = ["Collection Date", "Vehicle No", "Amount", "Meter Reading", "Name", "Distance"]
-    
-        # Round distance
-        df["Distance"] = df["Distance"].round(2)
+            Daily_Collection = collection_log(filtered_df)
 
-        Daily_Collection = (
-            filtered_df.copy()
-            .assign(**{"Collection Date": lambda x: pd.to_datetime(x["Collection Date"])})
-            .sort_values("Collection Date", ascending=False)
-        )
+            # Only the current page of cards is rendered
+            visible = paginate(Daily_Collection, "records", CARD_PAGE_SIZES, label="Cards per page")
 
-        # Format for display
-        Daily_Collection["Collection Date"] = Daily_Collection["Collection Date"].dt.strftime("%d %b %Y")
+            cards_html = html_content + render_collection_cards(visible) + "</div>"
 
-        for index, row in Daily_Collection.iterrows():
-            bg_style = get_background_style(row['Amount'])
-            
-            html_content += f"""
-            <div class="card" style="background: {bg_style}">
-                <div class="vehicle-no">{row['Vehicle No']}</div>
-                <div class="card-header">
-                    <div class="date">{row['Collection Date']}</div>
-                    <div class="meter-reading-header">{row['Meter Reading']} Km</div>
-                </div>
-                <div class="info-row">
-                    <div class="info-left">
-                        <div class="info-value">₹ {row['Amount']}</div>
-                        <div class="info-value">{row['Distance']} km</div>
-                    </div>
-                    <div class="info-right">
-                        <div class="info-value name">{row['Name']}</div>
-                    </div>
-                </div>
-            </div>
-            """
-        html_content += "</div>"
+            # Render HTML
+            components.html(profile.ship("collection record cards", cards_html), height=600, scrolling=True)
 
-        # Render HTML
-        components.html(html_content, height=600, scrolling=True)
 
+        elif page == "Bank Transaction":
+            bank_df, ledger = tables["bank"], tables["ledger"]
+            st.title("🏦 Bank Transactions")
+        
+            # Add Transaction Button (Top Right)
+            col1, col2 = st.columns([6, 1])
+            with col2:
+                st.markdown(
+                    f'<a href="https://forms.gle/JwXMNkREnjeqAfNPA" target="_blank">'
+                    f'<button style="background-color:#4CAF50; color:white; padding:8px 16px; font-size:14px; border:none; border-radius:5px;">➕ Add Bank Transaction</button>'
+                    f'</a>',
+                    unsafe_allow_html=True
+                )
+        
+            # Total balance from full data (not filtered)
+            total_credit = ledger.credits()
+            total_debit = ledger.debits()
+            balance = total_credit - total_debit
+        
+            # 📌 Sidebar Filters
+            st.sidebar.header("📅 Filter Transactions")
+        
+        ## edit by ayush
+            filtered_df = bank_df
+            filter_option = st.sidebar.selectbox("Choose filter type:", ["All", "Last 3 Months", "Select Date"],key="range_select",)
+
+            start_date, end_date = None, None
+            if filter_option == "Select Date":
+                min_date= date(2025, 1, 1)
+                max_date= date.today()
+                start_date= st.sidebar.date_input(
+                    "Select Start Date",
+                    value = date.today(),
+                    min_value= min_date,
+                    max_value= max_date,
+                    key="start_date_picker"
+                )
+                if start_date < max_date:
+                    next_day= start_date + timedelta(days=1)
+                    end_date = st.sidebar.date_input(
+                        "Select End Date",
+                        value=next_day,
+                        min_value=next_day,
+                        max_value=max_date,
+                        key="end_date_picker"
+                    )
+            today = pd.Timestamp.today().normalize()
+
+
+            bank_by_date = tables["bank_by_date"]
+            if filter_option == "Last 3 Months":
+                filtered_df = bank_by_date.preset(filter_option, pd.Timestamp.today())
+            elif filter_option == "Select Date" and isinstance(start_date, date) and isinstance(end_date, date):
+                #selected_year = st.sidebar.selectbox("Year", sorted(bank_df["Year"].unique(), reverse=True))
+                #selected_month = st.sidebar.selectbox("Month", sorted(bank_df["Month"].unique(), key=lambda x: pd.to_datetime(x, format="%B").month))
+                filtered_df = bank_by_date.between(start_date, end_date)
+        ## edit by ayush
+
+            # 💰 Current Balance (Always from full data)
+            st.subheader("💰 Current Bank Balance")
+            st.metric(label="Available Balance", value=f"₹ {balance:,.0f}", delta=f"₹ {total_credit - total_debit:,.0f}")
+        
+            # 📌 Closing Balance of Filtered Data
+            st.subheader("📉 Closing Balance for Selected Period")
+            st.metric(label="Closing Balance (Filtered)", value=f"₹ {closing_balance(filtered_df):,.0f}")
+        
+            # 📊 Monthly Summary (From filtered data)
+            st.subheader("📊 Monthly Transaction Summary")
+            # All transactions: month-name x type straight from the rollup
+            monthly_summary = bank_monthly_summary(tables["bank_monthly"], None if filter_option == "All" else filtered_df)
+            st.dataframe(monthly_summary)
+        
+            # 📋 Full Transaction Log
+            st.subheader("📋 Full Bank Transaction Log")
+        
+            # Newest first; only the current page is formatted and rendered
+            log_df = bank_log(filtered_df)
+            visible = paginate(log_df, "ledger", LEDGER_PAGE_SIZES, label="Transactions per page")
 
-    elif page == "Bank Transaction":
-        st.title("🏦 Bank Transactions")
-    
-        # Add Transaction Button (Top Right)
-        col1, col2 = st.columns([6, 1])
-        with col2:
+            # 💡 Full Width Styling for Table
+            st.markdown(LEDGER_TABLE_CSS, unsafe_allow_html=True)
+        
+            # ✅ Render the log with clickable links and full width
             st.markdown(
-                f'<a href="https://forms.gle/JwXMNkREnjeqAfNPA" target="_blank">'
-                f'<button style="background-color:#4CAF50; color:white; padding:8px 16px; font-size:14px; border:none; border-radius:5px;">➕ Add Bank Transaction</button>'
-                f'</a>',
+                profile.ship("bank transaction log", f'<div class="full-width-table">{render_ledger_html(visible)}</div>'),
                 unsafe_allow_html=True
             )
-    
-        # Ensure 'Date' is datetime
-        bank_df["Date"] = pd.to_datetime(bank_df["Date"], dayfirst=True, errors="coerce")
-        bank_df["Transaction Type"] = bank_df["Transaction Type"].str.strip()
-        bank_df["Month"] = bank_df["Date"].dt.strftime("%B")
-        bank_df["Year"] = bank_df["Date"].dt.year
-    
-        # 🔒 Full data copy for current balance
-        full_df = bank_df.copy()
-    
-        # Total balance from full data (not filtered)
-        credit_mask_full = full_df["Transaction Type"].str.lower().str.contains("credit", na=False)
-        debit_mask_full = full_df["Transaction Type"].str.lower().str.contains("debit", na=False)
-    
-        total_credit = full_df.loc[credit_mask_full, "Amount"].sum()
-        total_debit = full_df.loc[debit_mask_full, "Amount"].sum()
-        balance = total_credit - total_debit
-    
-        # 📌 Sidebar Filters
-        st.sidebar.header("📅 Filter Transactions")
-    
-    ## edit by ayush
-        filtered_df = bank_df.copy()
-        filter_option = st.sidebar.selectbox("Choose filter type:", ["All", "Last 3 Months", "Select Date"],key="range_select",)
-
-        start_date, end_date = None, None
-        if filter_option == "Select Date":
-            min_date= date(2025, 1, 1)
-            max_date= date.today()
-            start_date= st.sidebar.date_input(
-                "Select Start Date",
-                value = date.today(),
-                min_value= min_date,
-                max_value= max_date,
-                key="start_date_picker"
-            )
-            if start_date < max_date:
-                next_day= start_date + timedelta(days=1)
-                end_date = st.sidebar.date_input(
-                    "Select End Date",
-                    value=next_day,
-                    min_value=next_day,
-                    max_value=max_date,
-                    key="end_date_picker"
-                )
-        today = pd.Timestamp.today().normalize()
-
-
-        if filter_option == "All":
-            filtered_df = bank_df
-        elif filter_option == "Last 3 Months":
-            last_3_months = pd.Timestamp.today() - pd.DateOffset(months=3)
-            filtered_df = bank_df[bank_df["Date"] >= last_3_months]
-        elif filter_option == "Select Date" and isinstance(start_date, date) and isinstance(end_date, date):
-            #selected_year = st.sidebar.selectbox("Year", sorted(bank_df["Year"].unique(), reverse=True))
-            #selected_month = st.sidebar.selectbox("Month", sorted(bank_df["Month"].unique(), key=lambda x: pd.to_datetime(x, format="%B").month))
-            date_filtered = bank_df[
-                (bank_df["Date"].dt.date >= start_date) &
-                (bank_df["Date"].dt.date <= end_date)
-            ]
-            filtered_df = date_filtered.copy()
-    ## edit by ayush
-
-        # 💰 Current Balance (Always from full data)
-        st.subheader("💰 Current Bank Balance")
-        st.metric(label="Available Balance", value=f"₹ {balance:,.0f}", delta=f"₹ {total_credit - total_debit:,.0f}")
-    
-        # 📌 Closing Balance of Filtered Data
-        st.subheader("📉 Closing Balance for Selected Period")
-        credit_mask = filtered_df["Transaction Type"].str.lower().str.contains("credit", na=False)
-        debit_mask = filtered_df["Transaction Type"].str.lower().str.contains("debit", na=False)
-        closing_credit = filtered_df.loc[credit_mask, "Amount"].sum()
-        closing_debit = filtered_df.loc[debit_mask, "Amount"].sum()
-        closing_balance = closing_credit - closing_debit
-        st.metric(label="Closing Balance (Filtered)", value=f"₹ {closing_balance:,.0f}")
-    
-        # 📊 Monthly Summary (From filtered data)
-        st.subheader("📊 Monthly Transaction Summary")
-        monthly_summary = (
-            filtered_df.groupby(["Month", "Transaction Type"])["Amount"]
-            .sum()
-            .unstack(fill_value=0)
-            .reset_index()
-        )
-        st.dataframe(monthly_summary)
-    
-        # 📋 Full Transaction Log
-        st.subheader("📋 Full Bank Transaction Log")
-    
-        display_df = filtered_df[["Date", "Transaction By", "Transaction Type", "Reason", "Amount", "Bill"]].copy()
-
-
-        #def format_amount(row):
-        #    amt = row["Amount"]
-        #    if "credit" in row["Transaction Type"].lower():
-        #        return f"+₹{amt:,.0f}"
-        #    elif "debit" in row["Transaction Type"].lower():
-        #        return f"-₹{amt:,.0f}"
-        #    return f"₹{amt:,.0f}"
-        #display_df["Amount"] = filtered_df.apply(format_amount, axis=1)
-
-        def format_amount(row):
-            amt = pd.to_numeric(row.get("Amount", 0), errors="coerce")
-            if pd.isna(amt):
-                amt = 0
-            t = str(row.get("Transaction Type", "")).lower()
-            if "credit" in t:
-                return f"+₹{amt:,.0f}"
-            elif "debit" in t:
-                return f"-₹{amt:,.0f}"
-            return f"₹{amt:,.0f}"
-        
-    
-
-        if not display_df.empty:
-            display_df["Amount"] = display_df.apply(format_amount, axis=1)
-        else:
-            display_df["Amount"] = pd.Series(dtype="object")
         
-        if "Bill" in display_df.columns:
-            display_df["Bill"] = display_df["Bill"].apply(
-                lambda x: f'<a href="{x}" target="_blank">View Bill</a>' if pd.notna(x) and str(x).startswith("http") else ""
+            # ⬇️ Export Filtered Data
+            st.download_button(
+                label="📥 Download Filtered Transactions as CSV",
+                data=profile.ship("bank transactions csv", filtered_df.to_csv(index=False)),
+                file_name="filtered_bank_transactions.csv",
+                mime="text/csv"
             )
-    
-        def color_amount(val):
-            if isinstance(val, str):
-                if val.startswith("+"):
-                    return "color: green"
-                elif val.startswith("-"):
-                    return "color: red"
-            return ""
-    
-        styled = display_df[["Date", "Transaction By", "Transaction Type", "Reason", "Amount", "Bill"]].sort_values(by="Date", ascending=False)
-        styled_df = styled.style.applymap(color_amount, subset=["Amount"])
-
-    
-        # 💡 Full Width Styling for Table
-        st.markdown(
-            """
-            <style>
-                .full-width-table {
-                    width: 100%;
-                    overflow-x: auto;
-                }
-            </style>
-            """,
-            unsafe_allow_html=True
-        )
-    
-        # ✅ Render styled DataFrame with clickable links and full width
-        st.markdown(
-            f'<div class="full-width-table">{styled_df.to_html(escape=False, index=False)}</div>',
-            unsafe_allow_html=True
-        )
-    
-        # ⬇️ Export Filtered Data
-        st.download_button(
-            label="📥 Download Filtered Transactions as CSV",
-            data=filtered_df.to_csv(index=False),
-            file_name="filtered_bank_transactions.csv",
-            mime="text/csv"
-        )
-
-    
 
-    elif page == "Performance":
-        st.title("📉 Performance Analysis")
-
-        if "Amount" not in perf_df_lm.columns:
-            perf_df_lm["Amount"] = pd.Series(dtype=float)
         
-        #filtered_df_lm = apply_loss_matrix_logic(filtered_df)
-    # ---------- Vehicle , Driver Filter ----------
-        st.sidebar.markdown("### 🚗 Filter by Vehicle")
-        selected_vehicle = st.sidebar.selectbox(
-            "",
-            ["All"] + sorted(perf_df["Vehicle No"].dropna().astype(str).unique()),
-            key="Vehicle_select"
-        )
 
-        st.sidebar.markdown("### 👨‍✈️ Filter by Driver")
-        selected_driver = st.sidebar.selectbox(
-            "",
-            ["All"] + sorted(perf_df["Name"].dropna().astype(str).unique()),
-            key="Driver_select"
-        )
+        elif page == "Performance":
+            perf_df, perf_df_lm = tables["performance"], tables["loss_matrix"]
+            st.title("📉 Performance Analysis")
 
-        filtered_df_lm = perf_df_lm.copy()
-        if selected_vehicle != "All":
-            filtered_df_lm = filtered_df_lm[filtered_df_lm["Vehicle No"] == selected_vehicle]
-        if selected_driver != "All":
-            filtered_df_lm = filtered_df_lm[filtered_df_lm["Name"] == selected_driver]
-
-    # ----------  Date Filter ----------
-        st.sidebar.markdown("### 📅 Filter by Date")
-        year_month_option = st.sidebar.selectbox(
-            "",
-            ["All", "Current Month", "Last 6 Months", "Current Year", "Custom Date"],
-            key="range_select",
-        )
-        
-        start_date, end_date = None, None
-        custom_start_date, custom_end_date = None, None
-
-        if year_month_option == "All":
-            pass
-        elif year_month_option == "Current Month":
-            start_date = today.replace(day=1)
-            end_date = today
-        elif year_month_option == "Last 6 Months":
-            start_date = today - pd.DateOffset(months=6)
-            end_date = today
-        elif year_month_option == "Current Year":
-            start_date = today.replace(month=1, day=1)
-            end_date = today
-
-        if year_month_option == "Custom Date":
-            min_date = date(2024, 1, 1)
-            max_date = date.today()
-            custom_start_date = st.sidebar.date_input(
-                "Select start Date",
-                value=date.today(),
-                min_value=min_date,
-                max_value=max_date,
-                key="start_date_picker"
+            if "Amount" not in perf_df_lm.columns:
+                perf_df_lm["Amount"] = pd.Series(dtype=float)
+            
+            #filtered_df_lm = apply_loss_matrix_logic(filtered_df)
+        # ---------- Vehicle , Driver Filter ----------
+            st.sidebar.markdown("### 🚗 Filter by Vehicle")
+            selected_vehicle = st.sidebar.selectbox(
+                "",
+                ["All"] + sorted(perf_df["Vehicle No"].dropna().astype(str).unique()),
+                key="Vehicle_select"
             )
-            default_end_date = custom_start_date
-            if custom_start_date < max_date:
-                default_end_date = min(custom_start_date + timedelta(days=1), max_date)
-            custom_end_date = st.sidebar.date_input(
-                "Select End Date",
-                value=default_end_date,
-                min_value=custom_start_date,
-                max_value=max_date,
-                key="end_date_picker"
+
+            st.sidebar.markdown("### 👨‍✈️ Filter by Driver")
+            selected_driver = st.sidebar.selectbox(
+                "",
+                ["All"] + sorted(perf_df["Name"].dropna().astype(str).unique()),
+                key="Driver_select"
             )
-            start_date = pd.Timestamp(custom_start_date)
-            end_date = pd.Timestamp(custom_end_date)
 
-        if start_date is not None and end_date is not None:
-            filtered_df_lm = filtered_df_lm[
-                (filtered_df_lm["Collection Date"] >= start_date) &
-                (filtered_df_lm["Collection Date"] <= end_date)
-            ]
 
-    # ---------- Calculate losses ----------
-        all_total_loss = perf_df_lm["Amount"].sum()
-        all_company_loss = perf_df_lm.loc[perf_df_lm["Name"] == "Zero Collection", "Amount"].sum()
-        all_driver_loss = all_total_loss - all_company_loss
+        # ----------  Date Filter ----------
+            st.sidebar.markdown("### 📅 Filter by Date")
+            year_month_option = st.sidebar.selectbox(
+                "",
+                ["All", "Current Month", "Last 6 Months", "Current Year", "Custom Date"],
+                key="range_select",
+            )
+            
+            start_date, end_date = None, None
+            custom_start_date, custom_end_date = None, None
+
+            if year_month_option == "All":
+                pass
+            elif year_month_option == "Current Month":
+                start_date = today.replace(day=1)
+                end_date = today
+            elif year_month_option == "Last 6 Months":
+                start_date = today - pd.DateOffset(months=6)
+                end_date = today
+            elif year_month_option == "Current Year":
+                start_date = today.replace(month=1, day=1)
+                end_date = today
+
+            if year_month_option == "Custom Date":
+                min_date = date(2024, 1, 1)
+                max_date = date.today()
+                custom_start_date = st.sidebar.date_input(
+                    "Select start Date",
+                    value=date.today(),
+                    min_value=min_date,
+                    max_value=max_date,
+                    key="start_date_picker"
+                )
+                default_end_date = custom_start_date
+                if custom_start_date < max_date:
+                    default_end_date = min(custom_start_date + timedelta(days=1), max_date)
+                custom_end_date = st.sidebar.date_input(
+                    "Select End Date",
+                    value=default_end_date,
+                    min_value=custom_start_date,
+                    max_value=max_date,
+                    key="end_date_picker"
+                )
+                start_date = pd.Timestamp(custom_start_date)
+                end_date = pd.Timestamp(custom_end_date)
+
+            # Date range first (binary search on the date index), then vehicle / driver
+            filtered_df_lm = filter_losses(
+                tables["loss_matrix_by_date"], start_date, end_date, selected_vehicle, selected_driver
+            )
 
-        f_total_loss = filtered_df_lm["Amount"].sum() if "Amount" in filtered_df_lm.columns else 0
-        f_company_loss = filtered_df_lm.loc[filtered_df_lm.get("Name") == "Zero Collection", "Amount"].sum() if "Amount" in filtered_df_lm.columns else 0
-        f_driver_loss = f_total_loss - f_company_loss
+        # ---------- Calculate losses ----------
+            all_total_loss, all_company_loss, all_driver_loss = loss_totals(perf_df_lm)
+            f_total_loss, f_company_loss, f_driver_loss = loss_totals(filtered_df_lm)
 
 
 
-        #current_total_loss, current_driver_loss, current_company_loss = calculate_current_month_losses(perf_df_lm)
+            #current_total_loss, current_driver_loss, current_company_loss = calculate_current_month_losses(perf_df_lm)
 
 
-    # ---------- Metrics ----------
-        col0, col1, col2 = st.columns(3)
-        col0.metric("All-time Total Loss", f"{all_total_loss:,.0f}")
-        col1.metric("All-time Driver Loss", f"{all_driver_loss:,.0f}")
-        col2.metric("All-time Company Loss", f"{all_company_loss:,.0f}")
+        # ---------- Metrics ----------
+            col0, col1, col2 = st.columns(3)
+            col0.metric("All-time Total Loss", f"{all_total_loss:,.0f}")
+            col1.metric("All-time Driver Loss", f"{all_driver_loss:,.0f}")
+            col2.metric("All-time Company Loss", f"{all_company_loss:,.0f}")
 
-        st.markdown("---")
-        col0, col1, col2 = st.columns(3)
-        col0.metric("Filtered Total Loss", f"{f_total_loss:,.0f}")
-        col1.metric("Filtered Driver Loss", f"{f_driver_loss:,.0f}")
-        col2.metric("Filtered Company Loss", f"{f_company_loss:,.0f}")
+            st.markdown("---")
+            col0, col1, col2 = st.columns(3)
+            col0.metric("Filtered Total Loss", f"{f_total_loss:,.0f}")
+            col1.metric("Filtered Driver Loss", f"{f_driver_loss:,.0f}")
+            col2.metric("Filtered Company Loss", f"{f_company_loss:,.0f}")
 
-    # ---------- Table ----------
-        st.subheader("📉 Loss Matrix (Filtered)")
-        if filtered_df_lm.empty:
-            st.info("No records in this period.")
-        else:
-            st.dataframe(
-                filtered_df_lm.sort_values(by="Collection Date", ascending=False),
-                use_container_width=True
-            )
+        # ---------- Table ----------
+            st.subheader("📉 Loss Matrix (Filtered)")
+            if filtered_df_lm.empty:
+                st.info("No records in this period.")
+            else:
+                st.dataframe(
+                    profile.ship("loss matrix", filtered_df_lm.sort_values(by="Collection Date", ascending=False)),
+                    use_container_width=True
+                )
 
 
-    
-    # 🔁 Refresh button
-    if st.sidebar.button("🔁 Refresh"):
-        st.cache_resource.clear()
-        st.experimental_rerun()
\ No newline at end of file
+        
+        # 🗄️ Cache status
+        with st.sidebar.expander("🗄️ Data Cache"):
+            st.dataframe(data_cache.stats(), hide_index=True, use_container_width=True)
+            st.dataframe(derived_tables.stats(), hide_index=True, use_container_width=True)
+            st.dataframe(pipeline.ingest_stats(), hide_index=True, use_container_width=True)
+            if sqlite_store is not None:
+                st.dataframe(sqlite_store.stats(), hide_index=True, use_container_width=True)
+            st.dataframe(pd.DataFrame([{"Table": "auth", **get_auth_store().stats()}]), hide_index=True, use_container_width=True)
+            st.caption("Charts: " + " · ".join(f"{k} {v}" for k, v in figure_cache.stats().items()))
+
+        # ⏱️ Rerun timings (admins only)
+        profile.stop(f"page {page}", rows=sum(len(t) for t in tables.values() if isinstance(t, pd.DataFrame)))
+        if st.session_state.user_role == "admin":
+            profile.finish()
+            with st.sidebar.expander("⏱️ Rerun Timings"):
+                st.caption(
+                    f"Rerun {profile.total_seconds:.2f}s · shipped {profile.shipped_bytes / 1024:,.0f} KB · "
+                    f"cache {sum(c['hits'] for c in profile.cache.values())} hits / "
+                    f"{sum(c['misses'] for c in profile.cache.values())} misses"
+                )
+                st.dataframe(profile.stage_frame(), hide_index=True, use_container_width=True)
+                st.dataframe(profile.shipped_frame(), hide_index=True, use_container_width=True)
+                logins = get_password_verifier().stats()
+                st.caption("Logins: " + " · ".join(f"{k} {v}" for k, v in logins.items() if v is not None))
+                if st.button("🔬 Profile next rerun (cProfile)"):
+                    st.session_state.profile_next_rerun = True
+                    st.rerun()
+                if profile.cprofile_text:
+                    st.session_state.last_cprofile = profile.cprofile_text
+                if st.session_state.get("last_cprofile"):
+                    st.code(st.session_state.last_cprofile, language="text")
+
+        # 🔁 Refresh button
+        # Only the chosen data cache is dropped and its sheet downloaded in full again
+        # (in-place edits included); the sheet connections are kept
+        refresh_target = st.sidebar.selectbox("Refresh data:", ["All"] + DATASETS + ["auth"], key="refresh_select")
+        if st.sidebar.button("🔁 Refresh"):
+            if refresh_target in ("All", "auth"):
+                get_auth_store().invalidate()
+            if refresh_target != "auth":
+                data_cache.invalidate(None if refresh_target == "All" else refresh_target)
+            st.rerun()
+
+finally:
+    # One structured log record per rerun
+    profile.finish().log(user=st.session_state.get("username"))